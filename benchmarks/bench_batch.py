@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark a batch of small boards against a loop of simulations
+
+Runs the same random soups with :obj:`seagull.Simulator` in a Python loop
+and with a single :obj:`seagull.BatchSimulator`. Run it from the repository
+root with the package installed (or on the :code:`PYTHONPATH`):
+
+.. code-block:: bash
+
+    python benchmarks/bench_batch.py
+"""
+
+# Import standard library
+import time
+
+# Import modules
+from loguru import logger
+
+# Import from package
+import seagull as sg
+from seagull.lifeforms import RandomBox
+
+BATCHES = [16, 64, 256]
+SIZE = (32, 32)
+ITERS = 100
+
+
+def main():
+    logger.remove()
+    print(f"{'boards':>6} {'loop':>10} {'batch':>10} {'speedup':>8}")
+    for n in BATCHES:
+        boards = []
+        for seed in range(n):
+            board = sg.Board(size=SIZE)
+            board.add(RandomBox(shape=SIZE, seed=seed), loc=(0, 0))
+            boards.append(board)
+
+        start = time.perf_counter()
+        for board in boards:
+            sg.Simulator(board).run(sg.rules.conway_classic, iters=ITERS)
+        t_loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sg.BatchSimulator(boards).run(sg.rules.conway_classic, iters=ITERS)
+        t_batch = time.perf_counter() - start
+        print(
+            f"{n:>6} {t_loop:>9.3f}s {t_batch:>9.3f}s "
+            f"{t_loop / t_batch:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark the object census of large boards
+
+Takes the :func:`seagull.utils.statistics.census` of 4096x4096 boards: a
+random board with 5% of live cells, made of many tiny objects, and a soup
+evolved for 300 generations and tiled, made of the usual still lifes and
+oscillators. Run it from the repository root with the package installed
+(or on the :code:`PYTHONPATH`):
+
+.. code-block:: bash
+
+    python benchmarks/bench_census.py
+"""
+
+# Import standard library
+import time
+
+# Import modules
+import numpy as np
+
+# Import from package
+import seagull as sg
+from seagull.lifeforms.canonical import catalogue
+from seagull.utils.statistics import census
+
+SIZE = 4096
+TILE = 1024
+ITERS = 300
+REPEATS = 3
+
+
+def main():
+    rng = np.random.default_rng(0)
+    rule = sg.rules.compile("B3/S23")
+    soup = rng.random((TILE, TILE)) < 0.35
+    for _ in range(ITERS):
+        soup = rule(soup)
+    boards = {
+        "random 5%": rng.random((SIZE, SIZE)) < 0.05,
+        "settled soup": np.tile(soup, (SIZE // TILE, SIZE // TILE)),
+    }
+
+    catalogue()
+    census(boards["random 5%"][:64, :64])
+    print(f"{'board':>12} {'objects':>8} {'kinds':>6} {'census':>8}")
+    for name, state in boards.items():
+        times = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            counts, _ = census(state)
+            times.append(time.perf_counter() - start)
+        print(
+            f"{name:>12} {sum(counts.values()):>8} {len(counts):>6} "
+            f"{min(times):>7.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark the time to import seagull in a fresh interpreter
+
+Also checks that matplotlib and scipy are not imported, since headless
+workers never plot. Run it from the repository root with the package
+installed (or on the :code:`PYTHONPATH`):
+
+.. code-block:: bash
+
+    python benchmarks/bench_import.py
+"""
+
+# Import standard library
+import statistics
+import subprocess
+import sys
+import time
+
+REPEATS = 10
+HEAVY_MODULES = ("matplotlib", "scipy")
+
+
+def import_time(module: str) -> float:
+    """Time a fresh interpreter that imports a module"""
+    start = time.perf_counter()
+    subprocess.check_call([sys.executable, "-c", f"import {module}"])
+    return time.perf_counter() - start
+
+
+def main():
+    baseline = statistics.median(import_time("sys") for _ in range(REPEATS))
+    seagull = statistics.median(import_time("seagull") for _ in range(REPEATS))
+    print(f"interpreter startup: {baseline * 1e3:>8.1f}ms")
+    print(f"import seagull:      {(seagull - baseline) * 1e3:>8.1f}ms")
+
+    code = "import seagull, sys; print(' '.join(sys.modules))"
+    modules = subprocess.check_output([sys.executable, "-c", code]).split()
+    heavy = [
+        name.decode()
+        for name in modules
+        if name.decode().split(".")[0] in HEAVY_MODULES
+    ]
+    print(f"heavy modules:       {heavy or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark the neighbor counting kernels across board sizes
+
+Compares the uint8 slice-sum kernel used by :mod:`seagull.rules` against the
+:func:`scipy.signal.convolve2d` reference. Run it from the repository root
+with the package installed (or on the :code:`PYTHONPATH`):
+
+.. code-block:: bash
+
+    python benchmarks/bench_neighbors.py
+"""
+
+# Import standard library
+import timeit
+
+# Import modules
+import numpy as np
+
+# Import from package
+from seagull.rules import _count_neighbors, _count_neighbors_convolve
+
+SIZES = [32, 128, 512, 2000]
+
+
+def main():
+    print(f"{'size':>6} {'convolve2d':>12} {'slice-sum':>12} {'speedup':>8}")
+    for size in SIZES:
+        X = np.random.rand(size, size) < 0.3
+        out = np.empty(X.shape, dtype=np.uint8)
+        number = max(1, 2**22 // size**2)
+        t_conv = timeit.timeit(
+            lambda: _count_neighbors_convolve(X), number=number
+        )
+        t_sum = timeit.timeit(
+            lambda: _count_neighbors(X, out=out), number=number
+        )
+        print(
+            f"{size:>6} {t_conv / number * 1e3:>10.3f}ms "
+            f"{t_sum / number * 1e3:>10.3f}ms {t_conv / t_sum:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,21 @@
 
 """Seagull"""
 
-from .board import Board
+from .board import Board, SparseBoard
 from .simulator import Simulator
-from .rules import *
+from .batch import BatchSimulator
+from .sweeps import sweep
+from . import rules
+from .rules import Rule, conway_classic, life_rule
 
-__all__ = ["Board", "Simulator", "rules"]
+__all__ = [
+    "Board",
+    "SparseBoard",
+    "Simulator",
+    "BatchSimulator",
+    "sweep",
+    "rules",
+]
 
 __version__ = "1.0.0-beta.4"
 __author__ = "Lester James V. Miranda"
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""The BatchSimulator runs many boards of the same size at once. The boards
+are stacked into a single :code:`(n, height, width)` array, and the rule is
+applied to the whole stack on every generation, so the per-call overhead is
+paid once per generation instead of once per board. The statistics of each
+board are returned as arrays of length :code:`n`:
+
+.. code-block:: python
+
+    import seagull as sg
+
+    boards = []
+    for seed in range(100):
+        board = sg.Board(size=(32, 32))
+        board.add(sg.lifeforms.RandomBox(shape=(32, 32), seed=seed), (0, 0))
+        boards.append(board)
+
+    sim = sg.BatchSimulator(boards)
+    stats = sim.run(sg.rules.conway_classic, iters=100)
+    stats["peak_cell_coverage"]  # one value per board
+
+The rule must be a B/S rule (see :func:`seagull.rules.compile`), since
+arbitrary callables may not accept a stack of boards. All boards use the
+same boundary. By default, no history is kept; pass a sink from
+:mod:`seagull.history` to keep generations of shape :code:`(n, height,
+width)`.
+"""
+
+# Import standard library
+from typing import Callable, Optional, Sequence, Union
+
+# Import modules
+import numpy as np
+from loguru import logger
+
+from .board import Board
+from .history import HistorySink, NullSink
+from .rules import BOUNDARIES, Rule, _as_rule
+from .utils import statistics as stats
+
+
+class BatchSimulator:
+    def __init__(
+        self,
+        boards: Union[Sequence[Board], np.ndarray],
+        boundary: Optional[str] = None,
+    ):
+        """Initialize the class
+
+        Parameters
+        ----------
+        boards : list of :obj:`seagull.Board` or numpy.ndarray
+            Boards of the same size, or their states as an array of shape
+            :code:`(n, height, width)`
+        boundary : str, optional
+            Boundary condition of all boards. Default is the boundary of the
+            boards, or :code:`"wrap"` for an array
+        """
+        if isinstance(boards, np.ndarray):
+            states = boards.astype(bool)
+            boundaries = {boundary or "wrap"}
+        else:
+            states = [board.state for board in boards]
+            if len({state.shape for state in states}) > 1:
+                msg = "All boards must have the same size"
+                logger.error(msg)
+                raise ValueError(msg)
+            states = np.array(states, dtype=bool)
+            boundaries = {boundary or board.boundary for board in boards}
+
+        if states.ndim != 3:
+            msg = f"Expected states of shape (n, h, w), got {states.shape}"
+            logger.error(msg)
+            raise ValueError(msg)
+        if len(boundaries) > 1 or not boundaries <= set(BOUNDARIES):
+            msg = f"All boards must have the same boundary in {BOUNDARIES}"
+            logger.error(msg)
+            raise ValueError(msg)
+
+        self.states = states
+        self.boundary = boundaries.pop()
+        self.state = states.copy()
+        self.history = NullSink()  # type: HistorySink
+        self.stats = {}  # type: dict
+
+    def run(
+        self,
+        rule: Union[Rule, Callable, str],
+        iters: int,
+        history: Optional[HistorySink] = None,
+        **kwargs
+    ) -> dict:
+        """Run the simulation of all boards for a given number of iterations
+
+        Parameters
+        ----------
+        rule : :obj:`seagull.rules.Rule`, callable, or str
+            The B/S rule to apply
+        iters : int
+            Number of iterations to run the simulation.
+        history : :obj:`seagull.history.HistorySink`, optional
+            Where to keep the generations of the run, see
+            :mod:`seagull.history`. Default is a
+            :obj:`seagull.history.NullSink` that keeps none
+        **kwargs
+            Keyword arguments for the rule, e.g. the :code:`rulestring` of
+            :func:`seagull.rules.life_rule`
+
+        Returns
+        -------
+        dict
+           Computed statistics for each board, as arrays of length :code:`n`
+        """
+        rule = _as_rule(rule, **kwargs)
+        self.history = history if history is not None else NullSink()
+        self.history.open(self.states.shape, iters, rule=rule.rulestring)
+        summary = stats.StatisticsAccumulator()
+
+        layout = self.states.copy()
+        self.history.append(0, layout)
+        summary.update(layout)
+        for i in range(1, iters + 1):
+            layout = rule(layout, boundary=self.boundary)
+            self.history.append(i, layout)
+            summary.update(layout)
+
+        self.history.close()
+        self.state = layout
+        self.stats = summary.result()
+        return self.stats
+
+    def get_history(self, exclude_init=False) -> np.ndarray:
+        """Get the generations kept by the history sink
+
+        Parameters
+        ----------
+        exclude_init: bool
+            If True, then excludes the initial state in the history
+
+        Returns
+        -------
+        numpy.ndarray
+            Simulation history of shape :code:`(generations, n, height,
+            width)`
+        """
+        return self.history.frames(exclude_init)
@@ -23,37 +23,93 @@ Whenever a lifeform's size exceeds the edge of the board, then Seagull throws a
     board = sg.Board()
     board.add(sg.lifeforms.Blinker(length=3), loc=(0,0))
 
+By default, the board wraps around its edges like a torus. You can set the
+:code:`boundary` parameter to :code:`"fill"` so that cells past the edges are
+always dead, or to :code:`"symm"` so that the edges act like mirrors. This
+is carried through to the rules when the board is simulated:
+
+.. code-block:: python
+
+    import seagull as sg
+    board = sg.Board(size=(30, 30), boundary="fill")
+
+To seed a board with many lifeforms at once, use :code:`add_many()` with an
+array of locations, or :code:`add_mixed()` with a lifeform per location.
+All placements are checked and written at once, and the :code:`mode` sets
+how overlapping lifeforms are combined: :code:`"overwrite"` (like
+:code:`add()`, the last lifeform wins), :code:`"or"`, or :code:`"xor"`:
+
+.. code-block:: python
+
+    import numpy as np
+    import seagull as sg
+
+    board = sg.Board(size=(1000, 1000))
+    locs = np.random.randint(0, 997, size=(50000, 2))
+    board.add_many(sg.lifeforms.Glider(), locs, mode="or")
+
 You can always view the board's state by calling the :code:`view()` method.
 Lastly, you can clear the board with the :code:`clear()` command.
 
+For patterns that travel or spread far, such as spaceships and methuselahs,
+use a :obj:`seagull.board.SparseBoard` instead. It only stores the
+coordinates of live cells on an unbounded plane, so lifeforms can be added
+anywhere, even at negative locations. Its :code:`size` is only a viewport: it
+is the region returned by :code:`state`, recorded in the simulation history,
+and used for computing statistics.
+
+.. code-block:: python
+
+    import seagull as sg
+    board = sg.SparseBoard(size=(50, 50))
+    board.add(sg.lifeforms.Glider(), loc=(-1000, 20))
+
 """
 
 # Import standard library
-from typing import Tuple
+from typing import TYPE_CHECKING, Iterable, List, Sequence, Tuple
 
 # Import modules
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.image import AxesImage
 from loguru import logger
 
 from .lifeforms.base import Lifeform
+from .rules import BOUNDARIES
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from matplotlib.image import AxesImage
+
+#: Ways of combining lifeforms with the cells already on the board
+MODES = ("overwrite", "or", "xor")
 
 
 class Board:
     """Represents the environment where the lifeforms can grow and evolve"""
 
-    def __init__(self, size=(100, 100)):
+    #: Engine used by :obj:`seagull.Simulator` when none is given
+    default_engine = "dense"
+
+    def __init__(self, size=(100, 100), boundary="wrap"):
         """Initialize the class
 
         Parameters
         ----------
         size : array_like of size 2
             Size of the board (default is `(100, 100)`)
+        boundary : str
+            How cells past the edges are treated, one of :code:`"wrap"`
+            (toroidal), :code:`"fill"` (dead) or :code:`"symm"` (reflective).
+            Default is :code:`"wrap"`
 
         """
+        if boundary not in BOUNDARIES:
+            msg = f"Boundary ({boundary}) must be one of {BOUNDARIES}"
+            logger.error(msg)
+            raise ValueError(msg)
+
         self.size = size
+        self.boundary = boundary
         self.state = np.zeros(size, dtype=bool)
 
     def add(self, lifeform: Lifeform, loc: Tuple[int, int]):
@@ -74,12 +130,92 @@ class Board:
             logger.error("Lifeform is out-of-bounds!")
             raise
 
+    def add_many(
+        self, lifeform: Lifeform, locs: np.ndarray, mode: str = "overwrite"
+    ):
+        """Add copies of a lifeform at many locations
+
+        Parameters
+        ----------
+        lifeform: :obj:`seagull.lifeforms.base.Lifeform`
+            A lifeform that can evolve in the board
+        locs : array_like of shape :code:`(n, 2)`
+            Locations of the copies on the board
+        mode : str
+            How the copies are combined with the board and with each other,
+            one of :code:`"overwrite"` (the last copy wins), :code:`"or"`, or
+            :code:`"xor"`. Default is :code:`"overwrite"`
+        """
+        locs = _as_locs(locs)
+        self._stamp([(lifeform.layout, locs, np.arange(len(locs)))], mode)
+
+    def add_mixed(
+        self,
+        lifeforms: Sequence[Lifeform],
+        locs: np.ndarray,
+        mode: str = "overwrite",
+    ):
+        """Add different lifeforms, each at its own location
+
+        Parameters
+        ----------
+        lifeforms: list of :obj:`seagull.lifeforms.base.Lifeform`
+            Lifeforms that can evolve in the board. Repeated instances are
+            placed together
+        locs : array_like of shape :code:`(n, 2)`
+            Location of each lifeform on the board
+        mode : str
+            How the lifeforms are combined with the board and with each
+            other, one of :code:`"overwrite"` (the last lifeform wins),
+            :code:`"or"`, or :code:`"xor"`. Default is :code:`"overwrite"`
+        """
+        locs = _as_locs(locs)
+        if len(lifeforms) != len(locs):
+            msg = f"Got {len(lifeforms)} lifeforms for {len(locs)} locations"
+            logger.error(msg)
+            raise ValueError(msg)
+
+        groups = {}  # type: dict
+        for i, lifeform in enumerate(lifeforms):
+            groups.setdefault(id(lifeform), (lifeform, []))[1].append(i)
+        self._stamp(
+            [
+                (lifeform.layout, locs[order], np.array(order))
+                for lifeform, order in groups.values()
+            ],
+            mode,
+        )
+
+    def _stamp(self, groups: List[tuple], mode: str):
+        """Write placements given as :code:`(layout, locs, order)` groups"""
+        _check_mode(mode)
+        for layout, locs, _ in groups:
+            outside = ((locs < 0) | (locs + layout.shape > self.size)).any(1)
+            if outside.any():
+                msg = f"{outside.sum()} lifeforms are out-of-bounds!"
+                logger.error(msg)
+                raise ValueError(msg)
+
+        rows, cols, values = _placements(groups)
+        keys = rows * self.size[1] + cols
+        flat = self.state.reshape(-1)
+        if mode == "overwrite":
+            # Each cell takes the value of the last placement that covers it
+            last = np.full(flat.size, -1, dtype=np.int64)
+            np.maximum.at(last, keys, np.arange(len(keys)))
+            written = np.flatnonzero(last >= 0)
+            flat[written] = values[last[written]]
+        elif mode == "or":
+            flat[keys[values]] = True
+        else:
+            flat[_odd(keys[values])] ^= True
+
     def clear(self):
         """Clear the board and remove all lifeforms"""
         logger.debug("Board cleared!")
         self.state = np.zeros(self.size, dtype=bool)
 
-    def view(self, figsize=(5, 5)) -> Tuple[Figure, AxesImage]:
+    def view(self, figsize=(5, 5)) -> Tuple["Figure", "AxesImage"]:
         """View the current state of the board
 
         Parameters
@@ -92,8 +228,156 @@ class Board:
         (:obj:`matplotlib.figure.Figure`, :obj:`matplotlib.image.AxesImage`)
             Graphical view of the board
         """
+        import matplotlib.pyplot as plt
+
         fig = plt.figure(figsize=figsize)
         ax = fig.add_axes([0, 0, 1, 1], xticks=[], yticks=[], frameon=False)
         im = ax.imshow(self.state, cmap=plt.cm.binary, interpolation="nearest")
         im.set_clim(-0.05, 1)
         return fig, im
+
+
+class SparseBoard(Board):
+    """An unbounded board that only stores the coordinates of live cells"""
+
+    default_engine = "sparse"
+
+    def __init__(self, size=(100, 100)):
+        """Initialize the class
+
+        Parameters
+        ----------
+        size : array_like of size 2
+            Size of the viewport anchored at :code:`(0, 0)` (default is
+            `(100, 100)`)
+
+        """
+        self.size = size
+        self.boundary = "fill"
+        self.cells = np.empty((0, 2), dtype=np.int64)
+
+    @property
+    def state(self) -> np.ndarray:
+        """:obj:`numpy.ndarray`: Dense view of the cells in the viewport"""
+        return render_cells(self.cells, self.size)
+
+    def add(self, lifeform: Lifeform, loc: Tuple[int, int]):
+        """Add a lifeform to the board
+
+        Unlike :meth:`seagull.Board.add`, the lifeform can be placed anywhere
+        on the plane.
+
+        Parameters
+        ----------
+        lifeform: :obj:`seagull.lifeforms.base.Lifeform`
+            A lifeform that can evolve in the board
+        loc : array_like of size 2
+            Initial location of the lifeform on the board
+        """
+        row, col = loc
+        height, width = lifeform.size
+        rows, cols = self.cells.T
+        outside = (
+            (rows < row)
+            | (rows >= row + height)
+            | (cols < col)
+            | (cols >= col + width)
+        )
+        added = np.argwhere(lifeform.layout) + (row, col)
+        self.cells = np.unique(
+            np.concatenate([self.cells[outside], added]), axis=0
+        )
+
+    def _stamp(self, groups: List[tuple], mode: str):
+        # Lifeforms can be placed anywhere, so cells are compared by keys
+        from .engines.sparse import decode, encode
+
+        _check_mode(mode)
+        rows, cols, values = _placements(groups)
+        keys = encode(np.stack([rows, cols], axis=1))
+        current = encode(self.cells)
+        if mode == "overwrite":
+            # Keep the value of the last placement that covers each cell
+            keys, last = np.unique(keys[::-1], return_index=True)
+            values = values[::-1][last]
+            kept = current[~np.isin(current, keys)]
+            new = np.union1d(kept, keys[values])
+        elif mode == "or":
+            new = np.union1d(current, keys[values])
+        else:
+            new = np.setxor1d(current, _odd(keys[values]))
+        self.cells = decode(new)
+
+    def clear(self):
+        """Clear the board and remove all lifeforms"""
+        logger.debug("Board cleared!")
+        self.cells = np.empty((0, 2), dtype=np.int64)
+
+
+def render_cells(
+    cells: np.ndarray, size: Tuple[int, int], origin: Tuple[int, int] = (0, 0)
+) -> np.ndarray:
+    """Render live-cell coordinates into a dense boolean array
+
+    Parameters
+    ----------
+    cells : numpy.ndarray
+        Coordinates of live cells of shape :code:`(n, 2)`
+    size : array_like of size 2
+        Size of the rendered window
+    origin : array_like of size 2
+        Coordinates of the top-left cell of the window
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean array of shape :code:`size`
+    """
+    X = np.zeros(size, dtype=bool)
+    local = cells - origin
+    inside = np.all((local >= 0) & (local < size), axis=1)
+    X[tuple(local[inside].T)] = True
+    return X
+
+
+def _as_locs(locs: Iterable) -> np.ndarray:
+    """Check that locations are an array of shape :code:`(n, 2)`"""
+    locs = np.asarray(locs, dtype=np.int64)
+    if locs.ndim != 2 or locs.shape[1] != 2:
+        msg = f"Locations must have shape (n, 2), got {locs.shape}"
+        logger.error(msg)
+        raise ValueError(msg)
+    return locs
+
+
+def _check_mode(mode: str):
+    if mode not in MODES:
+        msg = f"Mode ({mode}) must be one of {MODES}"
+        logger.error(msg)
+        raise ValueError(msg)
+
+
+def _placements(groups: List[tuple]) -> Tuple[np.ndarray, ...]:
+    """Get the rows, columns, and values of every placed cell, in order"""
+    rows, cols, values, order = [], [], [], []
+    for layout, locs, index in groups:
+        dr, dc = np.indices(layout.shape).reshape(2, -1)
+        r = locs[:, :1] + dr
+        rows.append(r.ravel())
+        cols.append((locs[:, 1:] + dc).ravel())
+        values.append(np.broadcast_to(layout.ravel(), r.shape).ravel())
+        order.append(np.repeat(index, len(dr)))
+    if not rows:
+        return tuple(np.empty(0, dtype=dtype) for dtype in (int, int, bool))
+
+    placed = [np.concatenate(x) for x in (rows, cols, values, order)]
+    if len(groups) > 1:
+        sort = np.argsort(placed[3], kind="stable")
+        placed = [x[sort] for x in placed]
+    return tuple(placed[:3])
+
+
+def _odd(keys: np.ndarray) -> np.ndarray:
+    """Get the keys that appear an odd number of times"""
+    keys, counts = np.unique(keys, return_counts=True)
+    return keys[counts % 2 == 1]
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+"""Checkpoints let long simulations survive interruptions. When a
+checkpoint path is given to :meth:`seagull.Simulator.run`, the simulator
+periodically saves everything it needs to continue the run, and
+:meth:`seagull.Simulator.resume` continues it from the last checkpoint,
+giving the same generations and statistics as an uninterrupted run:
+
+.. code-block:: python
+
+    import seagull as sg
+    from seagull.history import PackedSink
+
+    sim = sg.Simulator(board)
+    sim.run(
+        sg.rules.conway_classic,
+        iters=10 ** 6,
+        history=PackedSink("run.sgh"),
+        checkpoint="run.ckpt",
+        checkpoint_every=10000,
+    )
+
+    # After an interruption, e.g. in a new process
+    sim = sg.Simulator(board)
+    stats = sim.resume("run.ckpt")
+
+A checkpoint is a :code:`.npz` file with the bit-packed state of the board
+(or the coordinates of the live cells, for unbounded engines), the
+generation, the running statistics, the position of the history sink, and a
+description of the run. It is first written to a temporary file that then
+replaces the previous checkpoint, so an interruption while saving never
+leaves a broken checkpoint behind. The checkpoint stays on disk once the run
+completes, so that the run can still be resumed from it, e.g. with other
+history sinks, and it is up to the caller to remove it.
+
+The history written to a file by a :obj:`seagull.history.DiskSink` or a
+:obj:`seagull.history.PackedSink` is continued in place, while sinks that
+keep generations in memory only keep the generations after the checkpoint.
+Rules and engines that are not known by name, e.g. custom callables, must be
+passed again to :meth:`seagull.Simulator.resume`.
+"""
+
+# Import standard library
+import json
+import os
+from typing import Optional, Tuple
+
+# Import modules
+import numpy as np
+from loguru import logger
+
+from .board import render_cells
+from .engines import Engine
+from .utils.packing import packbits, unpackbits
+
+# Counters that engines accumulate over a run for their statistics, e.g. the
+# tiles evaluated by the TiledEngine
+_COUNTERS = ("evaluated", "total")
+
+
+def save(path: str, spec: dict, generation: int, engine: Engine, **arrays):
+    """Atomically write a checkpoint
+
+    Parameters
+    ----------
+    path : str
+        Path of the checkpoint
+    spec : dict
+        JSON-serializable description of the run
+    generation : int
+        Generation of the engine
+    engine : :obj:`seagull.engines.base.Engine`
+        Engine holding the current generation
+    **arrays
+        Other arrays to save, e.g. the running statistics
+    """
+    cells = getattr(engine, "cells", None)
+    if cells is not None:
+        arrays["cells"] = np.asarray(cells, dtype=np.int64)
+    else:
+        arrays["layout"] = packbits(engine.state)
+    for name in _COUNTERS:
+        if hasattr(engine, name):
+            arrays[f"engine_{name}"] = np.array(getattr(engine, name))
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez(
+            f,
+            spec=np.array(json.dumps(spec)),
+            generation=np.array(generation),
+            **arrays,
+        )
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load(path: str) -> Tuple[dict, int, dict]:
+    """Read a checkpoint
+
+    Parameters
+    ----------
+    path : str
+        Path of the checkpoint
+
+    Returns
+    -------
+    tuple
+        Description of the run, generation, and the other saved arrays
+    """
+    with np.load(path) as f:
+        arrays = {key: f[key] for key in f.files}
+    if "spec" not in arrays:
+        msg = f"{path} is not a checkpoint"
+        logger.error(msg)
+        raise ValueError(msg)
+    spec = json.loads(str(arrays.pop("spec")))
+    return spec, int(arrays.pop("generation")), arrays
+
+
+class _Snapshot:
+    """Board-like view of a checkpoint, to load it into an engine"""
+
+    default_engine = None  # type: Optional[str]
+
+    def __init__(self, spec: dict, arrays: dict):
+        self.size = tuple(spec["size"])
+        self.boundary = spec["boundary"]
+        if "cells" in arrays:
+            self.cells = arrays["cells"]
+            self.state = render_cells(self.cells, self.size)
+        else:
+            self.state = unpackbits(arrays["layout"], self.size[1])
+        self.counters = {
+            name: int(arrays[f"engine_{name}"])
+            for name in _COUNTERS
+            if f"engine_{name}" in arrays
+        }
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""Engines hold the working state of a simulation and evolve it one
+generation at a time. You can choose an engine by passing its name to
+:meth:`seagull.Simulator.run`:
+
+.. code-block:: python
+
+    import seagull as sg
+
+    sim = sg.Simulator(board)
+    stats = sim.run(sg.rules.conway_classic, iters=1000, engine="bitpacked")
+
+The following engines are available:
+
+.. autosummary::
+    seagull.engines.base
+    seagull.engines.bitpacked
+    seagull.engines.sparse
+    seagull.engines.hashlife
+    seagull.engines.tiled
+
+"""
+
+# Import standard library
+from typing import Type, Union
+
+# Import modules
+from loguru import logger
+
+from .base import Engine, DenseEngine
+from .bitpacked import BitPackedEngine
+from .sparse import SparseEngine
+from .hashlife import HashLifeEngine
+from .tiled import TiledEngine
+
+ENGINES = {
+    "dense": DenseEngine,
+    "bitpacked": BitPackedEngine,
+    "sparse": SparseEngine,
+    "hashlife": HashLifeEngine,
+    "tiled": TiledEngine,
+}
+
+
+def get_engine(engine: Union[str, Type[Engine]]) -> Type[Engine]:
+    """Get an engine class from its name
+
+    Parameters
+    ----------
+    engine : str or type
+        Name of the engine, or the engine class itself
+
+    Returns
+    -------
+    type
+        Subclass of :obj:`seagull.engines.base.Engine`
+    """
+    if isinstance(engine, type) and issubclass(engine, Engine):
+        return engine
+    if engine not in ENGINES:
+        msg = f"Unknown engine {engine}, choose from {list(ENGINES)}"
+        logger.error(msg)
+        raise ValueError(msg)
+    return ENGINES[engine]
+
+
+__all__ = [
+    "Engine",
+    "DenseEngine",
+    "BitPackedEngine",
+    "SparseEngine",
+    "HashLifeEngine",
+    "TiledEngine",
+    "get_engine",
+]
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+"""Base class for all Engine implementations. An engine holds the working
+state of a simulation and knows how to advance it by one generation. The
+:obj:`seagull.Simulator` loads the board into an engine, calls :code:`step()`
+once per iteration, and reads back :code:`state` to record the history.
+
+The default :obj:`seagull.engines.base.DenseEngine` simply applies the rule
+callable to a dense boolean array. Other engines may store the board in a
+different representation, as long as they can give back a dense
+:obj:`numpy.ndarray` through their :code:`state` property.
+"""
+
+# Import standard library
+import abc
+import inspect
+from typing import Callable
+
+# Import modules
+import numpy as np
+from loguru import logger
+
+from ..utils.packing import packbits
+
+
+class Engine(abc.ABC):
+    """Base class for all Engine implementation"""
+
+    @abc.abstractmethod
+    def load(self, board):
+        """Load the initial state of a board into the engine
+
+        Parameters
+        ----------
+        board : seagull.Board
+            The board to take the initial state from
+        """
+        pass
+
+    @abc.abstractmethod
+    def step(self):
+        """Advance the loaded state by one generation"""
+        pass
+
+    @abc.abstractproperty
+    def state(self) -> np.ndarray:
+        """:obj:`numpy.ndarray`: Current state as a dense boolean array
+
+        The returned array must not be modified by later calls to
+        :code:`step()`, since the simulator keeps it in its history.
+        """
+        pass
+
+    def fingerprint(self) -> bytes:
+        """Get bytes that identify the current pattern
+
+        Two generations have the same fingerprint only if they have the same
+        live cells, which is used to detect cycles. By default, it is the
+        bit-packed :code:`state`.
+
+        Returns
+        -------
+        bytes
+            Fingerprint of the current generation
+        """
+        return packbits(self.state).tobytes()
+
+    def statistics(self) -> dict:
+        """Get engine-specific statistics of the run so far
+
+        These are added to the statistics returned by
+        :meth:`seagull.Simulator.run`. By default, there are none.
+
+        Returns
+        -------
+        dict
+            Engine statistics
+        """
+        return {}
+
+
+class DenseEngine(Engine):
+    """Applies the rule callable on a dense array every generation
+
+    If the rule accepts a :code:`boundary` keyword argument, the boundary of
+    the loaded board is passed to it on every step.
+    """
+
+    def __init__(self, rule: Callable, **kwargs):
+        """Initialize the class
+
+        Parameters
+        ----------
+        rule : callable
+            Callable that takes in an array and returns an array of the same
+            shape.
+        **kwargs
+            Keyword arguments passed to the rule on every step
+        """
+        self.rule = rule
+        self.kwargs = kwargs
+        self.layout = None  # type: np.ndarray
+
+    def load(self, board):
+        self.layout = board.state.copy()
+        self.kwargs.pop("boundary", None)
+        if _accepts_boundary(self.rule):
+            self.kwargs["boundary"] = board.boundary
+        elif board.boundary != "wrap":
+            logger.warning(
+                f"Rule {self.rule} has no boundary argument, "
+                f"the board's {board.boundary} boundary is ignored"
+            )
+
+    def step(self):
+        self.layout = self.rule(self.layout, **self.kwargs)
+
+    @property
+    def state(self) -> np.ndarray:
+        return self.layout
+
+
+def _warn_boundary(engine: Engine, board):
+    """Warn that an unbounded engine ignores the edges of a dense board"""
+    if getattr(board, "cells", None) is None and not hasattr(board, "root"):
+        logger.warning(
+            f"{type(engine).__name__} evolves an unbounded plane, "
+            f"the board's {board.boundary} boundary is ignored"
+        )
+
+
+def _accepts_boundary(rule: Callable) -> bool:
+    """Check if a rule callable takes a boundary keyword argument"""
+    try:
+        params = inspect.signature(rule).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(
+        p.name == "boundary" or p.kind == inspect.Parameter.VAR_KEYWORD
+        for p in params
+    )
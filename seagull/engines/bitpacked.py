@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+"""The bit-packed engine stores each row of the board as packed :code:`uint64`
+words, so that a single machine word holds 64 cells. Neighbor counts are
+computed for all 64 cells at once with bitwise full-adders: the eight
+neighbor rows are obtained through shifts across word boundaries, and their
+sum is kept as four bit-planes. The rule is then applied by matching those
+bit-planes against the birth and survival counts.
+
+It works for any outer-totalistic rule in B/S notation, so it accepts a
+compiled :obj:`seagull.rules.Rule`, a rulestring,
+:func:`seagull.rules.conway_classic`, or :func:`seagull.rules.life_rule` with
+a :code:`rulestring`. All boundaries of :obj:`seagull.Board` are supported:
+
+.. code-block:: python
+
+    import seagull as sg
+
+    sim = sg.Simulator(board)
+    stats = sim.run(sg.rules.conway_classic, iters=1000, engine="bitpacked")
+"""
+
+# Import standard library
+from typing import Callable, List, Tuple, Union
+
+# Import modules
+import numpy as np
+
+from ..rules import Rule, _as_rule
+from .base import Engine
+
+_ONE = np.uint64(1)
+_TOP = np.uint64(63)
+_ALL = np.iinfo(np.uint64).max
+
+
+class BitPackedEngine(Engine):
+    """Evolves 64 cells per machine word using bitwise arithmetic"""
+
+    def __init__(self, rule: Union[Rule, Callable, str], **kwargs):
+        """Initialize the class
+
+        Parameters
+        ----------
+        rule : :obj:`seagull.rules.Rule`, callable, or str
+            The B/S rule to apply
+        **kwargs
+            Keyword arguments for the rule, e.g. the :code:`rulestring` of
+            :func:`seagull.rules.life_rule`
+        """
+        self.rule = _as_rule(rule, **kwargs)
+        self.words = None  # type: np.ndarray
+        self.shape = None  # type: Tuple[int, int]
+        self.boundary = "wrap"
+
+    def load(self, board):
+        self.boundary = board.boundary
+        self.shape = board.state.shape
+        self.words = pack(board.state)
+
+        height, width = self.shape
+        last = (width - 1) % 64
+        self._last_word = self.words.shape[1] - 1
+        self._last_bit = np.uint64(last)
+        self._mask = np.uint64((1 << (last + 1)) - 1)
+
+    def step(self):
+        x = self.words
+        up = self._shift_rows(x, 1)
+        down = self._shift_rows(x, -1)
+
+        neighbors = [
+            self._west(up),
+            up,
+            self._east(up),
+            self._west(x),
+            self._east(x),
+            self._west(down),
+            down,
+            self._east(down),
+        ]
+        s0, s1, s2, s3 = _add8(neighbors)
+
+        born = _match(self.rule.birth, s0, s1, s2, s3)
+        survive = _match(self.rule.survival, s0, s1, s2, s3)
+        x = (~x & born) | (x & survive)
+        x[:, self._last_word] &= self._mask
+        self.words = x
+
+    @property
+    def state(self) -> np.ndarray:
+        return unpack(self.words, self.shape[1])
+
+    def _shift_rows(self, x: np.ndarray, d: int) -> np.ndarray:
+        """Shift so that each row holds the row above (d=1) or below (d=-1)"""
+        if self.boundary == "wrap":
+            return np.roll(x, d, axis=0)
+
+        shifted = np.zeros_like(x)
+        if d > 0:
+            shifted[1:] = x[:-1]
+            edge = 0
+        else:
+            shifted[:-1] = x[1:]
+            edge = -1
+        if self.boundary == "symm":
+            shifted[edge] = x[edge]
+        return shifted
+
+    def _west(self, r: np.ndarray) -> np.ndarray:
+        """Shift so that each cell holds its left neighbor"""
+        w = r << _ONE
+        w[:, 1:] |= r[:, :-1] >> _TOP
+        if self.boundary == "wrap":
+            w[:, 0] |= (r[:, self._last_word] >> self._last_bit) & _ONE
+        elif self.boundary == "symm":
+            w[:, 0] |= r[:, 0] & _ONE
+        return w
+
+    def _east(self, r: np.ndarray) -> np.ndarray:
+        """Shift so that each cell holds its right neighbor"""
+        e = r >> _ONE
+        e[:, :-1] |= r[:, 1:] << _TOP
+        if self.boundary == "wrap":
+            e[:, self._last_word] |= (r[:, 0] & _ONE) << self._last_bit
+        elif self.boundary == "symm":
+            last = r[:, self._last_word] & (_ONE << self._last_bit)
+            e[:, self._last_word] |= last
+        return e
+
+
+def pack(X: np.ndarray) -> np.ndarray:
+    """Pack a boolean board into rows of :code:`uint64` words
+
+    Bit :code:`j` of word :code:`k` holds column :code:`64 * k + j`. Columns
+    past the width of the board are always zero.
+    """
+    X = np.asarray(X, dtype=bool)
+    height, width = X.shape
+    n_words = -(-width // 64)
+    padded = np.zeros((height, n_words * 64), dtype=bool)
+    padded[:, :width] = X
+    packed = np.packbits(padded, axis=1, bitorder="little")
+    return packed.view("<u8").astype(np.uint64, copy=False)
+
+
+def unpack(words: np.ndarray, width: int) -> np.ndarray:
+    """Unpack rows of :code:`uint64` words into a boolean board"""
+    packed = words.astype("<u8", copy=False).view(np.uint8)
+    X = np.unpackbits(packed, axis=1, count=width, bitorder="little")
+    return X.view(bool)
+
+
+def _full_add(a, b, c) -> Tuple[np.ndarray, np.ndarray]:
+    """Add three bit-planes, returning the sum and carry planes"""
+    t = a ^ b
+    return t ^ c, (a & b) | (t & c)
+
+
+def _add8(planes: List[np.ndarray]) -> Tuple[np.ndarray, ...]:
+    """Add eight bit-planes into a 4-bit count"""
+    a, b, c, d, e, f, g, h = planes
+    s1, c1 = _full_add(a, b, c)
+    s2, c2 = _full_add(d, e, f)
+    s3, c3 = g ^ h, g & h
+    # Ones
+    bit0, c4 = _full_add(s1, s2, s3)
+    # Twos
+    t, c5 = _full_add(c1, c2, c3)
+    bit1, c6 = t ^ c4, t & c4
+    # Fours and eights
+    bit2, bit3 = c5 ^ c6, c5 & c6
+    return bit0, bit1, bit2, bit3
+
+
+def _match(counts: List[int], *bits) -> np.ndarray:
+    """Get the cells whose 4-bit neighbor count is one of the counts"""
+    result = np.zeros_like(bits[0])
+    for n in set(counts):
+        eq = np.full_like(result, _ALL)
+        for i, plane in enumerate(bits):
+            eq &= plane if (n >> i) & 1 else ~plane
+        result |= eq
+    return result
@@ -0,0 +1,636 @@
+# -*- coding: utf-8 -*-
+
+"""The HashLife engine stores the plane as a quadtree of canonical nodes:
+identical subtrees are stored only once, and the evolution of every node is
+memoized. A node of level :code:`k` covers a :code:`2**k` square, and its
+successor is the centered :code:`2**(k-1)` square advanced by up to
+:code:`2**(k-2)` generations. This lets highly-structured patterns such as
+guns and breeders jump millions of generations at once.
+
+Use it through :meth:`seagull.Simulator.advance` to get the state of the
+board after an arbitrary number of generations without recording the
+history in-between:
+
+.. code-block:: python
+
+    import seagull as sg
+
+    board = sg.Board(size=(100, 100))
+    board.add(sg.lifeforms.Unbounded(), loc=(50, 50))
+    sim = sg.Simulator(board)
+    state = sim.advance(sg.rules.conway_classic, generations=10 ** 6)
+
+Patterns that are already stored as a quadtree, such as a
+:obj:`seagull.lifeforms.wiki.Macrocell` read from a Macrocell file, are
+loaded node by node, without ever being made dense.
+
+The plane is unbounded, so the boundary of a dense board is ignored with a
+warning. Rules with :code:`B0` are not supported since they would turn the
+infinite empty plane alive.
+
+The node cache grows with the number of distinct subtrees seen during a run.
+Whenever it holds more than :code:`max_nodes` nodes, all nodes that are not
+part of the current pattern are dropped, along with the memoized results.
+This is done between jumps, so the limit can be briefly exceeded within a
+single large jump.
+"""
+
+# Import standard library
+from typing import Callable, Dict, Optional, Tuple, Union
+
+# Import modules
+import numpy as np
+from loguru import logger
+
+from ..rules import Rule, _as_rule
+from .base import Engine, _warn_boundary
+
+#: Default maximum number of nodes kept in the cache
+MAX_NODES = 1 << 21
+
+
+class Node:
+    """A canonical node of the quadtree
+
+    Nodes of level 0 are single cells. Nodes of level :code:`k` are made of
+    four children of level :code:`k - 1`, and should only be created through
+    :meth:`QuadTree.join` so that identical subtrees are shared.
+    """
+
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population")
+
+    def __init__(self, level, nw, ne, sw, se, population):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+    def __repr__(self) -> str:
+        return "Node(level={}, population={})".format(
+            self.level, self.population
+        )
+
+
+class QuadTree:
+    """Cache of canonical quadtree nodes and their memoized successors"""
+
+    def __init__(
+        self,
+        rule: Union[Rule, Callable, str, None] = None,
+        max_nodes: int = MAX_NODES,
+        **kwargs,
+    ):
+        """Initialize the class
+
+        Parameters
+        ----------
+        rule : :obj:`seagull.rules.Rule`, callable, or str, optional
+            The B/S rule used to compute successors. A quadtree without a rule
+            can only be used for storing patterns
+        max_nodes : int
+            Number of cached nodes before unused ones are dropped
+        **kwargs
+            Keyword arguments for the rule, e.g. the :code:`rulestring` of
+            :func:`seagull.rules.life_rule`
+        """
+        self.rule = None if rule is None else _as_rule(rule, **kwargs)
+        if self.rule is not None and 0 in self.rule.birth:
+            msg = f"Rules with B0 ({self.rule.rulestring}) are not supported"
+            logger.error(msg)
+            raise ValueError(msg)
+
+        self.max_nodes = max_nodes
+        self.off = Node(0, None, None, None, None, 0)
+        self.on = Node(0, None, None, None, None, 1)
+        self._nodes = {}  # type: Dict[tuple, Node]
+        self._empty = [self.off]
+        self._memo = {}  # type: Dict[tuple, Node]
+        self._blocks = {}  # type: Dict[Node, np.ndarray]
+        self._leaves = {}  # type: Dict[tuple, Node]
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """Get the canonical node made of four children"""
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            population = (
+                nw.population + ne.population + sw.population + se.population
+            )
+            node = Node(nw.level + 1, nw, ne, sw, se, population)
+            self._nodes[key] = node
+        return node
+
+    def empty(self, level: int) -> Node:
+        """Get the empty node of a given level"""
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self.join(e, e, e, e))
+        return self._empty[level]
+
+    def centre(self, node: Node) -> Node:
+        """Get the node one level up with the given node at its center"""
+        e = self.empty(node.level - 1)
+        return self.join(
+            self.join(e, e, e, node.nw),
+            self.join(e, e, node.ne, e),
+            self.join(e, node.sw, e, e),
+            self.join(node.se, e, e, e),
+        )
+
+    def inner(self, node: Node) -> Node:
+        """Get the centered node one level down"""
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def successor(self, node: Node, j: int) -> Node:
+        """Advance the center of a node by :code:`2**j` generations
+
+        Parameters
+        ----------
+        node : :obj:`Node`
+            Node of level :code:`k >= 2`
+        j : int
+            Base-2 logarithm of the number of generations, capped at
+            :code:`k - 2`
+
+        Returns
+        -------
+        :obj:`Node`
+            The centered node of level :code:`k - 1` after the jump
+        """
+        if node.population == 0:
+            return node.nw
+
+        j = min(j, node.level - 2)
+        key = (node, j)
+        result = self._memo.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            a, b, c, d = node.nw, node.ne, node.sw, node.se
+            join, succ = self.join, self.successor
+            c1 = succ(a, j)
+            c2 = succ(join(a.ne, b.nw, a.se, b.sw), j)
+            c3 = succ(b, j)
+            c4 = succ(join(a.sw, a.se, c.nw, c.ne), j)
+            c5 = succ(join(a.se, b.sw, c.ne, d.nw), j)
+            c6 = succ(join(b.sw, b.se, d.nw, d.ne), j)
+            c7 = succ(c, j)
+            c8 = succ(join(c.ne, d.nw, c.se, d.sw), j)
+            c9 = succ(d, j)
+            if j < node.level - 2:
+                result = join(
+                    join(c1.se, c2.sw, c4.ne, c5.nw),
+                    join(c2.se, c3.sw, c5.ne, c6.nw),
+                    join(c4.se, c5.sw, c7.ne, c8.nw),
+                    join(c5.se, c6.sw, c8.ne, c9.nw),
+                )
+            else:
+                result = join(
+                    succ(join(c1, c2, c4, c5), j),
+                    succ(join(c2, c3, c5, c6), j),
+                    succ(join(c4, c5, c7, c8), j),
+                    succ(join(c5, c6, c8, c9), j),
+                )
+
+        self._memo[key] = result
+        return result
+
+    def advance(
+        self, node: Node, origin: Tuple[int, int], generations: int
+    ) -> Tuple[Node, Tuple[int, int]]:
+        """Advance a pattern by any number of generations
+
+        The number of generations is split into power-of-two jumps. Before
+        each jump, the pattern is padded with empty space so that it can't
+        escape the returned node, and it's cropped again afterwards.
+
+        Parameters
+        ----------
+        node : :obj:`Node`
+            Root node of the pattern
+        origin : tuple of int
+            Coordinates of the top-left cell of the root node
+        generations : int
+            Number of generations to advance
+
+        Returns
+        -------
+        (:obj:`Node`, tuple of int)
+            Root node and origin of the advanced pattern
+        """
+        row, col = origin
+        while generations > 0:
+            j = generations.bit_length() - 1
+            while node.level < j + 3 or not self._is_padded(node):
+                half = 1 << (node.level - 1)
+                node = self.centre(node)
+                row, col = row - half, col - half
+
+            quarter = 1 << (node.level - 2)
+            node = self.successor(node, j)
+            row, col = row + quarter, col + quarter
+            generations -= 1 << j
+
+            node, (row, col) = self.crop(node, (row, col))
+            if len(self._nodes) > self.max_nodes:
+                self.collect(node)
+
+        return node, (row, col)
+
+    def crop(
+        self, node: Node, origin: Tuple[int, int]
+    ) -> Tuple[Node, Tuple[int, int]]:
+        """Remove empty borders around a pattern, down to level 3"""
+        row, col = origin
+        while node.level > 3 and self._is_padded(node):
+            quarter = 1 << (node.level - 2)
+            node = self.inner(node)
+            row, col = row + quarter, col + quarter
+        return node, (row, col)
+
+    def collect(self, *roots: Node):
+        """Drop every cached node that is not part of the given roots
+
+        Memoized successors are dropped as well, since they may refer to
+        nodes that are no longer cached.
+        """
+        nodes = {}
+        stack = list(roots) + self._empty[1:]
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key in nodes:
+                continue
+            nodes[key] = node
+            stack.extend(key)
+
+        logger.debug(f"Collected {len(self._nodes) - len(nodes)} nodes")
+        self._nodes = nodes
+        self._memo.clear()
+        self._blocks.clear()
+        self._leaves.clear()
+        if len(nodes) > self.max_nodes:
+            logger.warning(
+                f"The pattern alone needs {len(nodes)} nodes, "
+                f"more than max_nodes={self.max_nodes}"
+            )
+
+    def adopt(self, node: Node) -> Node:
+        """Get the canonical node of this quadtree for a node of another
+
+        The copy visits every distinct subtree once, so it is proportional
+        to the number of nodes rather than to the area of the pattern.
+        Nodes of this quadtree are returned as they are.
+        """
+        if node.level == 0:
+            return self.on if node.population else self.off
+        if self._nodes.get((node.nw, node.ne, node.sw, node.se)) is node:
+            return node
+
+        adopted = {}  # type: Dict[int, Node]
+
+        def _adopt(node: Node) -> Node:
+            if node.level == 0:
+                return self.on if node.population else self.off
+            result = adopted.get(id(node))
+            if result is None:
+                result = self.join(
+                    _adopt(node.nw),
+                    _adopt(node.ne),
+                    _adopt(node.sw),
+                    _adopt(node.se),
+                )
+                adopted[id(node)] = result
+            return result
+
+        return _adopt(node)
+
+    def bounds(self, node: Node) -> Optional[Tuple[int, int, int, int]]:
+        """Get the bounding box of the live cells of a node
+
+        Parameters
+        ----------
+        node : :obj:`Node`
+            Node of any level
+
+        Returns
+        -------
+        tuple of int or None
+            Top, left, bottom and right edges (exclusive) of the live cells
+            relative to the top-left cell of the node, or None if empty
+        """
+        found = {}  # type: Dict[int, Tuple[int, int, int, int]]
+
+        def _bounds(node: Node) -> Tuple[int, int, int, int]:
+            result = found.get(id(node))
+            if result is not None:
+                return result
+            if node.level <= 3:
+                cells = np.argwhere(self._block(node))
+                top, left = cells.min(axis=0)
+                bottom, right = cells.max(axis=0) + 1
+                result = (int(top), int(left), int(bottom), int(right))
+            else:
+                half = 1 << (node.level - 1)
+                edges = [
+                    (t + dr, l + dc, b + dr, r + dc)
+                    for child, dr, dc in (
+                        (node.nw, 0, 0),
+                        (node.ne, 0, half),
+                        (node.sw, half, 0),
+                        (node.se, half, half),
+                    )
+                    if child.population
+                    for t, l, b, r in [_bounds(child)]
+                ]
+                top, left, bottom, right = zip(*edges)
+                result = (min(top), min(left), max(bottom), max(right))
+            found[id(node)] = result
+            return result
+
+        return _bounds(node) if node.population else None
+
+    def from_cells(self, cells: np.ndarray) -> Tuple[Node, Tuple[int, int]]:
+        """Build a pattern from the coordinates of its live cells
+
+        Parameters
+        ----------
+        cells : numpy.ndarray
+            Coordinates of live cells of shape :code:`(n, 2)`
+
+        Returns
+        -------
+        (:obj:`Node`, tuple of int)
+            Root node and the coordinates of its top-left cell
+        """
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        if len(cells) == 0:
+            return self.empty(3), (0, 0)
+
+        origin = cells.min(axis=0)
+        extent = int((cells.max(axis=0) - origin).max()) + 1
+        level = max(3, (extent - 1).bit_length())
+        node = self._build(cells - origin, level)
+        return node, (int(origin[0]), int(origin[1]))
+
+    def from_array(self, X: np.ndarray) -> Node:
+        """Build a pattern from a dense array anchored at :code:`(0, 0)`"""
+        height, width = np.shape(X)
+        level = max(3, (max(height, width) - 1).bit_length())
+        return self._build(np.argwhere(X), level)
+
+    def to_array(
+        self,
+        node: Node,
+        origin: Tuple[int, int],
+        window: Tuple[int, int, int, int],
+    ) -> np.ndarray:
+        """Render a window of a pattern into a dense array
+
+        Parameters
+        ----------
+        node : :obj:`Node`
+            Root node of the pattern
+        origin : tuple of int
+            Coordinates of the top-left cell of the root node
+        window : tuple of int
+            Window to render as :code:`(row, col, height, width)`
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array of shape :code:`(height, width)`
+        """
+        row, col, height, width = window
+        X = np.zeros((height, width), dtype=bool)
+        self._render(node, origin[0] - row, origin[1] - col, X)
+        return X
+
+    def _render(self, node: Node, row: int, col: int, X: np.ndarray):
+        """Paste a node whose top-left cell is at (row, col) of X"""
+        size = 1 << node.level
+        height, width = X.shape
+        if (
+            node.population == 0
+            or row >= height
+            or col >= width
+            or row + size <= 0
+            or col + size <= 0
+        ):
+            return
+
+        if node.level <= 3:
+            block = self._block(node)
+            r0, c0 = max(row, 0), max(col, 0)
+            r1, c1 = min(row + size, height), min(col + size, width)
+            X[r0:r1, c0:c1] = block[r0 - row : r1 - row, c0 - col : c1 - col]
+            return
+
+        half = size >> 1
+        self._render(node.nw, row, col, X)
+        self._render(node.ne, row, col + half, X)
+        self._render(node.sw, row + half, col, X)
+        self._render(node.se, row + half, col + half, X)
+
+    def _block(self, node: Node) -> np.ndarray:
+        """Get the dense array of a small node"""
+        block = self._blocks.get(node)
+        if block is None:
+            if node.level == 0:
+                block = np.array([[node.population]], dtype=bool)
+            else:
+                block = np.block(
+                    [
+                        [self._block(node.nw), self._block(node.ne)],
+                        [self._block(node.sw), self._block(node.se)],
+                    ]
+                )
+            self._blocks[node] = block
+        return block
+
+    def _build(self, cells: np.ndarray, level: int) -> Node:
+        """Build a node of a given level from local cell coordinates"""
+        if len(cells) == 0:
+            return self.empty(level)
+        if level <= 3:
+            shifts = (cells[:, 0] * 8 + cells[:, 1]).astype(np.uint64)
+            bits = np.bitwise_or.reduce(np.left_shift(np.uint64(1), shifts))
+            return self._leaf(int(bits), level)
+
+        half = 1 << (level - 1)
+        top = cells[:, 0] < half
+        left = cells[:, 1] < half
+        return self.join(
+            self._build(cells[top & left], level - 1),
+            self._build(cells[top & ~left] - (0, half), level - 1),
+            self._build(cells[~top & left] - (half, 0), level - 1),
+            self._build(cells[~top & ~left] - (half, half), level - 1),
+        )
+
+    def _leaf(self, bits: int, level: int = 3) -> Node:
+        """Get the node of an 8x8 block given as a row-major bitmask"""
+        key = (bits, level)
+        node = self._leaves.get(key)
+        if node is None:
+            node = self._leaf_node(bits, 0, 0, level)
+            self._leaves[key] = node
+        return node
+
+    def _leaf_node(self, bits: int, row: int, col: int, level: int) -> Node:
+        """Build the node at (row, col) of an 8x8 bitmask"""
+        if level == 0:
+            return self.on if (bits >> (row * 8 + col)) & 1 else self.off
+        half = 1 << (level - 1)
+        return self.join(
+            self._leaf_node(bits, row, col, level - 1),
+            self._leaf_node(bits, row, col + half, level - 1),
+            self._leaf_node(bits, row + half, col, level - 1),
+            self._leaf_node(bits, row + half, col + half, level - 1),
+        )
+
+    def _is_padded(self, node: Node) -> bool:
+        """Check if all live cells are in the central quarter of a node"""
+        return (
+            node.level >= 3
+            and node.nw.population == node.nw.se.se.population
+            and node.ne.population == node.ne.sw.sw.population
+            and node.sw.population == node.sw.ne.ne.population
+            and node.se.population == node.se.nw.nw.population
+        )
+
+    def _life_4x4(self, node: Node) -> Node:
+        """Advance the center 2x2 cells of a 4x4 node by one generation"""
+        a, b, c, d = node.nw, node.ne, node.sw, node.se
+        grid = [
+            [a.nw, a.ne, b.nw, b.ne],
+            [a.sw, a.se, b.sw, b.se],
+            [c.nw, c.ne, d.nw, d.ne],
+            [c.sw, c.se, d.sw, d.se],
+        ]
+        grid = [[cell.population for cell in row] for row in grid]
+
+        table = self.rule.table
+        center = []
+        for r, c in ((1, 1), (1, 2), (2, 1), (2, 2)):
+            neighbors = (
+                sum(grid[r - 1][c - 1 : c + 2])
+                + grid[r][c - 1]
+                + grid[r][c + 1]
+                + sum(grid[r + 1][c - 1 : c + 2])
+            )
+            center.append(
+                self.on if table[grid[r][c], neighbors] else self.off
+            )
+        return self.join(*center)
+
+
+class HashLifeEngine(Engine):
+    """Evolves an unbounded pattern with a memoized quadtree"""
+
+    def __init__(
+        self,
+        rule: Union[Rule, Callable, str],
+        max_nodes: int = MAX_NODES,
+        **kwargs,
+    ):
+        """Initialize the class
+
+        Parameters
+        ----------
+        rule : :obj:`seagull.rules.Rule`, callable, or str
+            The B/S rule to apply
+        max_nodes : int
+            Number of cached nodes before unused ones are dropped
+        **kwargs
+            Keyword arguments for the rule, e.g. the :code:`rulestring` of
+            :func:`seagull.rules.life_rule`
+        """
+        self.tree = QuadTree(rule, max_nodes=max_nodes, **kwargs)
+        self.root = self.tree.empty(3)  # type: Node
+        self.origin = (0, 0)
+        self.size = None  # type: Optional[Tuple[int, int]]
+        self.generation = 0
+
+    def load(self, board):
+        self.size = board.size
+        root = getattr(board, "root", None)
+        if root is not None:
+            # Patterns stored as a quadtree are copied node by node
+            self.root = self.tree.adopt(root)
+            self.origin = tuple(board.origin)
+        else:
+            cells = getattr(board, "cells", None)
+            if cells is None:
+                _warn_boundary(self, board)
+                cells = np.argwhere(board.state)
+            self.root, self.origin = self.tree.from_cells(cells)
+        self.generation = 0
+
+    def step(self):
+        self.advance(1)
+
+    def advance(self, generations: int):
+        """Advance the loaded pattern by any number of generations
+
+        Parameters
+        ----------
+        generations : int
+            Number of generations to advance
+        """
+        self.root, self.origin = self.tree.advance(
+            self.root, self.origin, generations
+        )
+        self.generation += generations
+
+    def render(
+        self, window: Optional[Tuple[int, int, int, int]] = None
+    ) -> np.ndarray:
+        """Render a window of the current pattern
+
+        Parameters
+        ----------
+        window : tuple of int, optional
+            Window to render as :code:`(row, col, height, width)`. Default is
+            the size of the loaded board anchored at :code:`(0, 0)`
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array of the window
+        """
+        if window is None:
+            window = (0, 0) + tuple(self.size)
+        return self.tree.to_array(self.root, self.origin, window)
+
+    def fingerprint(self) -> bytes:
+        # The quadtree of a pattern depends on its alignment, so the cells
+        # are listed with their coordinates on the plane instead
+        return self.cells.tobytes()
+
+    @property
+    def cells(self) -> np.ndarray:
+        """:obj:`numpy.ndarray`: Coordinates of the live cells"""
+        side = 1 << self.root.level
+        X = self.tree.to_array(
+            self.root, self.origin, self.origin + (side, side)
+        )
+        return np.argwhere(X) + self.origin
+
+    @property
+    def population(self) -> int:
+        """int: Number of live cells on the whole plane"""
+        return self.root.population
+
+    @property
+    def state(self) -> np.ndarray:
+        return self.render()
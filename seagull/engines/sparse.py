@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+"""The sparse engine evolves a set of live-cell coordinates on an unbounded
+plane. Every live cell contributes to the neighbor counts of its eight
+neighbors, and only the cells that received a contribution are checked
+against the rule, so the work per generation is proportional to the live
+population rather than to the size of the board.
+
+It is the default engine of :obj:`seagull.board.SparseBoard`:
+
+.. code-block:: python
+
+    import seagull as sg
+
+    board = sg.SparseBoard(size=(50, 50))
+    board.add(sg.lifeforms.Glider(), loc=(0, 0))
+    sim = sg.Simulator(board)
+    stats = sim.run(sg.rules.conway_classic, iters=1000)
+
+When loading a dense :obj:`seagull.Board`, its state is used as the initial
+pattern on the unbounded plane, i.e. the board's boundary is ignored with a
+warning. Rules with :code:`B0` are not supported since they would turn the
+infinite empty plane alive.
+"""
+
+# Import standard library
+from typing import Callable, Union
+
+# Import modules
+import numpy as np
+from loguru import logger
+
+from ..board import render_cells
+from ..rules import Rule, _as_rule
+from .base import Engine, _warn_boundary
+
+# Coordinates are packed into a single int64 key, 31 bits per axis
+_BITS = 31
+_OFFSET = 1 << (_BITS - 1)
+_NEIGHBORS = np.array(
+    [
+        (dr << _BITS) + dc
+        for dr in (-1, 0, 1)
+        for dc in (-1, 0, 1)
+        if (dr, dc) != (0, 0)
+    ],
+    dtype=np.int64,
+)
+
+
+class SparseEngine(Engine):
+    """Evolves live-cell coordinates with work proportional to population"""
+
+    def __init__(self, rule: Union[Rule, Callable, str], **kwargs):
+        """Initialize the class
+
+        Parameters
+        ----------
+        rule : :obj:`seagull.rules.Rule`, callable, or str
+            The B/S rule to apply
+        **kwargs
+            Keyword arguments for the rule, e.g. the :code:`rulestring` of
+            :func:`seagull.rules.life_rule`
+        """
+        self.rule = _as_rule(rule, **kwargs)
+        if 0 in self.rule.birth:
+            msg = f"Rules with B0 ({self.rule.rulestring}) are not supported"
+            logger.error(msg)
+            raise ValueError(msg)
+
+        self.keys = np.empty(0, dtype=np.int64)
+        self.size = None
+
+    def load(self, board):
+        self.size = board.size
+        cells = getattr(board, "cells", None)
+        if cells is None:
+            _warn_boundary(self, board)
+            cells = np.argwhere(board.state)
+        self.keys = np.unique(encode(cells))
+
+    def step(self):
+        keys = self.keys
+        candidates = (keys[:, None] + _NEIGHBORS).ravel()
+        candidates, counts = np.unique(candidates, return_counts=True)
+
+        alive = _contains(keys, candidates)
+        new = candidates[self.rule.table[alive.view(np.uint8), counts]]
+
+        if self.rule.table[1, 0]:
+            # Live cells without neighbors never show up as candidates
+            isolated = keys[~_contains(candidates, keys)]
+            new = np.union1d(new, isolated)
+
+        self.keys = new
+
+    def fingerprint(self) -> bytes:
+        return self.keys.tobytes()
+
+    @property
+    def cells(self) -> np.ndarray:
+        """:obj:`numpy.ndarray`: Coordinates of the live cells"""
+        return decode(self.keys)
+
+    @property
+    def state(self) -> np.ndarray:
+        return render_cells(self.cells, self.size)
+
+
+def encode(cells: np.ndarray) -> np.ndarray:
+    """Pack :code:`(n, 2)` cell coordinates into sortable int64 keys"""
+    cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+    return ((cells[:, 0] + _OFFSET) << _BITS) + (cells[:, 1] + _OFFSET)
+
+
+def decode(keys: np.ndarray) -> np.ndarray:
+    """Unpack int64 keys into :code:`(n, 2)` cell coordinates"""
+    rows = (keys >> _BITS) - _OFFSET
+    cols = (keys & ((1 << _BITS) - 1)) - _OFFSET
+    return np.stack([rows, cols], axis=1)
+
+
+def _contains(sorted_keys: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Check which keys are in a sorted array of keys"""
+    if len(sorted_keys) == 0:
+        return np.zeros(len(keys), dtype=bool)
+    idx = np.searchsorted(sorted_keys, keys)
+    idx[idx == len(sorted_keys)] = 0
+    return sorted_keys[idx] == keys
@@ -0,0 +1,598 @@
+# -*- coding: utf-8 -*-
+
+"""History sinks decide which generations of a simulation are kept, and
+where. By default, the :obj:`seagull.Simulator` keeps every generation in
+memory, which takes up to :code:`(iters + 1) * height * width` bytes. For
+long runs on large boards, you can pass another sink to
+:meth:`seagull.Simulator.run`:
+
+.. code-block:: python
+
+    import seagull as sg
+    from seagull.history import RingSink
+
+    sim = sg.Simulator(board)
+    stats = sim.run(sg.rules.conway_classic, iters=10000, history=RingSink(50))
+    last_frames = sim.get_history()
+
+The available sinks are:
+
+    * :obj:`MemorySink`: keeps every :code:`k`-th generation in memory
+      (default)
+    * :obj:`NullSink`: keeps nothing
+    * :obj:`RingSink`: keeps only the last :code:`n` kept generations
+    * :obj:`DiskSink`: writes every :code:`k`-th generation to an :code:`.npy`
+    * :obj:`PackedSink`: writes every :code:`k`-th generation to a bit-packed,
+      memory-mapped file that takes 8 times less space than an :code:`.npy`
+
+The history written by a :obj:`PackedSink` is read back with a
+:obj:`HistoryReader`, which only unpacks the generations that are accessed:
+
+.. code-block:: python
+
+    from seagull.history import HistoryReader, PackedSink
+
+    sim.run(
+        sg.rules.conway_classic, iters=10000, history=PackedSink("run.sgh")
+    )
+    reader = HistoryReader("run.sgh")
+    reader[-1]  # last generation
+    reader[100:200]  # generations 100 to 199
+
+Statistics are computed while the simulation runs, so they don't depend on
+which generations are kept.
+"""
+
+# Import standard library
+import abc
+import json
+from typing import List, Tuple, Union
+
+# Import modules
+import numpy as np
+from loguru import logger
+
+from .utils.packing import packbits, packed_width, popcount, unpackbits
+
+
+class HistorySink(abc.ABC):
+    """Base class for all history sinks"""
+
+    def __init__(self, every: int = 1):
+        """Initialize the class
+
+        Parameters
+        ----------
+        every : int
+            Keep one generation out of :code:`every`, starting with the
+            initial state. Default is 1 (keep all)
+        """
+        if every < 1:
+            msg = f"every ({every}) must be at least 1"
+            logger.error(msg)
+            raise ValueError(msg)
+        self.every = every
+        self.shape = None  # type: Tuple[int, int]
+        self.generations = []  # type: List[int]
+
+    def open(self, shape: Tuple[int, int], iters: int, **metadata):
+        """Prepare the sink for a new simulation run
+
+        Parameters
+        ----------
+        shape : tuple of int
+            Shape of each generation
+        iters : int
+            Number of iterations of the run
+        **metadata
+            Description of the run, e.g. the :code:`rule`
+        """
+        self.shape = tuple(shape)
+        self.generations = []
+        self.metadata = metadata
+
+    def append(self, generation: int, state: np.ndarray):
+        """Record a generation, if the sink keeps it
+
+        Parameters
+        ----------
+        generation : int
+            Generation number, the initial state is 0
+        state : numpy.ndarray
+            State of the board at that generation
+        """
+        if generation % self.every == 0:
+            self._write(generation, state)
+
+    def close(self):
+        """Finish the simulation run"""
+        pass
+
+    def flush(self):
+        """Make the kept generations durable, e.g. before a checkpoint"""
+        pass
+
+    def reopen(
+        self,
+        shape: Tuple[int, int],
+        iters: int,
+        generations: List[int],
+        **metadata
+    ):
+        """Continue a run that was interrupted, see
+        :meth:`seagull.Simulator.resume`
+
+        Sinks that keep generations in memory lose those written before the
+        interruption, and only keep the generations after it.
+
+        Parameters
+        ----------
+        shape : tuple of int
+            Shape of each generation
+        iters : int
+            Number of iterations of the run
+        generations : list of int
+            Generations that were kept before the interruption
+        **metadata
+            Description of the run, e.g. the :code:`rule`
+        """
+        self.open(shape, iters, **metadata)
+        if len(generations):
+            logger.warning(
+                f"{type(self).__name__} lost the {len(generations)} "
+                "generations kept before the run was interrupted"
+            )
+
+    def config(self) -> dict:
+        """Get the arguments to create an identical sink
+
+        Returns
+        -------
+        dict
+            Keyword arguments of the class
+        """
+        return {"every": self.every}
+
+    def frames(self, exclude_init: bool = False) -> np.ndarray:
+        """Get the kept generations
+
+        Parameters
+        ----------
+        exclude_init: bool
+            If True, then excludes the initial state
+
+        Returns
+        -------
+        numpy.ndarray
+            Kept generations of shape :code:`(n, height, width)`
+        """
+        X = self._read()
+        if exclude_init and self.generations and self.generations[0] == 0:
+            X = X[1:]
+        return X
+
+    def __len__(self) -> int:
+        return len(self.generations)
+
+    def __getitem__(self, i):
+        return self._read()[i]
+
+    @abc.abstractmethod
+    def _write(self, generation: int, state: np.ndarray):
+        """Store a kept generation"""
+        pass
+
+    @abc.abstractmethod
+    def _read(self) -> np.ndarray:
+        """Get all stored generations in chronological order"""
+        pass
+
+    def _capacity(self, iters: int) -> int:
+        """Number of generations kept in a run of a given length"""
+        return iters // self.every + 1
+
+
+class MemorySink(HistorySink):
+    """Keeps every :code:`k`-th generation in an array that grows as needed
+
+    The array starts with room for at most :code:`PREALLOCATE` bytes of
+    generations and doubles whenever it is full, so runs that stop early
+    don't reserve memory for all of their :code:`iters`.
+    """
+
+    #: Size in bytes of the generations allocated when a run starts
+    PREALLOCATE = 64 * 2 ** 20
+
+    def open(self, shape: Tuple[int, int], iters: int, **metadata):
+        super(MemorySink, self).open(shape, iters, **metadata)
+        self.capacity = self._capacity(iters)
+        size = max(1, self.PREALLOCATE // max(1, int(np.prod(self.shape))))
+        self.buffer = np.empty((min(size, self.capacity),) + self.shape, bool)
+
+    def close(self):
+        if len(self.generations) < len(self.buffer):
+            self.buffer = self.buffer[: len(self.generations)].copy()
+
+    def _write(self, generation: int, state: np.ndarray):
+        n = len(self.generations)
+        if n == len(self.buffer):
+            size = min(max(1, 2 * n), max(self.capacity, n + 1))
+            buffer = np.empty((size,) + self.shape, dtype=bool)
+            buffer[:n] = self.buffer
+            self.buffer = buffer
+        self.buffer[n] = state
+        self.generations.append(generation)
+
+    def _read(self) -> np.ndarray:
+        if self.shape is None:
+            return np.empty((0, 0, 0), dtype=bool)
+        return self.buffer[: len(self.generations)]
+
+
+class NullSink(HistorySink):
+    """Keeps nothing"""
+
+    def _write(self, generation: int, state: np.ndarray):
+        pass
+
+    def _read(self) -> np.ndarray:
+        shape = self.shape if self.shape is not None else (0, 0)
+        return np.empty((0,) + shape, dtype=bool)
+
+
+class RingSink(HistorySink):
+    """Keeps only the last :code:`size` kept generations"""
+
+    def __init__(self, size: int, every: int = 1):
+        """Initialize the class
+
+        Parameters
+        ----------
+        size : int
+            Number of generations to keep
+        every : int
+            Keep one generation out of :code:`every`, starting with the
+            initial state. Default is 1 (keep all)
+        """
+        if size < 1:
+            msg = f"size ({size}) must be at least 1"
+            logger.error(msg)
+            raise ValueError(msg)
+        super(RingSink, self).__init__(every=every)
+        self.size = size
+
+    def config(self) -> dict:
+        return {"size": self.size, "every": self.every}
+
+    def open(self, shape: Tuple[int, int], iters: int, **metadata):
+        super(RingSink, self).open(shape, iters, **metadata)
+        size = min(self.size, self._capacity(iters))
+        self.buffer = np.empty((size,) + self.shape, dtype=bool)
+        self.written = 0
+
+    def _write(self, generation: int, state: np.ndarray):
+        self.buffer[self.written % len(self.buffer)] = state
+        self.written += 1
+        self.generations.append(generation)
+        del self.generations[: -len(self.buffer)]
+
+    def _read(self) -> np.ndarray:
+        if self.shape is None:
+            return np.empty((0, 0, 0), dtype=bool)
+        if self.written <= len(self.buffer):
+            return self.buffer[: self.written]
+        return np.roll(self.buffer, -(self.written % len(self.buffer)), 0)
+
+
+class DiskSink(HistorySink):
+    """Writes every :code:`k`-th generation to a memory-mapped :code:`.npy`"""
+
+    def __init__(self, path: str, every: int = 1):
+        """Initialize the class
+
+        Parameters
+        ----------
+        path : str
+            Path of the :code:`.npy` file to write, it can be loaded with
+            :code:`numpy.load(path, mmap_mode="r")`
+        every : int
+            Keep one generation out of :code:`every`, starting with the
+            initial state. Default is 1 (keep all)
+        """
+        super(DiskSink, self).__init__(every=every)
+        self.path = path
+        self.memmap = None  # type: np.memmap
+
+    def config(self) -> dict:
+        return {"path": self.path, "every": self.every}
+
+    def reopen(
+        self,
+        shape: Tuple[int, int],
+        iters: int,
+        generations: List[int],
+        **metadata
+    ):
+        HistorySink.open(self, shape, iters, **metadata)
+        self.memmap = np.lib.format.open_memmap(self.path, mode="r+")
+        self.generations = list(generations)
+
+    def flush(self):
+        self.memmap.flush()
+
+    def open(self, shape: Tuple[int, int], iters: int, **metadata):
+        super(DiskSink, self).open(shape, iters, **metadata)
+        self.memmap = np.lib.format.open_memmap(
+            self.path,
+            mode="w+",
+            dtype=bool,
+            shape=(self._capacity(iters),) + self.shape,
+        )
+
+    def _write(self, generation: int, state: np.ndarray):
+        self.memmap[len(self.generations)] = state
+        self.generations.append(generation)
+
+    def close(self):
+        # Runs that stop early keep fewer generations than allocated, so
+        # the file is trimmed and its header rewritten with the new shape
+        self.memmap.flush()
+        count = len(self.generations)
+        if count < len(self.memmap):
+            offset = self.memmap.offset
+            self.memmap = None
+            _trim_npy(self.path, offset, (count,) + self.shape)
+        self.memmap = np.load(self.path, mmap_mode="r")
+
+    def _read(self) -> np.ndarray:
+        if self.memmap is None:
+            return np.empty((0, 0, 0), dtype=bool)
+        return self.memmap[: len(self.generations)]
+
+
+class PackedSink(HistorySink):
+    """Writes every :code:`k`-th generation to a bit-packed file
+
+    The file starts with a fixed preamble (magic bytes, number of written
+    generations, and header length), followed by a JSON header with the
+    shape, rule, iterations, and interval of the run. The generations are
+    stored after the header, packed along the rows with
+    :func:`seagull.utils.packing.packbits`.
+    """
+
+    def __init__(self, path: str, every: int = 1):
+        """Initialize the class
+
+        Parameters
+        ----------
+        path : str
+            Path of the file to write, it can be read with
+            :obj:`HistoryReader`
+        every : int
+            Keep one generation out of :code:`every`, starting with the
+            initial state. Default is 1 (keep all)
+        """
+        super(PackedSink, self).__init__(every=every)
+        self.path = path
+        self.data = None  # type: np.memmap
+
+    def config(self) -> dict:
+        return {"path": self.path, "every": self.every}
+
+    def reopen(
+        self,
+        shape: Tuple[int, int],
+        iters: int,
+        generations: List[int],
+        **metadata
+    ):
+        HistorySink.open(self, shape, iters, **metadata)
+        header, _, offset = _read_header(self.path)
+        self.data, self.count = _map(
+            self.path, offset, self._capacity(iters), header["shape"]
+        )
+        self.generations = list(generations)
+        self.count[0] = len(self.generations)
+
+    def flush(self):
+        self.data.flush()
+        self.count.flush()
+
+    def open(self, shape: Tuple[int, int], iters: int, **metadata):
+        super(PackedSink, self).open(shape, iters, **metadata)
+        header = dict(
+            metadata, shape=self.shape, iters=iters, every=self.every
+        )
+        self.data, self.count = _create(
+            self.path, header, self._capacity(iters)
+        )
+
+    def _write(self, generation: int, state: np.ndarray):
+        self.data[len(self.generations)] = packbits(state)
+        self.generations.append(generation)
+        self.count[0] = len(self.generations)
+
+    def close(self):
+        if self.data is None:
+            return
+        self.data.flush()
+        self.count.flush()
+        # Drop the space allocated for generations that were never written
+        size = self.data.offset + len(self.generations) * self.data[0].nbytes
+        self.data = self.count = None
+        with open(self.path, "r+b") as f:
+            f.truncate(size)
+
+    def frames(self, exclude_init: bool = False) -> "HistoryReader":
+        """Get a reader for the kept generations
+
+        Parameters
+        ----------
+        exclude_init: bool
+            If True, then excludes the initial state
+
+        Returns
+        -------
+        :obj:`HistoryReader`
+            Reader that unpacks the generations as they are accessed
+        """
+        self.close()
+        return HistoryReader(self.path, exclude_init=exclude_init)
+
+    def _read(self) -> np.ndarray:
+        if self.shape is None:
+            return np.empty((0, 0, 0), dtype=bool)
+        return self.frames()[:]
+
+
+class HistoryReader:
+    """Reads the history written by a :obj:`PackedSink`
+
+    Indexing with an integer returns a single generation, and indexing with
+    a slice or an array of indices returns an array of generations. Only the
+    accessed generations are read from disk and unpacked.
+    """
+
+    def __init__(self, path: str, exclude_init: bool = False):
+        """Initialize the class
+
+        Parameters
+        ----------
+        path : str
+            Path of the file written by a :obj:`PackedSink`
+        exclude_init: bool
+            If True, then excludes the initial state
+        """
+        self.path = path
+        self.header, count, offset = _read_header(path)
+        start = 1 if exclude_init and count else 0
+        shape = (count,) + _packed_shape(self.header["shape"])
+        if count:
+            data = np.memmap(
+                path, mode="r", dtype=np.uint8, offset=offset, shape=shape
+            )
+        else:
+            data = np.empty(shape, dtype=np.uint8)
+        self.data = data[start:]
+        self.generations = np.arange(start, count) * self.every
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """tuple of int: Shape of the unpacked history"""
+        return (len(self.data),) + tuple(self.header["shape"])
+
+    @property
+    def rule(self) -> str:
+        """str: Rule of the run"""
+        return self.header.get("rule")
+
+    @property
+    def iters(self) -> int:
+        """int: Number of iterations of the run"""
+        return self.header["iters"]
+
+    @property
+    def every(self) -> int:
+        """int: Interval between the kept generations"""
+        return self.header["every"]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, i: Union[int, slice, np.ndarray]) -> np.ndarray:
+        return unpackbits(self.data[i], self.shape[-1])
+
+    def populations(self, chunk: int = 256) -> np.ndarray:
+        """Count the live cells of every generation without unpacking
+
+        Parameters
+        ----------
+        chunk : int
+            Number of generations read from disk at once. Default is 256
+
+        Returns
+        -------
+        :obj:`numpy.ndarray`
+            Number of live cells of each generation
+        """
+        counts = np.empty(self.shape[:-2], dtype=np.int64)
+        for i in range(0, len(self), chunk):
+            block = self.data[i : i + chunk]
+            counts[i : i + chunk] = popcount(block, (-2, -1))
+        return counts
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __array__(self, dtype=None) -> np.ndarray:
+        X = self[:]
+        return X if dtype is None else X.astype(dtype)
+
+
+def _trim_npy(path: str, offset: int, shape: Tuple[int, ...]):
+    """Truncate a boolean :code:`.npy` file and rewrite its shape in place"""
+    with open(path, "r+b") as f:
+        major, _ = np.lib.format.read_magic(f)
+        start = f.tell() + (2 if major == 1 else 4)
+        header = repr(
+            {"descr": "|b1", "fortran_order": False, "shape": tuple(shape)}
+        )
+        # The header keeps its length, padded with spaces as in the format
+        f.seek(start)
+        f.write(header.ljust(offset - start - 1).encode("latin1") + b"\n")
+        f.truncate(offset + int(np.prod(shape)))
+
+
+_MAGIC = b"SGHIST01"
+_PREAMBLE = len(_MAGIC) + 12  # uint64 count and uint32 header length
+_ALIGN = 64
+
+
+def _create(path: str, header: dict, capacity: int):
+    """Write the preamble and header, and map the count and the data"""
+    shape = (capacity,) + _packed_shape(header["shape"])
+    encoded = json.dumps(header).encode()
+    offset = -(-(_PREAMBLE + len(encoded)) // _ALIGN) * _ALIGN
+    with open(path, "wb") as f:
+        f.write(_MAGIC)
+        f.write(np.array([0], dtype="<u8").tobytes())
+        f.write(np.array([len(encoded)], dtype="<u4").tobytes())
+        f.write(encoded)
+        f.truncate(offset + int(np.prod(shape)))
+    return _map(path, offset, capacity, header["shape"])
+
+
+def _map(path: str, offset: int, capacity: int, shape: Tuple[int, ...]):
+    """Map the count and the data of a history file for writing"""
+    count = np.memmap(
+        path, mode="r+", dtype="<u8", offset=len(_MAGIC), shape=(1,)
+    )
+    data = np.memmap(
+        path,
+        mode="r+",
+        dtype=np.uint8,
+        offset=offset,
+        shape=(capacity,) + _packed_shape(shape),
+    )
+    return data, count
+
+
+def _packed_shape(shape: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Shape of a packed generation"""
+    return tuple(shape[:-1]) + (packed_width(shape[-1]),)
+
+
+def _read_header(path: str) -> Tuple[dict, int, int]:
+    """Read the header, number of generations, and data offset of a file"""
+    with open(path, "rb") as f:
+        preamble = f.read(_PREAMBLE)
+        if preamble[: len(_MAGIC)] != _MAGIC:
+            msg = f"{path} is not a history file written by a PackedSink"
+            logger.error(msg)
+            raise ValueError(msg)
+        count = int(np.frombuffer(preamble, "<u8", 1, len(_MAGIC))[0])
+        length = int(np.frombuffer(preamble, "<u4", 1, len(_MAGIC) + 8)[0])
+        header = json.loads(f.read(length).decode())
+    offset = -(-(_PREAMBLE + length) // _ALIGN) * _ALIGN
+    return header, count, offset
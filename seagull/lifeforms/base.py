@@ -26,23 +26,36 @@ tests.
 
 If you wish to pass a custom lifeform to the board, I recommend using the
 :obj:`seagull.lifeforms.custom.Custom` class.
+
+The :code:`layout` of every lifeform is computed once per instance, on first
+access, and is then returned as a read-only boolean array. This happens
+automatically for subclasses, so :code:`layout` can be implemented as a
+simple property that builds a new array.
 """
 
 
 # Import standard library
 import abc
-from typing import Dict, Tuple, Union
+import functools
+from typing import TYPE_CHECKING, Dict, Tuple, Union
 
 # Import modules
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.image import AxesImage
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from matplotlib.image import AxesImage
 
 
 class Lifeform(abc.ABC):
     """Base class for all Lifeform implementation"""
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        layout = cls.__dict__.get("layout")
+        if isinstance(layout, property) and layout.fget is not None:
+            cls.layout = property(_cached(layout.fget), doc=layout.__doc__)
+
     @abc.abstractproperty
     def layout(self) -> np.ndarray:
         """:obj:`numpy.ndarray`: Lifeform layout or structure"""
@@ -53,7 +66,7 @@ class Lifeform(abc.ABC):
         """:obj:`tuple`: Size of the lifeform"""
         return self.layout.shape
 
-    def view(self, figsize=(5, 5)) -> Tuple[Figure, AxesImage]:
+    def view(self, figsize=(5, 5)) -> Tuple["Figure", "AxesImage"]:
         """View the lifeform
 
 
@@ -62,6 +75,8 @@ class Lifeform(abc.ABC):
         matplotlib.axes._subplots.AxesSubplot
             Graphical view of the lifeform
         """
+        import matplotlib.pyplot as plt
+
         fig = plt.figure(figsize=figsize)
         ax = fig.add_axes([0, 0, 1, 1], xticks=[], yticks=[], frameon=False)
         im = ax.imshow(
@@ -69,3 +84,21 @@ class Lifeform(abc.ABC):
         )
         im.set_clim(-0.05, 1)
         return fig, im
+
+
+def _cached(fget):
+    """Wrap a layout getter to build a read-only boolean array only once"""
+    if getattr(fget, "_cached", False):
+        return fget
+
+    @functools.wraps(fget)
+    def layout(self) -> np.ndarray:
+        X = self.__dict__.get("_layout")
+        if X is None:
+            X = np.array(fget(self), dtype=bool)
+            X.setflags(write=False)
+            self.__dict__["_layout"] = X
+        return X
+
+    layout._cached = True
+    return layout
@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+
+"""The pattern cache keeps the files that
+:func:`seagull.lifeforms.wiki.parse_cells`,
+:func:`seagull.lifeforms.wiki.parse_rle` and
+:func:`seagull.lifeforms.wiki.parse_macrocell` load from URLs, so each
+pattern is downloaded only once. The parsed layouts are cached as well, so
+loading the same URL again skips both the download and the parsing:
+
+.. code-block:: python
+
+    from seagull.lifeforms.cache import PatternCache, set_cache
+    from seagull.lifeforms.wiki import parse_rle
+
+    set_cache(PatternCache("~/patterns", max_size=2 ** 30, offline=True))
+    gun = parse_rle("https://conwaylife.com/patterns/gosperglidergun.rle")
+
+The cache directory is content-addressed: files are stored under the
+SHA-256 digest of their content, and each URL points to the digest of the
+content it returned. The parsed layouts are stored bit-packed with their
+meta-data, next to the file they were parsed from. Whenever the files, the
+layouts and the URLs grow past :code:`max_size` bytes, the least recently
+used files are removed along with their layouts and the URLs that point to
+them, and entries larger than :code:`max_size` are not cached at all.
+Entries are never revalidated, so call :meth:`PatternCache.clear` to
+download patterns again.
+
+In :code:`offline` mode, nothing is downloaded and URLs that are not cached
+raise a :code:`ValueError`. A :code:`mirror` directory (or a
+:code:`file://` URL of one) is searched for a file with the same name as
+the URL before downloading, e.g. :code:`glider.cells` for
+:code:`https://conwaylife.com/patterns/glider.cells`.
+
+The default cache is configured from the :code:`SEAGULL_CACHE_DIR`
+(default :code:`~/.cache/seagull`), :code:`SEAGULL_OFFLINE` and
+:code:`SEAGULL_MIRROR` environment variables, and can be replaced with
+:func:`set_cache`. To turn the cache off, set the :code:`SEAGULL_NO_CACHE`
+environment variable, or use a :obj:`NullCache`, which still reads mirrors
+but downloads every URL each time it is loaded:
+
+.. code-block:: python
+
+    from seagull.lifeforms.cache import NullCache, set_cache
+
+    set_cache(NullCache())
+"""
+
+# Import standard library
+import hashlib
+import io
+import json
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Import modules
+import numpy as np
+from loguru import logger
+
+from ..utils.packing import packbits, unpackbits
+
+#: Default maximum size of the cache in bytes
+MAX_SIZE = 256 * 2 ** 20
+
+
+class PatternCache:
+    """Content-addressed cache of pattern files and their parsed layouts"""
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int = MAX_SIZE,
+        offline: bool = False,
+        mirror: Optional[str] = None,
+    ):
+        """Initialize the class
+
+        Parameters
+        ----------
+        path : str
+            Cache directory, created if needed
+        max_size : int
+            Size of the cache in bytes before the least recently used
+            entries are removed. Larger entries are not cached. Default is
+            256 MiB
+        offline : bool
+            If True, only cached or mirrored patterns are loaded. Default is
+            False
+        mirror : str, optional
+            Directory, or :code:`file://` URL, of local copies of pattern
+            files to use instead of downloading them
+        """
+        self.path = os.path.expanduser(path)
+        self.max_size = max_size
+        self.offline = offline
+        if mirror is not None and urlparse(mirror).scheme == "file":
+            mirror = urlparse(mirror).path
+        self.mirror = mirror
+
+    def fetch(self, url: str, download: Callable[[str], str]) -> str:
+        """Get the content of a URL, downloading it only if needed
+
+        Parameters
+        ----------
+        url : str
+            URL of the pattern file
+        download : callable
+            Function that downloads the content of a URL
+
+        Returns
+        -------
+        str
+            Content of the pattern file
+        """
+        digest = self._digest_of(url)
+        if digest is not None:
+            content = self._read(os.path.join("files", digest))
+            if content is not None:
+                logger.trace(f"loaded [{url}] from the pattern cache")
+                return content.decode("utf-8")
+
+        content = self._from_mirror(url)
+        if content is None:
+            if self.offline:
+                msg = f"Pattern [{url}] is not cached and offline is set"
+                logger.error(msg)
+                raise ValueError(msg)
+            content = download(url)
+
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        if len(data) + len(digest) > self.max_size:
+            logger.debug(f"Pattern [{url}] is too large to be cached")
+            return content
+        self._write(os.path.join("files", digest), data)
+        self._write(os.path.join("urls", _key(url)), digest.encode())
+        self.evict()
+        return content
+
+    def get_layout(
+        self, url: str, parser: str
+    ) -> Optional[Tuple[np.ndarray, Dict]]:
+        """Get the layout parsed from the content of a URL, if cached
+
+        Parameters
+        ----------
+        url : str
+            URL of the pattern file
+        parser : str
+            Name of the parser of the layout
+
+        Returns
+        -------
+        tuple or None
+            Layout and meta-data, or None if not cached
+        """
+        digest = self._digest_of(url)
+        if digest is None:
+            return None
+        path = self._touch(os.path.join("layouts", f"{digest}.{parser}.npz"))
+        if path is None:
+            return None
+
+        with np.load(path) as f:
+            height, width = f["shape"]
+            layout = unpackbits(f["layout"], width).reshape(height, width)
+            meta = json.loads(str(f["meta"]))
+        return layout, meta
+
+    def put_layout(
+        self, url: str, parser: str, layout: np.ndarray, meta: Dict
+    ):
+        """Cache the layout parsed from the content of a URL
+
+        Parameters
+        ----------
+        url : str
+            URL of the pattern file, which must have been fetched
+        parser : str
+            Name of the parser of the layout
+        layout : numpy.ndarray
+            Parsed layout
+        meta : dict
+            JSON-serializable meta-data of the lifeform
+        """
+        digest = self._digest_of(url)
+        if digest is None:
+            return
+        f = io.BytesIO()
+        np.savez(
+            f,
+            layout=packbits(layout),
+            shape=np.array(np.shape(layout)),
+            meta=np.array(json.dumps(meta)),
+        )
+        # The layout is evicted with its file, so they must fit together
+        size = sum(entry[1] for entry in self._entries().get(digest, []))
+        if size + f.getbuffer().nbytes > self.max_size:
+            logger.debug(f"Layout of [{url}] is too large to be cached")
+            return
+        name = os.path.join("layouts", f"{digest}.{parser}.npz")
+        self._write(name, f.getvalue())
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries above the size limit
+
+        A file is removed along with its layouts and the URLs that point to
+        it, and they are used as recently as the last of them.
+        """
+        groups = [
+            (max(e[0] for e in group), sum(e[1] for e in group), group)
+            for group in self._entries().values()
+        ]
+        size = sum(group[1] for group in groups)
+        for _, group_size, group in sorted(groups, key=lambda g: g[:2]):
+            if size <= self.max_size:
+                break
+            for _, _, path in group:
+                logger.debug(f"Evicting [{path}] from the pattern cache")
+                os.remove(path)
+            size -= group_size
+
+    def clear(self):
+        """Remove every entry of the cache"""
+        for folder in ("files", "layouts", "urls"):
+            try:
+                with os.scandir(os.path.join(self.path, folder)) as it:
+                    for entry in it:
+                        os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+
+    def _entries(self) -> Dict[str, List[Tuple[float, int, str]]]:
+        """Get the time of use, size and path of the entries of each digest"""
+        entries = {}  # type: Dict[str, List[Tuple[float, int, str]]]
+        for folder in ("files", "layouts", "urls"):
+            try:
+                with os.scandir(os.path.join(self.path, folder)) as it:
+                    for entry in it:
+                        if entry.name.endswith(".tmp"):
+                            continue
+                        if folder == "urls":
+                            with open(entry.path, "rb") as f:
+                                digest = f.read().decode()
+                        else:
+                            digest = entry.name.split(".")[0]
+                        stat = entry.stat()
+                        entries.setdefault(digest, []).append(
+                            (stat.st_mtime, stat.st_size, entry.path)
+                        )
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def _digest_of(self, url: str) -> Optional[str]:
+        """Get the digest of the content last returned by a URL"""
+        digest = self._read(os.path.join("urls", _key(url)))
+        return None if digest is None else digest.decode()
+
+    def _from_mirror(self, url: str) -> Optional[str]:
+        if self.mirror is None:
+            return None
+        path = os.path.join(self.mirror, os.path.basename(urlparse(url).path))
+        if not os.path.isfile(path):
+            return None
+        logger.trace(f"loaded [{url}] from the mirror [{path}]")
+        with open(path, "r") as f:
+            return f.read()
+
+    def _touch(self, name: str) -> Optional[str]:
+        """Mark an entry as recently used and get its path, if it exists"""
+        path = os.path.join(self.path, name)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def _read(self, name: str) -> Optional[bytes]:
+        """Read an entry and mark it as recently used"""
+        path = self._touch(name)
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def _write(self, name: str, data: bytes):
+        """Atomically write an entry"""
+        path = os.path.join(self.path, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(data)
+        os.replace(f"{path}.tmp", path)
+
+
+class NullCache(PatternCache):
+    """Caches nothing, so every URL is downloaded each time it is loaded"""
+
+    def __init__(self, offline: bool = False, mirror: Optional[str] = None):
+        """Initialize the class
+
+        Parameters
+        ----------
+        offline : bool
+            If True, only mirrored patterns are loaded. Default is False
+        mirror : str, optional
+            Directory, or :code:`file://` URL, of local copies of pattern
+            files to use instead of downloading them
+        """
+        super(NullCache, self).__init__(
+            "", max_size=0, offline=offline, mirror=mirror
+        )
+
+    def evict(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def _entries(self) -> Dict[str, List[Tuple[float, int, str]]]:
+        return {}
+
+    def _touch(self, name: str) -> Optional[str]:
+        return None
+
+
+_cache = None  # type: Optional[PatternCache]
+
+
+def get_cache() -> PatternCache:
+    """Get the pattern cache used for URLs
+
+    Returns
+    -------
+    :obj:`PatternCache`
+        The cache set by :func:`set_cache`, or the default cache configured
+        from the environment
+    """
+    global _cache
+    if _cache is None and _is_set("SEAGULL_NO_CACHE"):
+        _cache = NullCache(
+            offline=_is_set("SEAGULL_OFFLINE"),
+            mirror=os.environ.get("SEAGULL_MIRROR"),
+        )
+    elif _cache is None:
+        cache_home = os.environ.get(
+            "XDG_CACHE_HOME", os.path.join("~", ".cache")
+        )
+        _cache = PatternCache(
+            os.environ.get(
+                "SEAGULL_CACHE_DIR", os.path.join(cache_home, "seagull")
+            ),
+            offline=_is_set("SEAGULL_OFFLINE"),
+            mirror=os.environ.get("SEAGULL_MIRROR"),
+        )
+    return _cache
+
+
+def set_cache(cache: Optional[PatternCache]):
+    """Set the pattern cache used for URLs
+
+    Parameters
+    ----------
+    cache : :obj:`PatternCache` or None
+        The cache to use, e.g. a :obj:`NullCache` to turn caching off, or
+        None to go back to the default cache
+    """
+    global _cache
+    _cache = cache
+
+
+def _key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _is_set(name: str) -> bool:
+    """Check if a boolean environment variable is set"""
+    return os.environ.get(name, "") not in ("", "0")
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+
+"""Canonical forms identify a pattern regardless of its position, rotation
+or reflection. A layout is cropped to the bounding box of its live cells,
+and each of its 8 rotations and reflections is bit-packed and hashed. The
+smallest hash is the canonical hash of the layout, so two layouts have the
+same canonical hash whenever one is a moved, rotated or mirrored copy of
+the other:
+
+.. code-block:: python
+
+    import numpy as np
+    from seagull.lifeforms import Glider
+    from seagull.lifeforms.canonical import canonical_hash, identify
+
+    glider = Glider().layout
+    assert canonical_hash(glider) == canonical_hash(np.rot90(glider))
+    assert identify(np.fliplr(glider)) is Glider
+
+The hashes of many objects are computed together with
+:func:`canonical_hashes`, which groups them by size and hashes each group
+at once. :func:`catalogue` indexes the canonical hashes of every phase of
+the pre-made lifeforms, and :func:`identify` looks layouts up in it.
+
+Hashes are 64-bit digests of the packed layout and its shape, in the
+manner of FNV-1a over 8-byte words, so they are meant for deduplication
+and lookup, not for cryptographic use.
+"""
+
+# Import standard library
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+# Import modules
+import numpy as np
+
+from ..rules import compile as compile_rule
+from ..utils.packing import packbits, packed_width
+from . import (
+    Beacon,
+    Blinker,
+    Box,
+    Century,
+    ChaCha,
+    Eater1,
+    FigureEight,
+    Glider,
+    Kite,
+    LightweightSpaceship,
+    MiddleweightSpaceship,
+    Moon,
+    Pentadecathlon,
+    Pulsar,
+    Seed,
+    SwitchEngine,
+    Thunderbird,
+    Toad,
+    Unbounded,
+)
+from .base import Lifeform
+
+#: Pre-made lifeforms indexed by :func:`catalogue`, in order of precedence
+KNOWN = (
+    Box,
+    Seed,
+    Moon,
+    Kite,
+    Eater1,
+    Blinker,
+    Toad,
+    Beacon,
+    Pulsar,
+    FigureEight,
+    Pentadecathlon,
+    ChaCha,
+    Glider,
+    LightweightSpaceship,
+    MiddleweightSpaceship,
+    SwitchEngine,
+    Century,
+    Thunderbird,
+    Unbounded,
+)
+
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+# Folds the high bits of the words into the low bits of the hash
+_SHIFT = np.uint64(29)
+
+
+def canonical_hash(layout: np.ndarray) -> int:
+    """Compute the canonical hash of a layout
+
+    Parameters
+    ----------
+    layout : numpy.ndarray
+        Layout of a pattern, with any empty margin
+
+    Returns
+    -------
+    int
+        64-bit hash, the same for every translation, rotation and
+        reflection of the pattern
+    """
+    return int(canonical_hashes([layout])[0])
+
+
+def canonical_hashes(
+    layouts: Iterable[np.ndarray], cropped: bool = False
+) -> np.ndarray:
+    """Compute the canonical hashes of many layouts at once
+
+    Parameters
+    ----------
+    layouts : iterable of numpy.ndarray
+        Layouts of the patterns, of any sizes
+    cropped : bool
+        If True, the layouts are already cropped to their live cells, which
+        skips the slowest step for small patterns. Default is False
+
+    Returns
+    -------
+    numpy.ndarray
+        uint64 array of the canonical hashes, in the order of the layouts
+    """
+    if cropped:
+        crops = [np.asarray(layout, dtype=bool) for layout in layouts]
+    else:
+        crops = [_crop(layout) for layout in layouts]
+    groups = {}  # type: Dict[Tuple[int, int], List[int]]
+    for i, crop in enumerate(crops):
+        groups.setdefault(crop.shape, []).append(i)
+
+    hashes = np.empty(len(crops), dtype=np.uint64)
+    for indices in groups.values():
+        hashes[indices] = _stack_hashes(np.stack([crops[i] for i in indices]))
+    return hashes
+
+
+def canonical_form(layout: np.ndarray) -> np.ndarray:
+    """Get the canonical orientation of a layout
+
+    Parameters
+    ----------
+    layout : numpy.ndarray
+        Layout of a pattern, with any empty margin
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean layout cropped to the live cells, in the rotation or
+        reflection with the smallest hash
+    """
+    transforms = list(_transforms(_crop(layout)[np.newaxis]))
+    hashes = [_hash(X)[0] for X in transforms]
+    return transforms[int(np.argmin(hashes))][0]
+
+
+@lru_cache(maxsize=None)
+def catalogue(max_period: int = 64) -> Dict[int, Tuple[Type[Lifeform], int]]:
+    """Index the canonical hashes of the pre-made lifeforms
+
+    Each lifeform of :data:`KNOWN` is evolved with Conway's rule until it
+    comes back to its initial shape, so every phase of the oscillators and
+    spaceships is indexed. Lifeforms that don't within :code:`max_period`
+    generations, like methuselahs, are only indexed in their initial phase.
+
+    Parameters
+    ----------
+    max_period : int
+        Number of generations to look for a period. Default is 64
+
+    Returns
+    -------
+    dict
+        Lifeform class and phase of every canonical hash. The result is
+        computed once and shared, so it must not be modified
+    """
+    rule = compile_rule("B3/S23")
+    index = {}  # type: Dict[int, Tuple[Type[Lifeform], int]]
+    for lifeform in KNOWN:
+        layout = np.asarray(lifeform().layout, dtype=bool)
+        # Spaceships move at most one cell every two generations
+        margin = max_period // 2 + 2
+        X = np.pad(layout, margin)
+        phases = [X]
+        for _ in range(max_period):
+            X = rule(X, boundary="fill")
+            if not X.any():
+                break
+            phases.append(X)
+
+        hashes = canonical_hashes(phases)
+        period = np.flatnonzero(hashes[1:] == hashes[0])
+        count = int(period[0]) + 1 if len(period) else 1
+        for phase, key in enumerate(hashes[:count].tolist()):
+            index.setdefault(key, (lifeform, phase))
+    return index
+
+
+def identify(layout: np.ndarray) -> Optional[Type[Lifeform]]:
+    """Identify a pre-made lifeform in any phase and orientation
+
+    Parameters
+    ----------
+    layout : numpy.ndarray
+        Layout of a pattern, with any empty margin
+
+    Returns
+    -------
+    type or None
+        The :obj:`seagull.lifeforms.base.Lifeform` subclass of the pattern,
+        or None if it is not in the :func:`catalogue`
+    """
+    match = catalogue().get(canonical_hash(layout))
+    return None if match is None else match[0]
+
+
+def _crop(layout: np.ndarray) -> np.ndarray:
+    """Crop a layout to the bounding box of its live cells"""
+    X = np.asarray(layout, dtype=bool)
+    rows = np.flatnonzero(X.any(axis=1))
+    if len(rows) == 0:
+        return X[:0, :0]
+    cols = np.flatnonzero(X.any(axis=0))
+    return X[rows[0] : rows[-1] + 1, cols[0] : cols[-1] + 1]
+
+
+def _stack_hashes(stack: np.ndarray) -> np.ndarray:
+    """Canonical hashes of a stack of cropped layouts of the same shape"""
+    # Small objects repeat a lot, so only distinct layouts, told apart by
+    # the hash of their own orientation, are transformed
+    _, first, inverse = np.unique(
+        _hash(stack), return_index=True, return_inverse=True
+    )
+    unique = stack[first]
+    # Half of the transforms keep the shape and half transpose it, so each
+    # half is hashed at once
+    transforms = list(_transforms(unique))
+    hashes = np.concatenate(
+        [_hash(np.concatenate(transforms[k::2])) for k in range(2)]
+    )
+    hashes = hashes.reshape(8, len(unique)).min(axis=0)
+    return hashes[inverse.reshape(-1)]
+
+
+def _transforms(stack: np.ndarray) -> Iterator[np.ndarray]:
+    """Yield the 8 rotations and reflections of a stack of layouts"""
+    for X in (stack, stack[:, :, ::-1]):
+        for k in range(4):
+            yield np.rot90(X, k, axes=(1, 2))
+
+
+def _hash(stack: np.ndarray) -> np.ndarray:
+    """Hash the shape and packed cells of each layout of a stack"""
+    n, height, width = stack.shape
+    size = height * packed_width(width)
+    # The packed layouts are hashed 8 bytes at a time
+    packed = np.zeros((n, -(-size // 8) * 8), dtype=np.uint8)
+    packed[:, :size] = packbits(stack).reshape(n, size)
+    h = np.full(n, _FNV_OFFSET, dtype=np.uint64)
+    for value in (height, width):
+        h = (h ^ np.uint64(value)) * _FNV_PRIME
+    for word in packed.view("<u8").T:
+        h = (h ^ word) * _FNV_PRIME
+        h ^= h >> _SHIFT
+    return h
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+
+"""A library gathers a whole collection of pattern files into a single
+compact file. :func:`build_library` parses every :code:`.rle` and
+:code:`.cells` file of a directory in a pool of processes, and writes their
+bit-packed layouts, shapes, rulestrings and meta-data together. Opening a
+:obj:`Library` only reads its index and memory-maps the layouts, and each
+pattern is unpacked the first time its layout is accessed:
+
+.. code-block:: python
+
+    from seagull.lifeforms.library import Library, build_library
+
+    library = build_library("patterns/", "patterns.sglib")
+
+    # Later, e.g. in another process
+    library = Library("patterns.sglib")
+    gun = library["Gosper glider gun"]
+    small = library.find(author="Bill Gosper", max_size=(40, 40))
+
+Files that cannot be parsed are skipped with a warning. The name of a
+pattern is the :code:`name` of its meta-data, or the name of its file.
+"""
+
+# Import standard library
+import json
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# Import modules
+import numpy as np
+from loguru import logger
+
+from ..utils.packing import packbits, packed_width, unpackbits
+from .base import Lifeform
+from .wiki import parse_cells, parse_rle
+
+_MAGIC = b"SGLIB001"
+# Magic, then the offset and length of the index at the end of the file
+_PREFIX = struct.Struct("<8sQQ")
+# Layouts start at the first aligned offset after the prefix
+_DATA_OFFSET = 64
+
+# Columns of the index, with one value per pattern
+_COLUMNS = ("name", "author", "rule", "file", "shape", "offset", "meta")
+
+#: Extensions of the pattern files read by build_library
+EXTENSIONS = (".rle", ".cells")
+
+
+class LibraryLifeform(Lifeform):
+    """A pattern of a :obj:`Library`, unpacked only when accessed"""
+
+    def __init__(self, library: "Library", index: int):
+        """Initialize the class
+
+        Parameters
+        ----------
+        library : :obj:`Library`
+            The library holding the pattern
+        index : int
+            Position of the pattern in the library
+        """
+        self.library = library
+        self.index = index
+        self.meta = library._meta[index]
+
+    @property
+    def name(self) -> str:
+        """str: Name of the pattern"""
+        return self.library.names[self.index]
+
+    @property
+    def rule(self) -> str:
+        """str: Rulestring of the pattern"""
+        return self.library.rules[self.index]
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """:obj:`tuple`: Size of the lifeform"""
+        height, width = self.library.shapes[self.index]
+        return int(height), int(width)
+
+    @property
+    def layout(self) -> np.ndarray:
+        return self.library._layout(self.index)
+
+    def __repr__(self) -> str:
+        return "LibraryLifeform(name={!r}, size={})".format(
+            self.name, self.size
+        )
+
+
+class Library:
+    """Read-only collection of patterns stored in a single file"""
+
+    def __init__(self, path: str):
+        """Initialize the class
+
+        Parameters
+        ----------
+        path : str
+            Path of a library written by :func:`build_library`
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            magic, offset, length = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != _MAGIC:
+                msg = f"{path} is not a pattern library"
+                logger.error(msg)
+                raise ValueError(msg)
+            f.seek(offset)
+            index = json.loads(f.read(length).decode("utf-8"))
+
+        self.names = index["name"]  # type: List[str]
+        self.authors = index["author"]  # type: List[str]
+        self.rules = index["rule"]  # type: List[str]
+        self.files = index["file"]  # type: List[str]
+        self.shapes = np.array(index["shape"], dtype=np.int64).reshape(-1, 2)
+        self.offsets = np.array(index["offset"], dtype=np.int64)
+        self._meta = index["meta"]  # type: List[Dict]
+        self._data = (
+            np.memmap(
+                path,
+                dtype=np.uint8,
+                mode="r",
+                offset=_DATA_OFFSET,
+                shape=(offset - _DATA_OFFSET,),
+            )
+            if offset > _DATA_OFFSET
+            else np.empty(0, dtype=np.uint8)
+        )
+
+        self._by_name = {}  # type: Dict[str, List[int]]
+        self._by_author = {}  # type: Dict[str, List[int]]
+        for i, (name, author) in enumerate(zip(self.names, self.authors)):
+            self._by_name.setdefault(name.lower(), []).append(i)
+            self._by_author.setdefault(author.lower(), []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[LibraryLifeform]:
+        return (LibraryLifeform(self, i) for i in range(len(self)))
+
+    def __getitem__(self, key: Union[int, str]) -> LibraryLifeform:
+        """Get a pattern by position, or the first pattern with a name"""
+        if isinstance(key, str):
+            found = self._by_name.get(key.lower())
+            if not found:
+                raise KeyError(key)
+            key = found[0]
+        if not -len(self) <= key < len(self):
+            raise IndexError(key)
+        return LibraryLifeform(self, key % len(self))
+
+    def find(
+        self,
+        name: Optional[str] = None,
+        author: Optional[str] = None,
+        min_size: Optional[Tuple[int, int]] = None,
+        max_size: Optional[Tuple[int, int]] = None,
+    ) -> List[LibraryLifeform]:
+        """Find the patterns matching all the given criteria
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the patterns, ignoring case
+        author : str, optional
+            Author of the patterns, ignoring case
+        min_size : tuple of int, optional
+            Smallest bounding box :code:`(height, width)`
+        max_size : tuple of int, optional
+            Largest bounding box :code:`(height, width)`
+
+        Returns
+        -------
+        list of :obj:`LibraryLifeform`
+            Matching patterns, in the order of the library
+        """
+        match = np.ones(len(self), dtype=bool)
+        for value, lookup in (
+            (name, self._by_name),
+            (author, self._by_author),
+        ):
+            if value is not None:
+                found = np.zeros(len(self), dtype=bool)
+                found[lookup.get(value.lower(), [])] = True
+                match &= found
+        if min_size is not None:
+            match &= (self.shapes >= min_size).all(axis=1)
+        if max_size is not None:
+            match &= (self.shapes <= max_size).all(axis=1)
+        return [LibraryLifeform(self, i) for i in np.flatnonzero(match)]
+
+    def _layout(self, index: int) -> np.ndarray:
+        """Unpack the layout of a pattern"""
+        height, width = self.shapes[index]
+        start = self.offsets[index]
+        row = packed_width(width)
+        packed = self._data[start : start + height * row]
+        return unpackbits(packed.reshape(height, row), width)
+
+
+def build_library(
+    directory: str,
+    path: str,
+    processes: Optional[int] = None,
+    chunksize: int = 64,
+) -> Library:
+    """Parse every pattern file of a directory into a library
+
+    Parameters
+    ----------
+    directory : str
+        Directory searched recursively for :code:`.rle` and :code:`.cells`
+        files
+    path : str
+        Path of the library file to write
+    processes : int, optional
+        Number of worker processes. Default is the number of CPUs. If 1,
+        the files are parsed in the current process
+    chunksize : int
+        Number of files parsed at a time by a worker. Default is 64
+
+    Returns
+    -------
+    :obj:`Library`
+        The written library
+    """
+    files = sorted(
+        os.path.join(os.path.abspath(root), name)
+        for root, _, names in os.walk(directory)
+        for name in names
+        if name.lower().endswith(EXTENSIONS)
+    )
+    chunks = [
+        files[i : i + chunksize] for i in range(0, len(files), chunksize)
+    ]
+    logger.info(f"Importing {len(files)} pattern files")
+    root = os.path.abspath(directory)
+
+    index = {key: [] for key in _COLUMNS}  # type: Dict[str, list]
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(_MAGIC, 0, 0).ljust(_DATA_OFFSET, b"\0"))
+        offset = 0
+
+        def _write(results: List[tuple]):
+            nonlocal offset
+            for file, shape, data, meta, error in results:
+                if error is not None:
+                    logger.warning(f"Skipped [{file}]: {error}")
+                    continue
+                stem = os.path.splitext(os.path.basename(file))[0]
+                index["name"].append(meta.get("name") or stem)
+                index["author"].append(meta.get("author", ""))
+                index["rule"].append(meta.get("rule", "B3/S23"))
+                index["file"].append(os.path.relpath(file, root))
+                index["shape"].append(shape)
+                index["offset"].append(offset)
+                index["meta"].append(meta)
+                f.write(data)
+                offset += len(data)
+
+        if processes == 1:
+            for chunk in chunks:
+                _write(_parse_files(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                for results in executor.map(_parse_files, chunks):
+                    _write(results)
+
+        header = json.dumps(index).encode("utf-8")
+        f.write(header)
+        f.seek(0)
+        f.write(_PREFIX.pack(_MAGIC, _DATA_OFFSET + offset, len(header)))
+    os.replace(tmp, path)
+    return Library(path)
+
+
+def _parse_files(files: List[str]) -> List[tuple]:
+    """Parse pattern files into their packed layouts and meta-data"""
+    results = []
+    for file in files:
+        parser = parse_rle if file.lower().endswith(".rle") else parse_cells
+        try:
+            lifeform = parser(file)
+            layout = np.asarray(lifeform.layout, dtype=bool)
+            data = packbits(layout).tobytes()
+            results.append((file, layout.shape, data, lifeform.meta, None))
+        except (ValueError, NotImplementedError, OSError) as e:
+            results.append((file, None, None, None, str(e) or repr(e)))
+    return results
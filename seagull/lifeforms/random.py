@@ -1,9 +1,20 @@
 # -*- coding: utf-8 -*-
 
-"""Random lifeforms are generated on-the-fly without specific configuration"""
+"""Random lifeforms are generated on-the-fly without specific configuration.
+Like other lifeforms, their layout is drawn once per instance. Call
+:meth:`RandomBox.regenerate` to draw a new one:
+
+.. code-block:: python
+
+    from seagull.lifeforms import RandomBox
+
+    box = RandomBox(shape=(10, 10))
+    box.layout  # always the same array for this box
+    box.regenerate()  # draws a new layout
+"""
 
 # Import standard library
-from typing import Tuple
+from typing import Optional, Tuple
 
 # Import modules
 import numpy as np
@@ -22,7 +33,8 @@ class RandomBox(Lifeform):
         shape : tuple
             Coverage of the random box
         seed : int, optional
-            Random seed
+            Random seed. Default is None, which draws a different layout
+            for every instance
         """
         super(RandomBox, self).__init__()
         self.shape = shape
@@ -30,5 +42,23 @@ class RandomBox(Lifeform):
 
     @property
     def layout(self) -> np.ndarray:
-        np.random.seed(self.seed)
-        return np.random.choice([0, 1], size=self.shape)
+        random = np.random.RandomState(self.seed)
+        return random.choice([0, 1], size=self.shape)
+
+    def regenerate(self, seed: Optional[int] = None) -> np.ndarray:
+        """Draw a new layout
+
+        Parameters
+        ----------
+        seed : int, optional
+            Random seed of the new layout. Default is None, which draws a
+            different layout every time
+
+        Returns
+        -------
+        numpy.ndarray
+            The new layout
+        """
+        self.seed = seed
+        self.__dict__.pop("_layout", None)
+        return self.layout
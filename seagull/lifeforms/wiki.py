@@ -42,10 +42,53 @@ array([[0, 0, 1],
        [1, 0, 0]])
 
 
-.rle files
-----------
+The `.rle` format
+-----------------
 
-Currently not suppored, working on it!
+The `.rle` files are LifeForms stored in `Run Length Encoded
+<https://conwaylife.com/wiki/Run_Length_Encoded>`_ format, and are parsed
+with the :func:`seagull.lifeforms.wiki.parse_rle` function in the same way.
+
+The RLE body is decoded straight into a boolean array by
+:func:`seagull.lifeforms.wiki.rle2layout`, without building an intermediate
+plaintext, so even multi-megabyte patterns parse in milliseconds. The
+reverse, :func:`seagull.lifeforms.wiki.layout2rle`, encodes any layout
+(e.g. a board state) with its :code:`x = , y = , rule =` header::
+
+    layout = rle2layout('bo$2bo$3o!')
+    rle = layout2rle(layout, rule='B3/S23', meta={'name': 'Glider'})
+
+Patterns too large to hold as text are streamed from a file object with
+:func:`seagull.lifeforms.wiki.read_rle`. It decodes the file a chunk at a
+time and writes the rows straight into a destination: a
+:obj:`seagull.Board`, a :obj:`seagull.SparseBoard`, or any 2-dimensional
+array such as a :code:`numpy.memmap`::
+
+    board = Board(size=(4096, 4096))
+    with open('breeder.rle', 'rb') as f:
+        board, meta = read_rle(f, board, offset=(100, 100))
+
+
+The `.mc` format
+----------------
+
+Large engineered patterns are distributed as `Macrocell
+<https://conwaylife.com/wiki/Macrocell>`_ files, which store the pattern as
+a quadtree where identical subtrees are written once. The
+:func:`seagull.lifeforms.wiki.parse_macrocell` function reads them into a
+:obj:`seagull.lifeforms.wiki.Macrocell` lifeform that keeps the quadtree
+instead of a dense layout. Any window of it can be rendered, and it can be
+loaded as it is by the :obj:`seagull.engines.hashlife.HashLifeEngine`::
+
+    pattern = parse_macrocell('~/caterpillar.mc')
+    window = pattern.render((0, 0, 512, 512))
+
+    engine = HashLifeEngine(pattern.meta['rule'])
+    engine.load(pattern)
+    engine.advance(10 ** 6)
+
+Any lifeform, layout or :obj:`seagull.lifeforms.wiki.Macrocell` is written
+back with :func:`seagull.lifeforms.wiki.write_macrocell`.
 
 
 Created 20200525 by ep (eugen.pt@gmail.com)
@@ -54,17 +97,32 @@ Created 20200525 by ep (eugen.pt@gmail.com)
 # Import standard library
 from os.path import isfile
 import re
-from typing import Dict, List, Union
+from typing import IO, Callable, Dict, Iterable, List, Optional, Tuple, Union
 from urllib.parse import urlparse
-from urllib.request import urlopen
 
 # Import modules
 import numpy as np
 from loguru import logger
 
+from ..board import Board, SparseBoard
+from ..engines.hashlife import Node, QuadTree
 from .base import Lifeform
+from .cache import get_cache
 from .custom import Custom
 
+# Characters of an RLE body: dead cells, live cells, and ends of lines
+_DEAD, _ALIVE, _EOL = b"b", b"o", b"$"
+_TAGS = np.frombuffer(_DEAD + _ALIVE + _EOL, dtype=np.uint8)
+_WHITESPACE = np.frombuffer(b" \t\r\n", dtype=np.uint8)
+
+# Run lengths with more digits would overflow
+_MAX_DIGITS = 18
+_POWERS = 10 ** np.arange(_MAX_DIGITS + 1, dtype=np.int64)
+
+# Default number of bytes read at a time by read_rle, which also bounds the
+# number of cells expanded at a time when filling runs
+CHUNK_SIZE = 1 << 20
+
 
 def parse_plaintext_layout(plaintext_str: Union[str, list]) -> np.ndarray:
     """Parse plaintext_str in Plaintext format into ndarray layout
@@ -159,32 +217,62 @@ def _get_metadata(lines: List[str]) -> Dict:
 def _load_file_of_url(path: str) -> str:
     """Detects if path is local or URL, loads file content
 
+    URLs are loaded through the pattern cache, see
+    :mod:`seagull.lifeforms.cache`
+
     Args:
         path (str): [description]
 
     Returns:
         str: [description]
     """
+    if urlparse(path).scheme == "file":
+        path = urlparse(path).path
+
     if isfile(path):
         logger.trace(f"reading from file [{path}]..", end="")
         with open(path, "r") as f:
             content = f.read()
         logger.trace("ok")
-    elif urlparse(path).scheme in {"ftp", "http", "https"}:
-        logger.trace(f"trying to download [{path}]..", end="")
-        req = urlopen(path)
-        if req.getcode() != 200:
-            raise ValueError(
-                f"Invalid input URL request returned {req.getcode()}"
-            )
-        logger.trace("ok")
-        content = req.read().decode("utf-8")
+    elif _is_url(path):
+        content = get_cache().fetch(path, _download)
     else:
         raise ValueError(f"Unrecognized input path {path}")
 
     return content
 
 
+def _is_url(path: str) -> bool:
+    return urlparse(path).scheme in {"ftp", "http", "https"}
+
+
+def _download(url: str) -> str:
+    """Download the content of a URL"""
+    logger.trace(f"trying to download [{url}]..", end="")
+    from urllib.request import urlopen
+
+    req = urlopen(url)
+    if req.getcode() != 200:
+        raise ValueError(f"Invalid input URL request returned {req.getcode()}")
+    logger.trace("ok")
+    return req.read().decode("utf-8")
+
+
+def _parse_url(url: str, parser: Callable[[str], Lifeform]) -> Lifeform:
+    """Parse a pattern from a URL, reusing the cached layout if any"""
+    cache = get_cache()
+    cached = cache.get_layout(url, parser.__name__)
+    if cached is None:
+        lifeform = parser(_load_file_of_url(url))
+        cache.put_layout(url, parser.__name__, lifeform.layout, lifeform.meta)
+        return lifeform
+
+    layout, meta = cached
+    lifeform = Custom(layout)
+    lifeform.meta = meta
+    return lifeform
+
+
 def parse_cells(cells_str: str) -> Lifeform:
     """Parse cell_str, stored in Plaintext format, into Lifeform
     
@@ -221,8 +309,10 @@ OOO
         if invalid input provided
 
     """
+    if _is_url(cells_str):
+        return _parse_url(cells_str, parse_cells)
     if not cells_str.startswith((".", "0", "!")):
-        # not a proper .cells line, filename/URL?
+        # not a proper .cells line, filename?
         cells_str = _load_file_of_url(cells_str)
 
     # split lines, \r if (down)loaded and not copy-pasted
@@ -293,13 +383,404 @@ def rle2cells(rle_str: str) -> str:
     if len(commands) == 0:
         raise ValueError("Incorrect input: wrong pattern format")
 
-    layout_string = ""
     parse_dict = {"b": ".", "o": "O", "$": "\n"}
-    for com in commands:
-        n = int(com[0]) if com[0] else 1
-        layout_string += parse_dict[com[1]] * n
+    return "".join(
+        parse_dict[tag] * (int(n) if n else 1) for n, tag in commands
+    )
+
+
+def rle2layout(
+    rle_str: str, shape: Optional[Tuple[int, int]] = None
+) -> np.ndarray:
+    """Decode an RLE body into a layout
+
+    Parameters
+    ----------
+    rle_str : str
+        RLE commands ending with "!", without header and comments. Line
+        breaks are ignored
+    shape : tuple of int, optional
+        Shape of the layout, e.g. :code:`(y, x)` from the header. Default is
+        the bounding box of the pattern
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean layout of the pattern
+
+    Raises
+    ------
+    ValueError
+        if invalid input provided, or if the pattern does not fit the shape
+    """
+    if "!" not in rle_str:
+        raise ValueError('Incorrect input: no "!"')
+
+    counts, tags = _rle_runs(rle_str.encode())
+    rows, cols, lengths, _, _ = _live_runs(counts, tags)
+    if shape is None:
+        shape = (
+            int(rows.max()) + 1 if rows.size else 0,
+            int((cols + lengths).max()) if rows.size else 0,
+        )
 
-    return layout_string
+    layout = np.zeros(shape, dtype=bool)
+    _fill_runs(layout, rows, cols, lengths)
+    return layout
+
+
+def layout2rle(
+    layout: np.ndarray,
+    rule: str = "B3/S23",
+    meta: Optional[Dict] = None,
+    line_width: int = 70,
+) -> str:
+    """Encode a layout in RLE format, with its header
+
+    Parameters
+    ----------
+    layout : array_like
+        Binary array of the pattern, e.g. a lifeform layout or board state
+    rule : str
+        Rulestring of the header. Default is :code:`"B3/S23"`
+    meta : dict, optional
+        The :code:`"name"`, :code:`"author"` and :code:`"comments"` written
+        as :code:`#N`, :code:`#O` and :code:`#C` lines, as parsed by
+        :func:`parse_rle`
+    line_width : int
+        Maximum length of the lines of the RLE body. Default is 70
+
+    Returns
+    -------
+    str
+        RLE encoded pattern, ending with "!"
+    """
+    layout = np.asarray(layout, dtype=bool)
+    height, width = layout.shape
+    lines = _comment_lines(meta or {})
+    lines.append(f"x = {width}, y = {height}, rule = {rule}")
+
+    # Rows with live cells, padded with dead cells so runs start and end
+    occupied = np.flatnonzero(layout.any(axis=1))
+    padded = np.zeros((len(occupied), width + 2), dtype=bool)
+    padded[:, 1:-1] = layout[occupied]
+    row, edge = np.divmod(
+        np.flatnonzero(padded[:, 1:] != padded[:, :-1]), width + 1
+    )
+    row, starts, ends = row[::2], edge[::2], edge[1::2]
+
+    # Each live run is preceded by a dead run from the previous live run,
+    # and the last live run of a row is followed by the lines to the next
+    # occupied row, if any
+    first = np.diff(row, prepend=-1) != 0
+    last = np.roll(first, -1)
+    previous = np.where(first, 0, np.roll(ends, 1))
+    counts = np.zeros((len(row), 3), dtype=np.int64)
+    counts[:, 0] = starts - previous
+    counts[:, 1] = ends - starts
+    counts[last, 2] = np.diff(occupied, append=occupied[-1:])
+    leading = occupied[:1].sum()
+    counts = np.concatenate([[leading], counts.ravel(), [1]])
+    tags = np.concatenate([_TAGS[2:], np.tile(_TAGS, len(row)), [ord("!")]])
+
+    lines.append(_write_runs(counts, tags, line_width))
+    return "\n".join(lines) + "\n"
+
+
+def _comment_lines(meta: Dict) -> List[str]:
+    """Write meta-data as the comment lines parsed by :func:`_get_metadata`"""
+    lines = []
+    if meta.get("name"):
+        lines.append(f"#N {meta['name']}")
+    if meta.get("author"):
+        lines.append(f"#O {meta['author']}")
+    for comment in meta.get("comments", "").splitlines():
+        lines.append(f"#C {comment}")
+    return lines
+
+
+def _write_runs(counts: np.ndarray, tags: np.ndarray, line_width: int) -> str:
+    """Write runs as RLE tokens, wrapping lines between tokens
+
+    Counts of 1 are omitted, and runs with a count of 0 are skipped
+    """
+    keep = counts > 0
+    counts, tags = counts[keep], tags[keep]
+    digits = (counts > 1).astype(np.int64)
+    for power in _POWERS[1 : len(str(counts.max()))]:
+        digits += counts >= power
+    ends = np.cumsum(digits + 1)
+    starts = ends - digits - 1
+
+    text = np.empty(ends[-1], dtype=np.uint8)
+    text[ends - 1] = tags
+    for place in range(digits.max()):
+        has = digits > place
+        digit = counts[has] // _POWERS[place] % 10
+        text[ends[has] - 2 - place] = digit + ord("0")
+
+    # Greedily fill each line with the tokens that fit
+    following = np.searchsorted(ends, starts + line_width, "right")
+    following = np.maximum(following, np.arange(1, len(ends) + 1))
+    breaks = []
+    token = int(following[0])
+    while token < len(ends):
+        breaks.append(token)
+        token = int(following[token])
+
+    text = np.insert(text, starts[breaks], ord("\n"))
+    return text.tobytes().decode()
+
+
+def read_rle(
+    f: IO,
+    out: Optional[Union[Board, np.ndarray]] = None,
+    offset: Tuple[int, int] = (0, 0),
+    chunk_size: int = CHUNK_SIZE,
+) -> Tuple[Union[Board, np.ndarray], Dict]:
+    """Stream an RLE file into a board or array
+
+    The header is read line by line, then the body is decoded a chunk at a
+    time, and the rows of each chunk are written before the next is read.
+    Like :meth:`seagull.Board.add`, the pattern overwrites the cells of the
+    destination inside its bounding box.
+
+    Parameters
+    ----------
+    f : file object
+        RLE file opened in binary or text mode
+    out : :obj:`seagull.Board`, :obj:`seagull.SparseBoard`, or array_like
+        Destination of the pattern, e.g. a :code:`numpy.memmap`. Default is
+        a new boolean array of the size of the header
+    offset : tuple of int
+        Location of the top-left corner of the pattern in the destination
+    chunk_size : int
+        Number of bytes read at a time
+
+    Returns
+    -------
+    tuple
+        The destination, and the meta-data parsed from the comments, as in
+        :func:`parse_rle`
+
+    Raises
+    ------
+    ValueError
+        if invalid input provided, or if the pattern does not fit the
+        destination
+    """
+    comments = []
+    line = _as_bytes(f.readline())
+    while line.startswith(b"#") or not line.strip():
+        if not line:
+            raise ValueError("Incorrect input: no header line")
+        comments.append(line.decode().rstrip("\r\n"))
+        line = _as_bytes(f.readline())
+    width, height, rulestring = _parse_rle_header(line.decode().strip())
+    meta = _get_metadata(comments)
+    meta["rule"] = rulestring
+
+    if out is None:
+        out = np.zeros((height, width), dtype=bool)
+    row0, col0 = offset
+    if isinstance(out, SparseBoard):
+        rows, cols = out.cells.T
+        outside = (
+            (rows < row0)
+            | (rows >= row0 + height)
+            | (cols < col0)
+            | (cols >= col0 + width)
+        )
+        added = [out.cells[outside]]
+    else:
+        state = out.state if isinstance(out, Board) else out
+        if (
+            min(offset) < 0
+            or row0 + height > state.shape[0]
+            or col0 + width > state.shape[1]
+        ):
+            raise ValueError(
+                f"Incorrect input: pattern of size {(height, width)} at "
+                f"{offset} does not fit in {state.shape}"
+            )
+        view = state[row0 : row0 + height, col0 : col0 + width]
+        view[...] = False
+
+    row, col, rest, done = 0, 0, b"", False
+    while not done:
+        chunk = _as_bytes(f.read(chunk_size))
+        if not chunk:
+            raise ValueError('Incorrect input: no "!"')
+        data = rest + chunk
+        end = data.find(b"!")
+        if end >= 0:
+            data, rest, done = data[:end], b"", True
+        else:
+            # Run lengths may continue in the next chunk
+            body = data.rstrip(b"0123456789 \t\r\n")
+            data, rest = body, data[len(body) :]
+
+        counts, tags = _rle_runs(data)
+        rows, cols, lengths, row, col = _live_runs(counts, tags, row, col)
+        if rows.size and (
+            rows.max() >= height or (cols + lengths).max() > width
+        ):
+            raise ValueError(
+                "Incorrect input: pattern does not fit in its header size"
+            )
+        if isinstance(out, SparseBoard):
+            starts = np.cumsum(lengths) - lengths
+            cells = np.empty((lengths.sum(), 2), dtype=np.int64)
+            cells[:, 0] = np.repeat(rows, lengths) + row0
+            cells[:, 1] = np.repeat(cols - starts, lengths) + col0
+            cells[:, 1] += np.arange(len(cells))
+            added.append(cells)
+        else:
+            _fill_runs(view, rows, cols, lengths, batch=chunk_size)
+
+    if isinstance(out, SparseBoard):
+        out.cells = np.unique(np.concatenate(added), axis=0)
+    return out, meta
+
+
+def _as_bytes(data: Union[str, bytes]) -> bytes:
+    return data.encode() if isinstance(data, str) else data
+
+
+def _parse_rle_header(header_line: str) -> Tuple[int, int, str]:
+    """Parse the width, height and rule of an RLE header line"""
+    header_match = re.match(
+        r"x = ([0-9]+), y = ([0-9]+)(, rule = ([^ ]+))?", header_line
+    )
+    if header_match is None:
+        raise ValueError(
+            f"Incorrect input: wrong header line format : [{header_line}]"
+        )
+    header_match = header_match.groups()
+
+    width = int(header_match[0])
+    height = int(header_match[1])
+
+    if header_match[3] is None:
+        # use default rulestring
+        rulestring = "B3/S23"
+    else:
+        rulestring = header_match[3]
+    return width, height, rulestring
+
+
+def _rle_runs(rle_bytes: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Split RLE commands into run lengths and tags
+
+    Parameters
+    ----------
+    rle_bytes : bytes
+        RLE commands, where whitespace is ignored and anything after the
+        first "!" is dropped
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        Run lengths, and the tags :code:`b`, :code:`o` or :code:`$` as bytes
+    """
+    data = np.frombuffer(rle_bytes, dtype=np.uint8)
+    end = np.flatnonzero(data == ord("!"))
+    if end.size:
+        data = data[: end[0]]
+    data = data[~np.isin(data, _WHITESPACE)]
+
+    digit = (data >= ord("0")) & (data <= ord("9"))
+    at = np.flatnonzero(~digit)
+    tags = data[at]
+    if not np.isin(tags, _TAGS).all():
+        raise ValueError("Incorrect input: wrong character set")
+    if digit[at[-1] + 1 if at.size else 0 :].any():
+        raise ValueError("Incorrect input: run length without a tag")
+
+    # Add up the digits before each tag, one decimal place at a time
+    n_digits = np.diff(at, prepend=-1) - 1
+    if n_digits.size and n_digits.max() > _MAX_DIGITS:
+        raise ValueError("Incorrect input: run length is too long")
+    counts = (n_digits == 0).astype(np.int64)
+    for place in range(n_digits.max() if n_digits.size else 0):
+        has = np.flatnonzero(n_digits > place)
+        digit = data[at[has] - 1 - place].astype(np.int64) - ord("0")
+        counts[has] += digit * _POWERS[place]
+    return counts, tags
+
+
+def _live_runs(
+    counts: np.ndarray, tags: np.ndarray, row: int = 0, col: int = 0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int, int]:
+    """Locate the runs of live cells
+
+    Parameters
+    ----------
+    counts : numpy.ndarray
+        Run lengths from :func:`_rle_runs`
+    tags : numpy.ndarray
+        Tags from :func:`_rle_runs`
+    row : int
+        Row where the commands start, e.g. after a previous chunk
+    col : int
+        Column where the commands start
+
+    Returns
+    -------
+    tuple
+        Rows, columns and lengths of the live runs, and the row and column
+        after the last command
+    """
+    eol = tags == _EOL[0]
+    newlines = np.where(eol, counts, 0)
+    widths = np.where(eol, 0, counts)
+    rows = row + np.cumsum(newlines) - newlines
+    cols = np.cumsum(widths) - widths
+
+    # Columns restart at the beginning of every line
+    last_eol = np.maximum.accumulate(np.where(eol, np.arange(len(eol)), -1))
+    cols = np.where(last_eol >= 0, cols - cols[last_eol], cols + col)
+
+    end_row = row + int(newlines.sum())
+    if eol.any():
+        end_col = int(widths[last_eol[-1] :].sum())
+    else:
+        end_col = col + int(widths.sum())
+
+    alive = tags == _ALIVE[0]
+    return rows[alive], cols[alive], counts[alive], end_row, end_col
+
+
+def _fill_runs(
+    layout: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    lengths: np.ndarray,
+    batch: int = CHUNK_SIZE,
+):
+    """Set the runs of live cells of a 2-dimensional layout
+
+    The layout may be any writable view, e.g. a window of a memory-mapped
+    board. At most :code:`batch` cells are expanded at a time, and longer
+    runs are written as slices.
+    """
+    height, width = layout.shape
+    if rows.size and (rows.max() >= height or (cols + lengths).max() > width):
+        raise ValueError(
+            f"Incorrect input: pattern does not fit in {layout.shape}"
+        )
+
+    long = lengths > batch
+    for row, col, length in zip(rows[long], cols[long], lengths[long]):
+        layout[row, col : col + length] = True
+    rows, cols, lengths = rows[~long], cols[~long], lengths[~long]
+
+    ends = np.cumsum(lengths)
+    splits = np.searchsorted(ends, np.arange(batch, ends[-1:].sum(), batch))
+    for r, c, n in zip(*(np.split(x, splits) for x in (rows, cols, lengths))):
+        offsets = np.cumsum(n) - n
+        cells = np.arange(n.sum()) + np.repeat(c - offsets, n)
+        layout[np.repeat(r, n), cells] = True
 
 
 def parse_rle(rle_str: str) -> Lifeform:
@@ -342,10 +823,20 @@ o3bob2o4bobo11b$10bo5bo7bo11b$11bo3bo20b$12b2o!
     Notes
     -----
         - RLE content after `!` is ignored    
-        - header line is currently parsed but not used
+        - the rule of the header line is stored as :code:`meta["rule"]`
     """
+    if _is_url(rle_str):
+        return _parse_url(rle_str, parse_rle)
+    if isfile(rle_str):
+        # stream local files without reading them whole
+        with open(rle_str, "rb") as f:
+            layout, meta = read_rle(f)
+        lifeform = Custom(layout)
+        lifeform.meta = meta
+        return lifeform
+
     if not rle_str.startswith(("#", "x")):
-        # not a proper .cells line, filename/URL?
+        # not a proper .rle line, file URL?
         rle_str = _load_file_of_url(rle_str)
 
     # split lines, \r if (down)loaded and not copy-pasted
@@ -355,39 +846,276 @@ o3bob2o4bobo11b$10bo5bo7bo11b$11bo3bo20b$12b2o!
     layout_lines = [l for l in lines if not l.startswith("#")]
 
     # Parse size and rule, if present
-    header_line = layout_lines[0]
-    header_match = re.match(
-        r"x = ([0-9]+), y = ([0-9]+)(, rule = ([^ ]+))?", header_line
-    )
-    if header_match is None:
-        raise ValueError(
-            f"Incorrect input: wrong header line format : [{header_line}]"
-        )
-    header_match = header_match.groups()
-
-    width = int(header_match[0])
-    height = int(header_match[1])
+    width, height, rulestring = _parse_rle_header(layout_lines[0])
 
-    if header_match[3] is None:
-        # use default rulestring
-        rulestring = "B3/S23"
-    else:
-        rulestring = header_match[3]
-
-    # Parse layout, converting it to plaintext
+    # Parse layout directly into the size of the header
     layout_string = "".join(layout_lines[1:])
-    layout_string = rle2cells(layout_string)
-    layout = parse_plaintext_layout(layout_string)
-
-    if layout.shape != (height, width):
-        raise ValueError(
-            "Parsed layout width/height inconsistent with header"
-            f": header: {width} {height} , layout: {layout.shape}"
-        )
+    layout = rle2layout(layout_string, shape=(height, width))
 
     lifeform = Custom(layout)  # to be returned
 
     # Setting custom fields parsed from comments
     lifeform.meta = _get_metadata(metadata_lines)
+    lifeform.meta["rule"] = rulestring
+
+    return lifeform
+
+
+class Macrocell(Lifeform):
+    """A lifeform stored as a quadtree of shared subtrees
+
+    The pattern is anchored so that the bounding box of its live cells
+    starts at :code:`(0, 0)`. Accessing the :code:`layout` renders the whole
+    bounding box, so use :meth:`render` for patterns that are too large.
+    """
+
+    def __init__(self, tree: QuadTree, root: Node):
+        """Initialize the class
+
+        Parameters
+        ----------
+        tree : :obj:`seagull.engines.hashlife.QuadTree`
+            Quadtree holding the nodes of the pattern
+        root : :obj:`seagull.engines.hashlife.Node`
+            Root node of the pattern
+        """
+        self.tree = tree
+        self.root = root
+        self.meta = {}  # type: Dict
+        bounds = tree.bounds(root)
+        if bounds is None:
+            self.origin, self._size = (0, 0), (0, 0)
+        else:
+            top, left, bottom, right = bounds
+            self.origin = (-top, -left)
+            self._size = (bottom - top, right - left)
+
+    @classmethod
+    def from_layout(
+        cls, layout: np.ndarray, tree: Optional[QuadTree] = None
+    ) -> "Macrocell":
+        """Build a pattern from a dense layout
+
+        Parameters
+        ----------
+        layout : array_like
+            Binary array of the pattern
+        tree : :obj:`seagull.engines.hashlife.QuadTree`, optional
+            Quadtree to store the nodes in. Default is a new one
+
+        Returns
+        -------
+        :obj:`seagull.lifeforms.wiki.Macrocell`
+            The pattern as a quadtree
+        """
+        tree = tree if tree is not None else QuadTree()
+        return cls(tree, tree.from_array(np.asarray(layout, dtype=bool)))
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """:obj:`tuple`: Size of the bounding box of the live cells"""
+        return self._size
+
+    @property
+    def population(self) -> int:
+        """int: Number of live cells"""
+        return self.root.population
+
+    @property
+    def layout(self) -> np.ndarray:
+        return self.render()
+
+    def render(
+        self, window: Optional[Tuple[int, int, int, int]] = None
+    ) -> np.ndarray:
+        """Render a window of the pattern
+
+        Parameters
+        ----------
+        window : tuple of int, optional
+            Window to render as :code:`(row, col, height, width)`. Default is
+            the whole bounding box
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array of the window
+        """
+        if window is None:
+            window = (0, 0) + self.size
+        return self.tree.to_array(self.root, self.origin, window)
+
+
+def parse_macrocell(
+    mc_str: str, tree: Optional[QuadTree] = None
+) -> Macrocell:
+    """Parse mc_str, stored in Macrocell format, into a Macrocell lifeform
+
+    Macrocell format description: https://conwaylife.com/wiki/Macrocell
+
+    Only two-state patterns are supported. The rule of the :code:`#R` line
+    and the generation of the :code:`#G` line are stored in :code:`meta`.
+
+    Parameters
+    ----------
+    mc_str : str
+        Macrocell encoded lifeform description
+        May be a filename or a URL to be (down)loaded from
+    tree : :obj:`seagull.engines.hashlife.QuadTree`, optional
+        Quadtree to store the nodes in, e.g. the :code:`tree` of a
+        :obj:`seagull.engines.hashlife.HashLifeEngine`. Default is a new one
+
+    Raises
+    ------
+    ValueError
+        if invalid input provided
+    """
+    if mc_str.startswith("[M2]"):
+        return _read_macrocell(mc_str.splitlines(), tree)
+    if isfile(mc_str):
+        # read local files line by line
+        with open(mc_str, "r") as f:
+            return _read_macrocell(f, tree)
+    return _read_macrocell(_load_file_of_url(mc_str).splitlines(), tree)
+
+
+def write_macrocell(
+    f: IO,
+    lifeform: Union[Lifeform, np.ndarray],
+    rule: Optional[str] = None,
+    meta: Optional[Dict] = None,
+):
+    """Write a lifeform in Macrocell format
+
+    A :obj:`Macrocell` is written from its quadtree without being made
+    dense, and every distinct subtree is written once.
+
+    Parameters
+    ----------
+    f : file object
+        File opened in text mode
+    lifeform : :obj:`seagull.lifeforms.base.Lifeform` or array_like
+        The pattern to write
+    rule : str, optional
+        Rulestring of the :code:`#R` line. Default is the rule in the
+        :code:`meta` of a :obj:`Macrocell`, or :code:`"B3/S23"`
+    meta : dict, optional
+        The :code:`"name"`, :code:`"author"` and :code:`"comments"` written
+        as :code:`#N`, :code:`#O` and :code:`#C` lines. Default is the
+        :code:`meta` of the lifeform
+    """
+    if not isinstance(lifeform, Macrocell):
+        layout = getattr(lifeform, "layout", lifeform)
+        lifeform = Macrocell.from_layout(layout)
+    meta = meta if meta is not None else getattr(lifeform, "meta", {})
+    rule = rule or meta.get("rule", "B3/S23")
+
+    f.write("[M2] (seagull)\n")
+    f.write(f"#R {rule}\n")
+    for line in _comment_lines(meta):
+        f.write(line + "\n")
+
+    tree = lifeform.tree
+    numbers = {}  # type: Dict[int, int]
+
+    def _write(node: Node) -> int:
+        if node.population == 0:
+            return 0
+        number = numbers.get(id(node))
+        if number is None:
+            if node.level == 3:
+                rows = [
+                    "".join(".*"[int(cell)] for cell in row).rstrip(".") + "$"
+                    for row in tree._block(node)
+                ]
+                line = "".join(rows).rstrip("$") + "$"
+            else:
+                children = [
+                    _write(child)
+                    for child in (node.nw, node.ne, node.sw, node.se)
+                ]
+                line = "{} {} {} {} {}".format(node.level, *children)
+            f.write(line + "\n")
+            number = numbers[id(node)] = len(numbers) + 1
+        return number
+
+    if lifeform.root.population == 0:
+        # A pattern needs at least one node
+        f.write("$\n")
+    else:
+        _write(lifeform.root)
+
+
+def _read_macrocell(
+    lines: Iterable[str], tree: Optional[QuadTree] = None
+) -> Macrocell:
+    """Build a Macrocell lifeform from the lines of a Macrocell file"""
+    tree = tree if tree is not None else QuadTree()
+    lines = iter(lines)
+    if not next(lines, "").startswith("[M2]"):
+        raise ValueError("Incorrect input: no [M2] header line")
+
+    comments = []
+    rule, generation = "B3/S23", None
+    nodes = [None]  # type: List[Optional[Node]]
+    leaves = {}  # type: Dict[str, Node]
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#R "):
+            rule = line[3:].strip()
+        elif line.startswith("#G "):
+            generation = int(line[3:])
+        elif line.startswith("#"):
+            comments.append(line)
+        elif line[0] in ".*$":
+            node = leaves.get(line)
+            if node is None:
+                node = leaves[line] = tree._leaf(_leaf_bits(line))
+            nodes.append(node)
+        else:
+            nodes.append(_join_line(tree, line, nodes))
 
+    if len(nodes) == 1:
+        raise ValueError("Incorrect input: no nodes")
+
+    lifeform = Macrocell(tree, nodes[-1])
+    lifeform.meta = _get_metadata(comments)
+    lifeform.meta["rule"] = rule
+    if generation is not None:
+        lifeform.meta["generation"] = generation
     return lifeform
+
+
+def _leaf_bits(line: str) -> int:
+    """Get the row-major bitmask of an 8x8 leaf line"""
+    bits, row, col = 0, 0, 0
+    for char in line:
+        if char == "$":
+            row, col = row + 1, 0
+            continue
+        if char not in ".*" or row >= 8 or col >= 8:
+            raise ValueError(f"Incorrect input: wrong leaf line [{line}]")
+        if char == "*":
+            bits |= 1 << (row * 8 + col)
+        col += 1
+    return bits
+
+
+def _join_line(tree: QuadTree, line: str, nodes: List[Optional[Node]]) -> Node:
+    """Get the node of a line listing a level and four earlier nodes"""
+    try:
+        level, *numbers = (int(x) for x in line.split())
+        if min(numbers, default=-1) < 0:
+            raise ValueError
+        children = [
+            nodes[n] if n > 0 else tree.empty(level - 1) for n in numbers
+        ]
+    except (ValueError, IndexError):
+        raise ValueError(f"Incorrect input: wrong node line [{line}]")
+    if len(children) != 4 or any(c.level != level - 1 for c in children):
+        raise ValueError(
+            f"Incorrect input: node line [{line}] is not a two-state node"
+        )
+    return tree.join(*children)
@@ -2,26 +2,122 @@
 
 """Rules determine how the evolution of the lifeforms will progress. In
 Seagull, rules are implemented as a function that takes in a 2-dimensional
-array of a given shape then returns the updated array with the rule applied"""
+array of a given shape then returns the updated array with the rule applied
+
+If you're running the same rulestring over and over again, it is better to
+compile it first. A compiled :obj:`seagull.rules.Rule` parses the rulestring
+only once and can be passed to the :obj:`seagull.Simulator` like any other
+rule:
+
+.. code-block:: python
+
+    import seagull as sg
+
+    highlife = sg.rules.compile("B36/S23")
+    sim = sg.Simulator(board)
+    stats = sim.run(highlife, iters=1000)
+
+By default the board is treated as a torus, i.e. the cells past one edge are
+the ones on the opposite edge. All rules in this module accept a
+:code:`boundary` argument to change that: :code:`"wrap"` (toroidal),
+:code:`"fill"` (cells past the edges are dead), or :code:`"symm"` (the edges
+are reflected). The :obj:`seagull.Simulator` passes the boundary of the
+:obj:`seagull.Board` automatically.
+"""
 
 # Import standard library
 import re
-from typing import Tuple, List
+from functools import lru_cache
+from typing import Callable, List, Tuple, Union
 
 # Import modules
 import numpy as np
-from scipy.signal import convolve2d
 from loguru import logger
 
 # Import from package
 
+__all__ = ["Rule", "compile", "conway_classic", "life_rule"]
+
+BOUNDARIES = ("wrap", "fill", "symm")
+
+
+class Rule:
+    """A compiled outer-totalistic rule in B/S notation
+
+    The rulestring is parsed once into a lookup table of shape :code:`(2, 9)`
+    where the first axis is the current state of the cell and the second axis
+    is its number of live neighbors. Applying the rule is then a single
+    fancy-index into that table.
+    """
+
+    def __init__(self, rulestring: str):
+        """Initialize the class
+
+        Parameters
+        ----------
+        rulestring : str
+            The rulestring in B/S notation
+        """
+        self.rulestring = rulestring
+        self.birth, self.survival = _parse_rulestring(rulestring)
+        self.table = np.zeros((2, 9), dtype=bool)
+        self.table[0, self.birth] = True
+        self.table[1, self.survival] = True
+
+    def __call__(self, X: np.ndarray, boundary: str = "wrap") -> np.ndarray:
+        """Apply the rule to a board
+
+        Parameters
+        ----------
+        X : np.ndarray
+            The input board matrix
+        boundary : str
+            How cells past the edges are treated, one of :code:`"wrap"`,
+            :code:`"fill"` or :code:`"symm"`. Default is :code:`"wrap"`
+
+        Returns
+        -------
+        np.ndarray
+            Updated board after applying the rule
+        """
+        X = np.asarray(X, dtype=bool)
+        # Index the flattened (2, 9) table with 9 * alive + neighbors
+        index = _count_neighbors(X, boundary=boundary)
+        index += X.view(np.uint8) * np.uint8(9)
+        return np.take(self.table.ravel(), index)
+
+    def __repr__(self) -> str:
+        return "Rule('{}')".format(self.rulestring)
 
-def conway_classic(X) -> np.ndarray:
+
+@lru_cache(maxsize=None)
+def compile(rulestring: str) -> Rule:
+    """Compile a rulestring in B/S notation into a reusable rule
+
+    Compiled rules are cached, so compiling the same rulestring twice returns
+    the same :obj:`seagull.rules.Rule` instance.
+
+    Parameters
+    ----------
+    rulestring : str
+        The rulestring in B/S notation
+
+    Returns
+    -------
+    :obj:`seagull.rules.Rule`
+        Callable that takes in an array and returns the updated array
+    """
+    return Rule(rulestring)
+
+
+def conway_classic(X, boundary: str = "wrap") -> np.ndarray:
     """The classic Conway's Rule for Game of Life (B3/S23)"""
-    return life_rule(X, rulestring="B3/S23")
+    return compile("B3/S23")(X, boundary=boundary)
 
 
-def life_rule(X: np.ndarray, rulestring: str) -> np.ndarray:
+def life_rule(
+    X: np.ndarray, rulestring: str, boundary: str = "wrap"
+) -> np.ndarray:
     """A generalized life rule that accepts a rulestring in B/S notation
 
     Rulestrings are commonly expressed in the B/S notation where B (birth) is a
@@ -35,26 +131,49 @@ def life_rule(X: np.ndarray, rulestring: str) -> np.ndarray:
         The input board matrix
     rulestring : str
         The rulestring in B/S notation
+    boundary : str
+        How cells past the edges are treated, one of :code:`"wrap"`
+        (toroidal), :code:`"fill"` (dead) or :code:`"symm"` (reflective).
+        Default is :code:`"wrap"`
 
     Returns
     -------
     np.ndarray
         Updated board after applying the rule
     """
-    birth_req, survival_req = _parse_rulestring(rulestring)
-    neighbors = _count_neighbors(X)
-    birth_rule = (X == 0) & (np.isin(neighbors, birth_req))
-    survival_rule = (X == 1) & (np.isin(neighbors, survival_req))
-    return birth_rule | survival_rule
+    return compile(rulestring)(X, boundary=boundary)
+
+
+def _as_rule(rule: Union[Rule, Callable, str], **kwargs) -> Rule:
+    """Get the compiled rule behind a rule callable or a rulestring
+
+    Engines that don't evaluate the rule callable directly use this to recover
+    the B/S rulestring. It understands compiled rules, plain rulestrings,
+    :func:`conway_classic`, and :func:`life_rule` with a :code:`rulestring`
+    keyword argument.
+    """
+    if isinstance(rule, Rule):
+        return rule
+    if isinstance(rule, str):
+        return compile(rule)
+    if rule is conway_classic:
+        return compile("B3/S23")
+    if rule is life_rule and "rulestring" in kwargs:
+        return compile(kwargs["rulestring"])
+
+    msg = f"Cannot get a B/S rulestring from {rule}, use rules.compile()"
+    logger.error(msg)
+    raise ValueError(msg)
 
 
 def _parse_rulestring(r: str) -> Tuple[List[int], List[int]]:
     """Parse a rulestring"""
-    pattern = re.compile("B([0-8]+)?/S([0-8]+)?")
-    if pattern.match(r):
-        birth, survival = r.split("/")
-        birth_neighbors = [int(s) for s in birth if s.isdigit()]
-        survival_neighbors = [int(s) for s in survival if s.isdigit()]
+    pattern = re.compile("B([0-8]*)/S([0-8]*)")
+    match = pattern.fullmatch(r)
+    if match:
+        birth, survival = match.groups()
+        birth_neighbors = [int(s) for s in birth]
+        survival_neighbors = [int(s) for s in survival]
     else:
         msg = f"Rulestring ({r}) must satisfy the pattern {pattern}"
         logger.error(msg)
@@ -63,7 +182,92 @@ def _parse_rulestring(r: str) -> Tuple[List[int], List[int]]:
     return birth_neighbors, survival_neighbors
 
 
-def _count_neighbors(X: np.ndarray) -> np.ndarray:
-    """Get the number of neighbors in a binary 2-dimensional matrix"""
-    n = convolve2d(X, np.ones((3, 3)), mode="same", boundary="wrap") - X
+def _count_neighbors(
+    X: np.ndarray, boundary: str = "wrap", out: np.ndarray = None
+) -> np.ndarray:
+    """Get the number of neighbors in a binary 2-dimensional matrix
+
+    The 3x3 Moore sum is computed in :code:`uint8` by adding shifted views of
+    the board: first the rows above and below, then the columns to the left
+    and right of that partial sum. Cells past the edges are added as separate
+    one-cell strips (the opposite edge for :code:`"wrap"`, the edge itself for
+    :code:`"symm"`, nothing for :code:`"fill"`), so the board is never copied
+    into a padded array. Leading axes are treated as a batch of boards.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        The input board matrix of shape :code:`(..., height, width)`
+    boundary : str
+        How cells past the edges are treated, one of :code:`"wrap"`,
+        :code:`"fill"` or :code:`"symm"`. Default is :code:`"wrap"`
+    out : np.ndarray, optional
+        Preallocated :code:`uint8` array of the same shape to store the
+        result in
+
+    Returns
+    -------
+    np.ndarray
+        Number of live neighbors of each cell as :code:`uint8`
+    """
+    if boundary not in BOUNDARIES:
+        msg = f"Boundary ({boundary}) must be one of {BOUNDARIES}"
+        logger.error(msg)
+        raise ValueError(msg)
+
+    X = np.asarray(X, dtype=bool)
+    height, width = X.shape[-2:]
+    cells = X.view(np.uint8)
+
+    rows = cells.copy()
+    for dr in (-1, 1):
+        for dst, src in _shifted_slices(height, dr, boundary):
+            rows[..., dst, :] += cells[..., src, :]
+
+    if out is None:
+        out = rows.copy()
+    else:
+        out[...] = rows
+    for dc in (-1, 1):
+        for dst, src in _shifted_slices(width, dc, boundary):
+            out[..., dst] += rows[..., src]
+
+    out -= cells
+    return out
+
+
+def _shifted_slices(
+    n: int, d: int, boundary: str
+) -> List[Tuple[slice, slice]]:
+    """Get the (destination, source) slices that shift an axis by one cell
+
+    Each cell at index :code:`i` of the destination receives the cell at
+    index :code:`i + d` of the source, where :code:`d` is either 1 or -1. The
+    cell past the edge is taken according to the boundary.
+    """
+    if d > 0:
+        inner = (slice(0, n - 1), slice(1, n))
+        edge = slice(n - 1, n)
+        outside = {"wrap": slice(0, 1), "symm": edge}
+    else:
+        inner = (slice(1, n), slice(0, n - 1))
+        edge = slice(0, 1)
+        outside = {"wrap": slice(n - 1, n), "symm": edge}
+
+    if boundary == "fill":
+        return [inner]
+    return [inner, (edge, outside[boundary])]
+
+
+def _count_neighbors_convolve(
+    X: np.ndarray, boundary: str = "wrap"
+) -> np.ndarray:
+    """Get the number of neighbors using :func:`scipy.signal.convolve2d`
+
+    This is the reference implementation of :func:`_count_neighbors`. It
+    upcasts the board to :code:`float64`, so it's much slower.
+    """
+    from scipy.signal import convolve2d
+
+    n = convolve2d(X, np.ones((3, 3)), mode="same", boundary=boundary) - X
     return n
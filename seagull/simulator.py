@@ -18,7 +18,15 @@ statistics are returned.
 
 You can always get the history of the whole simulation by calling the
 `get_history()` method. The length of the history will always be equal to
-:code:`iters + 1` since we include the initial state
+:code:`iters + 1` since we include the initial state. To keep only some of
+the generations, or to write them to disk, pass a sink from
+:mod:`seagull.history`:
+
+.. code-block:: python
+
+    from seagull.history import RingSink
+
+    stats = sim.run(sg.rules.conway_classic, iters=1000, history=RingSink(10))
 
 .. note::
 
@@ -55,20 +63,61 @@ an interactive animation in your notebook or exported as a GIF.
 
     When exporting to GIF, it is required to have the ffmpeg backend installed.
 
+Most random soups settle into still lifes and oscillators long before the
+end of a run. Pass :code:`max_period` to stop as soon as the board repeats
+itself; the detected :code:`period` and the generation it
+:code:`stabilized_at` are added to the statistics:
+
+.. code-block:: python
+
+    stats = sim.run(sg.rules.conway_classic, iters=10000, max_period=60)
+
+Long runs can be checkpointed with :code:`checkpoint` and
+:code:`checkpoint_every`, and continued with :code:`resume()` after an
+interruption, see :mod:`seagull.checkpoint`.
+
+For very long runs where only the final state matters, use the
+:code:`advance()` method instead. It evolves the board with the
+:obj:`seagull.engines.hashlife.HashLifeEngine`, which can jump millions of
+generations at once for structured patterns, and returns the state of the
+board (or any window of the plane) without recording the history:
+
+.. code-block:: python
+
+    state = sim.advance(sg.rules.conway_classic, generations=10 ** 6)
+
 """
 
 # Import standard library
-from typing import Callable, Union
+import hashlib
+import json
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Deque,
+    Dict,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 # Import modules
-import matplotlib.pyplot as plt
 import numpy as np
 from loguru import logger
-from matplotlib import animation
 
+from . import checkpoint
+from . import history as history_module
 from .board import Board
+from .engines import ENGINES, Engine, HashLifeEngine, get_engine
+from .history import HistoryReader, HistorySink, MemorySink
+from .rules import Rule, compile as compile_rule, conway_classic
 from .utils import statistics as stats
 
+if TYPE_CHECKING:
+    from matplotlib.animation import FuncAnimation
+
 
 class Simulator:
     def __init__(self, board: Board):
@@ -80,10 +129,20 @@ class Simulator:
             The board to run the simulation on
         """
         self.board = board
-        self.history = []  # type: list
+        self.history = MemorySink()  # type: HistorySink
         self.stats = {}  # type: dict
 
-    def run(self, rule: Callable, iters: int, **kwargs) -> dict:
+    def run(
+        self,
+        rule: Callable,
+        iters: int,
+        engine: Union[str, Type[Engine]] = None,
+        history: Optional[HistorySink] = None,
+        max_period: Optional[int] = None,
+        checkpoint: Optional[str] = None,
+        checkpoint_every: int = 1000,
+        **kwargs
+    ) -> dict:
         """Run the simulation for a given number of iterations
 
         Parameters
@@ -93,31 +152,238 @@ class Simulator:
             shape.
         iters : int
             Number of iterations to run the simulation.
+        engine : str or type, optional
+            Engine used to evolve the board, see :mod:`seagull.engines`.
+            Default is the board's :code:`default_engine`: :code:`"dense"`
+            for a :obj:`seagull.Board`, which calls the rule on every step,
+            and :code:`"sparse"` for a :obj:`seagull.SparseBoard`.
+        history : :obj:`seagull.history.HistorySink`, optional
+            Where to keep the generations of the run, see
+            :mod:`seagull.history`. Default is a
+            :obj:`seagull.history.MemorySink` that keeps all of them
+        max_period : int, optional
+            If set, stop the run as soon as a generation repeats one of the
+            last :code:`max_period` generations, i.e. once the board is
+            empty, static, or periodic with at most that period. The
+            statistics then get the :code:`period` (None if none was found),
+            the generation it :code:`stabilized_at`, and the number of
+            :code:`generations` that were run.
+        checkpoint : str, optional
+            Path of a checkpoint to save periodically, see
+            :mod:`seagull.checkpoint` and :meth:`resume`. The checkpoint is
+            kept once the run completes
+        checkpoint_every : int
+            Number of generations between checkpoints. Default is 1000
+        **kwargs
+            Keyword arguments passed to the rule (or the engine)
 
         Returns
         -------
         dict
            Computed statistics for the simulation run
         """
-        layout = self.board.state.copy()
+        engine = engine or self.board.default_engine
+        evolver = get_engine(engine)(rule, **kwargs)
+        evolver.load(self.board)
+
+        self.history = history if history is not None else MemorySink()
+        self.history.open(
+            self.board.size, iters, rule=_rule_name(rule, **kwargs)
+        )
+        summary = stats.StatisticsAccumulator()
+        cycles = _CycleDetector(max_period) if max_period else None
+        spec = None
+        if checkpoint is not None:
+            spec = self._describe_run(
+                rule, engine, iters, max_period, checkpoint_every, **kwargs
+            )
 
         # Append the initial state
-        self.history.append(layout)
+        state = evolver.state
+        self.history.append(0, state)
+        summary.update(state)
+        if cycles is not None:
+            cycles.update(0, evolver.fingerprint())
+
+        return self._run_from(
+            1, iters, evolver, summary, cycles, checkpoint, spec
+        )
+
+    def resume(
+        self,
+        path: str,
+        rule: Optional[Callable] = None,
+        engine: Union[str, Type[Engine]] = None,
+        history: Optional[HistorySink] = None,
+        **kwargs
+    ) -> dict:
+        """Continue an interrupted run from its last checkpoint
+
+        The run continues with the same rule, engine, history sink, number
+        of iterations, and checkpoints, and gives the same generations and
+        statistics as if it had never been interrupted.
+
+        Parameters
+        ----------
+        path : str
+            Path of the checkpoint given to :meth:`run`
+        rule : callable, optional
+            The rule of the run. Required if it was not a B/S rule, e.g. a
+            custom callable
+        engine : str or type, optional
+            The engine of the run. Required if it was not a registered
+            engine
+        history : :obj:`seagull.history.HistorySink`, optional
+            Where to keep the remaining generations. Default is a sink like
+            the one of the run, that continues its file if it has one
+        **kwargs
+            Keyword arguments passed to the rule (or the engine), on top of
+            those of the run
+
+        Returns
+        -------
+        dict
+           Computed statistics for the whole simulation run
+        """
+        spec, generation, arrays = checkpoint.load(path)
+        kwargs = dict(spec["kwargs"], **kwargs)
+        if rule is None and spec["rulestring"] is not None:
+            rule = compile_rule(spec["rulestring"])
+            kwargs.pop("rulestring", None)
+        engine = engine or spec["engine"]
+        if rule is None or engine is None:
+            msg = f"Pass the rule and engine of {spec['rule']} to resume"
+            logger.error(msg)
+            raise ValueError(msg)
+
+        evolver = get_engine(engine)(rule, **kwargs)
+        evolver.load(checkpoint._Snapshot(spec, arrays))
+        logger.info(f"Resuming {spec['rule']} at generation {generation}")
+
+        if history is None:
+            sink = getattr(history_module, spec["sink"]["type"])
+            history = sink(**spec["sink"]["config"])
+        self.history = history
+        self.history.reopen(
+            tuple(spec["size"]),
+            spec["iters"],
+            list(arrays["history_generations"]),
+            rule=spec["rule"],
+        )
+        summary = stats.StatisticsAccumulator.from_state(
+            {k[6:]: v for k, v in arrays.items() if k.startswith("stats_")}
+        )
+        cycles = None
+        if spec["max_period"]:
+            cycles = _CycleDetector.from_state(spec["max_period"], arrays)
 
-        # Run simulation
-        for i in range(iters):
-            layout = rule(layout, **kwargs)
-            self.history.append(layout)
+        return self._run_from(
+            generation + 1, spec["iters"], evolver, summary, cycles, path, spec
+        )
 
-        self.stats = self.compute_statistics(self.get_history())
+    def _run_from(
+        self,
+        start: int,
+        iters: int,
+        evolver: Engine,
+        summary: stats.StatisticsAccumulator,
+        cycles: Optional["_CycleDetector"],
+        path: Optional[str],
+        spec: Optional[dict],
+    ) -> dict:
+        """Run the simulation from a generation until the end"""
+        for i in range(start, iters + 1):
+            evolver.step()
+            state = evolver.state
+            self.history.append(i, state)
+            summary.update(state)
+            if cycles is not None and cycles.update(i, evolver.fingerprint()):
+                logger.info(
+                    f"Stopping at generation {i}, the board repeats with "
+                    f"period {cycles.period} since {cycles.stabilized_at}"
+                )
+                break
+            if path is not None and i % spec["checkpoint_every"] == 0:
+                self._save_checkpoint(path, spec, i, evolver, summary, cycles)
+
+        self.history.close()
+        logger.info("Computing simulation statistics...")
+        self.stats = summary.result()
+        self.stats.update(evolver.statistics())
+        if cycles is not None:
+            self.stats.update(cycles.result())
         return self.stats
 
-    def compute_statistics(self, history: Union[list, np.ndarray]) -> dict:
+    def _describe_run(
+        self,
+        rule: Callable,
+        engine: Union[str, Type[Engine]],
+        iters: int,
+        max_period: Optional[int],
+        checkpoint_every: int,
+        **kwargs
+    ) -> dict:
+        """Describe a run to save it in checkpoints"""
+        if not isinstance(engine, str):
+            names = {cls: name for name, cls in ENGINES.items()}
+            engine = names.get(engine)
+        spec = {
+            "rule": _rule_name(rule, **kwargs),
+            "rulestring": _rulestring(rule, **kwargs),
+            "engine": engine,
+            "kwargs": kwargs,
+            "iters": iters,
+            "max_period": max_period,
+            "checkpoint_every": checkpoint_every,
+            "size": self.board.size,
+            "boundary": self.board.boundary,
+            "sink": {
+                "type": type(self.history).__name__,
+                "config": self.history.config(),
+            },
+        }
+        try:
+            json.dumps(spec)
+        except TypeError:
+            msg = f"Checkpoints need JSON-serializable arguments, got {kwargs}"
+            logger.error(msg)
+            raise ValueError(msg)
+        return spec
+
+    def _save_checkpoint(
+        self,
+        path: str,
+        spec: dict,
+        generation: int,
+        evolver: Engine,
+        summary: stats.StatisticsAccumulator,
+        cycles: Optional["_CycleDetector"],
+    ):
+        """Save everything needed to resume the run after a generation"""
+        self.history.flush()
+        arrays = {
+            f"stats_{key}": value
+            for key, value in summary.get_state().items()
+        }
+        if cycles is not None:
+            arrays.update(cycles.get_state())
+        checkpoint.save(
+            path,
+            spec,
+            generation,
+            evolver,
+            history_generations=np.array(self.history.generations, int),
+            **arrays,
+        )
+
+    def compute_statistics(
+        self, history: Union[list, np.ndarray, HistoryReader]
+    ) -> dict:
         """Compute various statistics for the board
 
         Parameters
         ----------
-        history : list or numpy.ndarray
+        history : list, numpy.ndarray, or :obj:`seagull.history.HistoryReader`
             The simulation history
 
         Returns
@@ -126,24 +392,47 @@ class Simulator:
             Compute statistics
         """
         logger.info("Computing simulation statistics...")
-        sim_stats = {
-            "peak_cell_coverage": np.max(
-                [stats.cell_coverage(h) for h in history]
-            ),
-            "avg_cell_coverage": np.mean(
-                [stats.cell_coverage(h) for h in history]
-            ),
-            "avg_shannon_entropy": np.mean(
-                [stats.shannon_entropy(h) for h in history]
-            ),
-            "peak_shannon_entropy": np.max(
-                [stats.shannon_entropy(h) for h in history]
-            ),
-        }
+        return stats.StatisticsAccumulator.from_history(history).result()
+
+    def advance(
+        self,
+        rule: Callable,
+        generations: int,
+        window: Optional[Tuple[int, int, int, int]] = None,
+        **kwargs
+    ) -> np.ndarray:
+        """Get the state of the board after a number of generations
 
-        return sim_stats
+        Unlike :meth:`run`, the history and statistics are not recorded, and
+        the board is treated as an unbounded plane (its boundary is ignored).
+
+        Parameters
+        ----------
+        rule : callable
+            The B/S rule to apply, see
+            :obj:`seagull.engines.hashlife.HashLifeEngine`
+        generations : int
+            Number of generations to advance
+        window : tuple of int, optional
+            Window of the plane to return as :code:`(row, col, height,
+            width)`. Default is the area covered by the board
+        **kwargs
+            Keyword arguments passed to the engine, e.g. :code:`max_nodes`,
+            or the :code:`rulestring` of :func:`seagull.rules.life_rule`
 
-    def get_history(self, exclude_init=False) -> np.ndarray:
+        Returns
+        -------
+        numpy.ndarray
+            State of the board or of the window after the given generations
+        """
+        engine = HashLifeEngine(rule, **kwargs)
+        engine.load(self.board)
+        engine.advance(generations)
+        return engine.render(window)
+
+    def get_history(
+        self, exclude_init=False
+    ) -> Union[np.ndarray, HistoryReader]:
         """Get the simulation history
 
         Parameters
@@ -153,14 +442,19 @@ class Simulator:
 
         Returns
         -------
-        numpy.ndarray
+        numpy.ndarray or :obj:`seagull.history.HistoryReader`
             Simulation history of shape :code:`(iters+1, board.size[0],
-            board.size[1])`
+            board.size[1])`, or the generations kept by the history sink. A
+            :obj:`seagull.history.PackedSink` returns a reader that unpacks
+            the generations as they are accessed.
         """
-        history = self.history[1:] if exclude_init else self.history
-        return np.asarray(history)
+        if self.history.shape is not None and not len(self.history):
+            logger.warning(
+                f"The {type(self.history).__name__} of the run kept no frames"
+            )
+        return self.history.frames(exclude_init)
 
-    def animate(self, figsize=(5, 5), interval=100) -> animation.FuncAnimation:
+    def animate(self, figsize=(5, 5), interval=100) -> "FuncAnimation":
         """Animate the resulting simulation
 
         Parameters
@@ -175,10 +469,18 @@ class Simulator:
         matplotlib.animation.FuncAnimation
             Animation generated from the run
         """
-        if not self.history:
+        if self.history.shape is None:
             msg = "The run() argument must be executed first"
             logger.error(msg)
             raise ValueError(msg)
+        if not len(self.history):
+            sink = type(self.history).__name__
+            msg = f"The {sink} of the run kept no frames to animate"
+            logger.error(msg)
+            raise ValueError(msg)
+
+        import matplotlib.pyplot as plt
+        from matplotlib import animation
 
         logger.info("Rendering animation...")
         fig = plt.figure(figsize=figsize)
@@ -207,3 +509,82 @@ class Simulator:
             blit=True,
         )
         return anim
+
+
+def _rule_name(rule: Callable, **kwargs) -> str:
+    """Describe a rule for the history metadata"""
+    if isinstance(rule, str):
+        return rule
+    if "rulestring" in kwargs:
+        return kwargs["rulestring"]
+    return getattr(rule, "rulestring", getattr(rule, "__name__", repr(rule)))
+
+
+def _rulestring(rule: Callable, **kwargs) -> Optional[str]:
+    """Get the rulestring of a B/S rule, to compile it again on resume"""
+    if isinstance(rule, Rule):
+        return rule.rulestring
+    if isinstance(rule, str):
+        return rule
+    if rule is conway_classic:
+        return "B3/S23"
+    return kwargs.get("rulestring")
+
+
+class _CycleDetector:
+    """Finds the first generation that repeats one of the last generations
+
+    The fingerprint of each generation is hashed, and only the hashes of the
+    last :code:`max_period` generations are kept, so the memory used doesn't
+    depend on the length of the run.
+    """
+
+    def __init__(self, max_period: int):
+        self.max_period = max_period
+        self.seen = {}  # type: Dict[bytes, int]
+        self.recent = deque()  # type: Deque[bytes]
+        self.generation = 0
+        self.period = None  # type: Optional[int]
+        self.stabilized_at = None  # type: Optional[int]
+
+    def update(self, generation: int, fingerprint: bytes) -> bool:
+        """Add a generation, and check if it repeats an earlier one"""
+        self.generation = generation
+        digest = hashlib.blake2b(fingerprint, digest_size=16).digest()
+        if digest in self.seen:
+            self.stabilized_at = self.seen[digest]
+            self.period = generation - self.stabilized_at
+            return True
+
+        self.seen[digest] = generation
+        self.recent.append(digest)
+        if len(self.recent) > self.max_period:
+            del self.seen[self.recent.popleft()]
+        return False
+
+    def get_state(self) -> dict:
+        return {
+            "cycle_digests": np.frombuffer(
+                b"".join(self.recent), dtype=np.uint8
+            ).reshape(-1, 16),
+            "cycle_generations": np.array(
+                [self.seen[digest] for digest in self.recent], dtype=int
+            ),
+        }
+
+    @classmethod
+    def from_state(cls, max_period: int, state: dict) -> "_CycleDetector":
+        cycles = cls(max_period)
+        for digest, generation in zip(
+            state["cycle_digests"], state["cycle_generations"]
+        ):
+            cycles.seen[digest.tobytes()] = int(generation)
+            cycles.recent.append(digest.tobytes())
+        return cycles
+
+    def result(self) -> dict:
+        return {
+            "period": self.period,
+            "stabilized_at": self.stabilized_at,
+            "generations": self.generation,
+        }
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""Sweeps run a grid of simulations over rules, random seeds, and board
+sizes on all cores. Each worker process evolves a chunk of seeds at once
+with the :obj:`seagull.BatchSimulator`, and only sends the statistics of
+each run back, never the history:
+
+.. code-block:: python
+
+    import seagull as sg
+
+    results = sg.sweep(
+        rules=["B3/S23", "B36/S23"],
+        seeds=range(1000),
+        size=(64, 64),
+        iters=500,
+        path="sweep.npz",
+    )
+    results["peak_cell_coverage"]  # one value per run
+
+Every run starts from a :obj:`seagull.lifeforms.random.RandomBox` covering
+the board. The results are columns with one value per run: the
+:code:`rule`, :code:`seed`, :code:`height`, and :code:`width` of the run,
+followed by its statistics. They are ordered by rule, size, then seed, and
+are written to a :code:`.npz` file if a path is given. To process the
+results as they come in, pass a :code:`callback` that receives the columns
+of each finished chunk.
+"""
+
+# Import standard library
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+# Import modules
+import numpy as np
+from loguru import logger
+
+from .batch import BatchSimulator
+from .lifeforms.random import RandomBox
+from .rules import Rule, _as_rule
+
+
+def sweep(
+    rules: Sequence[Union[Rule, str]],
+    seeds: Iterable[int],
+    size: Union[Tuple[int, int], Sequence[Tuple[int, int]]] = (32, 32),
+    iters: int = 100,
+    boundary: str = "wrap",
+    path: Optional[str] = None,
+    processes: Optional[int] = None,
+    chunksize: int = 64,
+    callback: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """Run a simulation for every combination of rule, seed, and size
+
+    Parameters
+    ----------
+    rules : list of :obj:`seagull.rules.Rule` or str
+        B/S rules, or their rulestrings
+    seeds : iterable of int
+        Random seeds of the initial :obj:`seagull.lifeforms.random.RandomBox`
+    size : tuple of int or list of tuple of int
+        Size of the boards, or a list of sizes to sweep. Default is
+        :code:`(32, 32)`
+    iters : int
+        Number of iterations of each run. Default is 100
+    boundary : str
+        Boundary condition of the boards. Default is :code:`"wrap"`
+    path : str, optional
+        Path of a :code:`.npz` file to write the results to
+    processes : int, optional
+        Number of worker processes. Default is the number of CPUs. If 1,
+        the runs are done in the current process
+    chunksize : int
+        Number of seeds evolved together by a worker. Default is 64
+    callback : callable, optional
+        Called with the result columns of each chunk as it finishes
+
+    Returns
+    -------
+    dict
+        Result columns with one value per run
+    """
+    sizes = [size] if np.ndim(size) == 1 else list(size)
+    seeds = list(seeds)
+    tasks = [
+        (_as_rule(rule).rulestring, tuple(shape), seeds[i : i + chunksize])
+        for rule in rules
+        for shape in sizes
+        for i in range(0, len(seeds), chunksize)
+    ]
+    logger.info(
+        f"Sweeping {len(tasks)} chunks of up to {chunksize} runs over "
+        f"{processes or os.cpu_count()} processes"
+    )
+
+    results = [None] * len(tasks)  # type: List[dict]
+
+    def _collect(index: int, result: dict):
+        results[index] = result
+        if callback is not None:
+            callback(result)
+
+    if processes == 1:
+        for index, task in enumerate(tasks):
+            _collect(index, _run_chunk(*task, iters=iters, boundary=boundary))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = {
+                executor.submit(
+                    _run_chunk, *task, iters=iters, boundary=boundary
+                ): index
+                for index, task in enumerate(tasks)
+            }
+            for future in as_completed(futures):
+                _collect(futures[future], future.result())
+
+    columns = {
+        key: np.concatenate([result[key] for result in results])
+        for key in (results[0] if results else {})
+    }
+    if path is not None:
+        np.savez(path, **columns)
+    return columns
+
+
+def _run_chunk(
+    rulestring: str,
+    size: Tuple[int, int],
+    seeds: List[int],
+    iters: int,
+    boundary: str,
+) -> dict:
+    """Evolve a chunk of seeds and return the columns of their results"""
+    states = np.array(
+        [RandomBox(shape=size, seed=seed).layout for seed in seeds],
+        dtype=bool,
+    )
+    stats = BatchSimulator(states, boundary=boundary).run(rulestring, iters)
+    n = len(seeds)
+    columns = {
+        "rule": np.full(n, rulestring),
+        "seed": np.array(seeds, dtype=np.int64),
+        "height": np.full(n, size[0], dtype=np.int64),
+        "width": np.full(n, size[1], dtype=np.int64),
+    }
+    columns.update({key: np.asarray(value) for key, value in stats.items()})
+    return columns
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""Packing stores boolean board states with eight cells per byte, along the
+last axis. It is used for the on-disk history and for anything else that
+needs to store or compare many board states compactly."""
+
+import numpy as np
+
+# Number of set bits of every byte value
+_BYTES = np.arange(256, dtype=np.uint8)[:, None]
+_POPCOUNT = np.unpackbits(_BYTES, axis=1).sum(axis=1, dtype=np.uint8)
+
+
+def packbits(X: np.ndarray) -> np.ndarray:
+    """Pack boolean states along the last axis
+
+    Parameters
+    ----------
+    X : :obj:`numpy.ndarray`
+        Boolean array of shape :code:`(..., width)`
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+        uint8 array of shape :code:`(..., ceil(width / 8))`
+    """
+    return np.packbits(np.asarray(X, dtype=bool), axis=-1)
+
+
+def unpackbits(P: np.ndarray, width: int) -> np.ndarray:
+    """Unpack states packed by :func:`packbits`
+
+    Parameters
+    ----------
+    P : :obj:`numpy.ndarray`
+        uint8 array of shape :code:`(..., ceil(width / 8))`
+    width : int
+        Width of the unpacked states
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+        Boolean array of shape :code:`(..., width)`
+    """
+    return np.unpackbits(P, axis=-1, count=width).view(bool)
+
+
+def packed_width(width: int) -> int:
+    """Number of bytes needed to pack a row of a given width"""
+    return -(-width // 8)
+
+
+def popcount(P: np.ndarray, axis=None) -> np.ndarray:
+    """Count the set bits of packed states
+
+    Parameters
+    ----------
+    P : :obj:`numpy.ndarray`
+        uint8 array of packed states
+    axis : int or tuple of int, optional
+        Axes to count along. Default is all axes
+
+    Returns
+    -------
+    int or :obj:`numpy.ndarray`
+        Number of set bits
+    """
+    return _POPCOUNT[P].sum(axis=axis, dtype=np.int64)
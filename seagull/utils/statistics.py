@@ -2,38 +2,428 @@
 
 """Statistics contain various computations to characterize a board state"""
 
+# Import standard library
+from typing import Dict, Optional, Tuple
+
+# Import modules
 import numpy as np
+from loguru import logger
+
+# Number of generations counted at once, which bounds the temporary memory
+# used on memory-mapped histories
+CHUNK = 256
+
+
+def population(states, chunk: int = CHUNK) -> np.ndarray:
+    """Count the live cells of a board state, or of each state of a history
+
+    Parameters
+    ----------
+    states : :obj:`numpy.ndarray` or :obj:`seagull.history.HistoryReader`
+        A board state of shape :code:`(height, width)`, or states of shape
+        :code:`(..., height, width)` such as a history. Memory-mapped
+        arrays and readers are counted a few generations at a time.
+    chunk : int
+        Number of states counted at once. Default is 256
 
+    Returns
+    -------
+    int or :obj:`numpy.ndarray`
+        Number of live cells of each state
+    """
+    if hasattr(states, "populations"):
+        return states.populations(chunk)
 
-def shannon_entropy(state: np.ndarray) -> float:
+    X = np.asarray(states)
+    if X.ndim == 2:
+        return np.count_nonzero(X)
+
+    frames = X.reshape((-1,) + X.shape[-2:])
+    counts = np.empty(len(frames), dtype=np.int64)
+    for i in range(0, len(frames), chunk):
+        block = frames[i : i + chunk].reshape(-1, X.shape[-2] * X.shape[-1])
+        counts[i : i + chunk] = np.count_nonzero(block, axis=1)
+    return counts.reshape(X.shape[:-2])
+
+
+def shannon_entropy(state, counts=None) -> np.ndarray:
     """Compute for the shannon entropy for the whole board
 
     Parameters
     ----------
-    state : :obj:`numpy.ndarray`
-        The board state to compute statistics from
+    state : :obj:`numpy.ndarray` or :obj:`seagull.history.HistoryReader`
+        The board state to compute statistics from, or a history of shape
+        :code:`(..., height, width)`
+    counts : int or :obj:`numpy.ndarray`, optional
+        Precomputed :func:`population` of the states, so that it can be
+        shared with other statistics
 
     Returns
     -------
-    float
-        Shannon entropy
+    float or :obj:`numpy.ndarray`
+        Shannon entropy of each state
     """
-    zero_probs = np.count_nonzero(state) / np.product(state.shape)
-    one_probs = 1 - zero_probs
-    return -np.sum(np.log2([zero_probs, one_probs]))
+    return _entropy(cell_coverage(state, counts))
 
 
-def cell_coverage(state: np.ndarray) -> float:
+def cell_coverage(state, counts=None) -> np.ndarray:
     """Compute for the live cell coverage for the whole board
 
+    Parameters
+    ----------
+    state : :obj:`numpy.ndarray` or :obj:`seagull.history.HistoryReader`
+        The board state to compute statistics from, or a history of shape
+        :code:`(..., height, width)`
+    counts : int or :obj:`numpy.ndarray`, optional
+        Precomputed :func:`population` of the states, so that it can be
+        shared with other statistics
+
+    Returns
+    -------
+    float or :obj:`numpy.ndarray`
+        Cell coverage of each state
+    """
+    if counts is None:
+        counts = population(state)
+    height, width = state.shape[-2:]
+    return counts / (height * width)
+
+
+def frame_statistics(history) -> dict:
+    """Compute the statistics of every state of a history at once
+
+    Parameters
+    ----------
+    history : :obj:`numpy.ndarray` or :obj:`seagull.history.HistoryReader`
+        The simulation history, of shape :code:`(..., height, width)`
+
+    Returns
+    -------
+    dict
+        Arrays of the population, cell coverage, and shannon entropy of each
+        state, computed from a single population count
+    """
+    counts = population(history)
+    coverage = cell_coverage(history, counts)
+    return {
+        "population": counts,
+        "cell_coverage": coverage,
+        "shannon_entropy": _entropy(coverage),
+    }
+
+
+def census(
+    state: np.ndarray, distance: int = 2, catalogue: Optional[dict] = None
+) -> Tuple[Dict[str, int], Dict[str, np.ndarray]]:
+    """Count the objects of a board state by kind
+
+    Live cells within :code:`distance` cells of each other, diagonals
+    included, belong to the same object. Each object is cropped to its live
+    cells and identified by its
+    :func:`~seagull.lifeforms.canonical.canonical_hash`, so objects are
+    matched in any phase, rotation and reflection. Objects are grouped by
+    size, so that each group is extracted and hashed at once. A census of a
+    4096x4096 board takes about 0.45s with 100k objects, and about 0.7s
+    with 430k objects, see :code:`benchmarks/bench_census.py`.
+
+    .. code-block:: python
+
+        from seagull.utils.statistics import census
+
+        counts, locations = census(board.state)
+        counts["Blinker"], locations["Glider"]
+
     Parameters
     ----------
     state : :obj:`numpy.ndarray`
-        The board state to compute statistics from
+        The board state to take the census of
+    distance : int
+        Largest distance between cells of the same object. Default is 2,
+        which keeps objects with a gap of one dead cell, like the
+        :obj:`~seagull.lifeforms.oscillators.Pulsar`, in one piece
+    catalogue : dict, optional
+        Lifeform class and phase of each known canonical hash. Default is
+        :func:`seagull.lifeforms.canonical.catalogue`
 
     Returns
     -------
-    float
-        Cell coverage
+    tuple of dict
+        Number of objects of each kind, and the :code:`(row, col)`
+        locations of the top-left corner of their live cells, in an array
+        of shape :code:`(count, 2)`. Known objects are named after their
+        lifeform class, and other objects after their canonical hash in
+        hexadecimal. Kinds are sorted by decreasing count
+    """
+    from scipy import ndimage
+
+    from ..lifeforms import canonical
+
+    if distance < 1:
+        msg = f"distance must be at least 1, got {distance}"
+        logger.error(msg)
+        raise ValueError(msg)
+    if catalogue is None:
+        catalogue = canonical.catalogue()
+
+    X = np.asarray(state, dtype=bool)
+    # Growing every cell into a box of the distance connects the cells
+    # that are at most that far apart
+    grown = X.copy()
+    for _ in range(distance - 1):
+        grown[1:] |= grown[:-1].copy()
+    for _ in range(distance - 1):
+        grown[:, 1:] |= grown[:, :-1].copy()
+    labels, count = ndimage.label(grown, structure=np.ones((3, 3)))
+    if count == 0:
+        return {}, {}
+
+    # Bounding boxes of the live cells of each object. Sorting the cells
+    # by object keeps them in row-major order within each object
+    cells = np.flatnonzero(X)
+    ids = labels.ravel()[cells]
+    y, x = np.divmod(cells[np.argsort(ids, kind="stable")], X.shape[1])
+    ends = np.cumsum(np.bincount(ids, minlength=count + 1)[1:])
+    starts = np.append(0, ends[:-1])
+    corners = np.column_stack((y[starts], np.minimum.reduceat(x, starts)))
+    shapes = (
+        np.column_stack((y[ends - 1], np.maximum.reduceat(x, starts)))
+        - corners
+        + 1
+    )
+
+    hashes = np.empty(count, dtype=np.uint64)
+    keys = shapes[:, 0] * (X.shape[1] + 1) + shapes[:, 1]
+    order = np.argsort(keys, kind="stable")
+    _, first = np.unique(keys[order], return_index=True)
+    flat_labels, flat_state = labels.ravel(), X.ravel()
+    origins = corners[:, 0] * X.shape[1] + corners[:, 1]
+    for group in np.split(order, first[1:]):
+        height, width = shapes[group[0]]
+        offsets = np.arange(height)[:, None] * X.shape[1] + np.arange(width)
+        cells = origins[group, None, None] + offsets
+        # Dilated cells carry the label too, so they are masked out
+        stack = flat_labels.take(cells) == (group + 1)[:, None, None]
+        stack &= flat_state.take(cells)
+        hashes[group] = canonical._stack_hashes(stack)
+
+    # Different phases of a lifeform have different hashes but one name
+    unique, inverse = np.unique(hashes, return_inverse=True)
+    names = {}  # type: Dict[str, int]
+    kinds = np.empty(len(unique), dtype=np.int64)
+    for i, key in enumerate(unique.tolist()):
+        match = catalogue.get(key)
+        name = match[0].__name__ if match is not None else f"{key:016x}"
+        kinds[i] = names.setdefault(name, len(names))
+    kinds = kinds[inverse.reshape(-1)]
+
+    located = corners[np.argsort(kinds, kind="stable")]
+    sizes = np.bincount(kinds).tolist()
+    ends = np.cumsum(sizes).tolist()
+    found = sorted(zip(names, sizes, ends), key=lambda k: (-k[1], k[0]))
+    counts = {name: size for name, size, _ in found}
+    locations = {name: located[end - size : end] for name, size, end in found}
+    return counts, locations
+
+
+class StatisticsAccumulator:
+    """Accumulates statistics over a simulation, one generation at a time
+
+    Each generation costs a single population count, from which the cell
+    coverage and the shannon entropy are derived. Peaks, means, and
+    variances (with Welford's algorithm) are kept as running values, so the
+    memory used doesn't depend on the number of generations.
+
+    .. code-block:: python
+
+        from seagull.history import HistoryReader
+        from seagull.utils.statistics import StatisticsAccumulator
+
+        acc = StatisticsAccumulator.from_history(HistoryReader("run.sgh"))
+        acc.result()
     """
-    return np.sum(state) / np.product(state.shape)
+
+    def __init__(self):
+        """Initialize the class"""
+        self.count = 0
+        self.coverage = _RunningValue()
+        self.entropy = _RunningValue()
+
+    @classmethod
+    def from_history(cls, history) -> "StatisticsAccumulator":
+        """Accumulate the statistics of a whole history
+
+        Parameters
+        ----------
+        history : iterable of :obj:`numpy.ndarray`
+            The simulation history, e.g. an array of shape :code:`(n,
+            height, width)` or a :obj:`seagull.history.HistoryReader`. A
+            reader is counted without unpacking the generations. Any other
+            iterable, such as a generator, is counted one frame at a time.
+
+        Returns
+        -------
+        :obj:`StatisticsAccumulator`
+            Accumulator updated with every generation of the history
+        """
+        acc = cls()
+        if isinstance(history, list):
+            history = np.asarray(history)
+        if not hasattr(history, "shape"):
+            for state in history:
+                acc.update(state)
+            return acc
+        acc.add_many(population(history), np.prod(history.shape[-2:]))
+        return acc
+
+    def get_state(self) -> dict:
+        """Get the running values, e.g. to save them in a checkpoint
+
+        Returns
+        -------
+        dict
+            Arrays that :meth:`from_state` turns back into an accumulator
+        """
+        state = {"count": np.asarray(self.count)}
+        for name in ("coverage", "entropy"):
+            for key, value in vars(getattr(self, name)).items():
+                state[f"{name}_{key}"] = np.asarray(value)
+        return state
+
+    @classmethod
+    def from_state(cls, state: dict) -> "StatisticsAccumulator":
+        """Create an accumulator from the values of :meth:`get_state`
+
+        Parameters
+        ----------
+        state : dict
+            Running values of an accumulator
+
+        Returns
+        -------
+        :obj:`StatisticsAccumulator`
+            Accumulator that continues from the given values
+        """
+        acc = cls()
+        acc.count = int(state["count"])
+        for name in ("coverage", "entropy"):
+            running = getattr(acc, name)
+            for key in vars(running):
+                value = np.asarray(state[f"{name}_{key}"])
+                setattr(running, key, value[()] if value.ndim == 0 else value)
+            running.count = int(running.count)
+        return acc
+
+    def update(self, state: np.ndarray):
+        """Add a generation
+
+        Parameters
+        ----------
+        state : :obj:`numpy.ndarray`
+            The board state to compute statistics from, or a stack of
+            states of shape :code:`(n, height, width)` whose statistics are
+            kept separately
+        """
+        height, width = state.shape[-2:]
+        self.add(population(state), height * width)
+
+    def add(self, population: int, size: int):
+        """Add a generation from its number of live cells
+
+        Parameters
+        ----------
+        population : int or :obj:`numpy.ndarray`
+            Number of live cells, or of each board of a stack
+        size : int
+            Number of cells of the board
+        """
+        coverage = population / size
+        self.count += 1
+        self.coverage.add(coverage)
+        self.entropy.add(_entropy(coverage))
+
+    def add_many(self, populations: np.ndarray, size: int):
+        """Add many generations from their number of live cells
+
+        Parameters
+        ----------
+        populations : :obj:`numpy.ndarray`
+            Number of live cells of each generation, along the first axis
+        size : int
+            Number of cells of the board
+        """
+        coverage = np.asarray(populations) / size
+        if len(coverage) == 0:
+            return
+        self.count += len(coverage)
+        self.coverage.add_many(coverage)
+        self.entropy.add_many(_entropy(coverage))
+
+    def result(self) -> dict:
+        """Get the accumulated statistics
+
+        Returns
+        -------
+        dict
+            Peak, average, and variance of the cell coverage and of the
+            shannon entropy
+        """
+        return {
+            "peak_cell_coverage": self.coverage.peak,
+            "avg_cell_coverage": self.coverage.mean,
+            "var_cell_coverage": self.coverage.variance,
+            "avg_shannon_entropy": self.entropy.mean,
+            "peak_shannon_entropy": self.entropy.peak,
+            "var_shannon_entropy": self.entropy.variance,
+        }
+
+
+class _RunningValue:
+    """Running peak, mean, and variance of a value, or of an array"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.peak = np.nan
+        self.welford_mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.peak = value if self.count == 1 else np.maximum(self.peak, value)
+        with np.errstate(invalid="ignore"):
+            delta = value - self.welford_mean
+            self.welford_mean += delta / self.count
+            self.m2 += delta * (value - self.welford_mean)
+
+    def add_many(self, values: np.ndarray):
+        # Chan's update merges the mean and variance of the new values
+        n = len(values)
+        total = self.count + n
+        with np.errstate(invalid="ignore"):
+            mean = np.mean(values, axis=0)
+            m2 = np.sum((values - mean) ** 2, axis=0)
+            delta = mean - self.welford_mean
+        peak = np.max(values, axis=0)
+        self.peak = peak if self.count == 0 else np.maximum(self.peak, peak)
+        self.total += np.sum(values, axis=0)
+        with np.errstate(invalid="ignore"):
+            self.m2 += m2 + delta**2 * self.count * n / total
+            self.welford_mean += delta * n / total
+        self.count = total
+
+    @property
+    def mean(self) -> float:
+        # The plain sum keeps infinite values, e.g. the entropy of an empty
+        # board, which Welford's update would turn into nan
+        return self.total / self.count if self.count else np.nan
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else np.nan
+
+
+def _entropy(coverage):
+    """Shannon entropy of a board from its cell coverage"""
+    with np.errstate(divide="ignore"):
+        return -np.log2(coverage) - np.log2(1 - coverage)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# Import modules
+import pytest
+import numpy as np
+
+# Import from package
+from seagull import lifeforms as lf
+from seagull.history import MemorySink, PackedSink
+import seagull as sg
+
+
+def make_boards(n, size=(12, 12), boundary="wrap"):
+    boards = []
+    for seed in range(n):
+        board = sg.Board(size=size, boundary=boundary)
+        board.add(lf.RandomBox(shape=(8, 8), seed=seed), loc=(2, 2))
+        boards.append(board)
+    return boards
+
+
+@pytest.mark.parametrize("boundary", ["wrap", "fill", "symm"])
+def test_batch_matches_simulator(boundary):
+    """Test if each board of a batch evolves as with the Simulator"""
+    boards = make_boards(4, boundary=boundary)
+    batch = sg.BatchSimulator(boards)
+    stats = batch.run(sg.rules.conway_classic, iters=15)
+
+    for i, board in enumerate(boards):
+        sim = sg.Simulator(board)
+        expected = sim.run(sg.rules.conway_classic, iters=15)
+        assert np.array_equal(batch.state[i], sim.get_history()[-1])
+        for key, value in expected.items():
+            assert stats[key].shape == (4,)
+            assert stats[key][i] == pytest.approx(value)
+
+
+def test_batch_from_array_and_history():
+    """Test if a batch accepts an array and keeps a batched history"""
+    X = np.random.RandomState(0).rand(3, 10, 10) > 0.6
+    batch = sg.BatchSimulator(X)
+    batch.run("B36/S23", iters=5, history=MemorySink(every=5))
+    hist = batch.get_history()
+    assert hist.shape == (2, 3, 10, 10)
+    assert np.array_equal(hist[0], X)
+    assert np.array_equal(hist[1], batch.state)
+
+
+def test_batch_packed_history(tmp_path):
+    """Test if a batch history can be written to a packed file"""
+    batch = sg.BatchSimulator(make_boards(3))
+    path = str(tmp_path / "batch.sgh")
+    stats = batch.run(sg.rules.conway_classic, 4, history=PackedSink(path))
+    reader = batch.get_history()
+    assert reader.shape == (5, 3, 12, 12)
+    assert np.array_equal(reader[-1], batch.state)
+    assert reader.populations().shape == (5, 3)
+
+
+def test_batch_wrong_boards():
+    """Test if a batch raises an error on mismatched boards"""
+    boards = make_boards(2) + [sg.Board(size=(5, 5))]
+    with pytest.raises(ValueError):
+        sg.BatchSimulator(boards)
+    with pytest.raises(ValueError):
+        sg.BatchSimulator(make_boards(1) + make_boards(1, boundary="fill"))
+    with pytest.raises(ValueError):
+        sg.BatchSimulator(np.zeros((10, 10), dtype=bool))
@@ -8,7 +8,7 @@ from matplotlib.image import AxesImage
 
 # Import from package
 from seagull import lifeforms as lf
-from seagull.board import Board
+from seagull.board import Board, SparseBoard
 
 
 def test_board_add():
@@ -25,6 +25,12 @@ def test_board_add_out_of_bounds():
         board.add(lf.Pulsar(), loc=(0, 2))
 
 
+def test_board_wrong_boundary():
+    """Test if an unknown boundary will raise an error"""
+    with pytest.raises(ValueError):
+        Board(size=(3, 3), boundary="klein")
+
+
 def test_board_clear():
     """Test if the board resets whenever clear is called"""
     board = Board(size=(3, 3))
@@ -41,3 +47,92 @@ def test_board_view():
     fig, im = board.view()
     assert isinstance(fig, Figure)
     assert isinstance(im, AxesImage)
+
+
+def test_sparse_board_add_anywhere():
+    """Test if a sparse board accepts lifeforms outside of its viewport"""
+    board = SparseBoard(size=(3, 3))
+    board.add(lf.Blinker(length=3), loc=(-5, 1))
+    board.add(lf.Blinker(length=3), loc=(0, 1))
+    assert len(board.cells) == 6
+    assert np.array_equal(board.state, np.array([[False, True, False]] * 3))
+
+
+def test_sparse_board_add_overwrites_footprint():
+    """Test if adding a lifeform clears the cells under its footprint"""
+    board = SparseBoard(size=(3, 3))
+    board.add(lf.Box(), loc=(0, 0))
+    board.add(lf.Custom([[0, 0], [0, 1]]), loc=(0, 0))
+    assert board.cells.tolist() == [[1, 1]]
+
+
+def test_sparse_board_clear():
+    """Test if the sparse board resets whenever clear is called"""
+    board = SparseBoard(size=(3, 3))
+    board.add(lf.Box(), loc=(100, 100))
+    board.clear()
+    assert len(board.cells) == 0
+
+
+@pytest.mark.parametrize("board_class", [Board, SparseBoard])
+def test_board_add_many_overwrite(board_class):
+    """Test if adding many lifeforms matches adding them one by one"""
+    locs = np.random.RandomState(0).randint(0, 17, size=(40, 2))
+    board, expected = board_class(size=(20, 20)), board_class(size=(20, 20))
+    board.add_many(lf.Glider(), locs)
+    for loc in locs:
+        expected.add(lf.Glider(), tuple(loc))
+    assert np.array_equal(board.state, expected.state)
+
+
+@pytest.mark.parametrize("board_class", [Board, SparseBoard])
+@pytest.mark.parametrize("mode", ["or", "xor"])
+def test_board_add_many_modes(board_class, mode):
+    """Test if overlapping lifeforms are combined by the given mode"""
+    locs = np.random.RandomState(1).randint(0, 17, size=(40, 2))
+    board = board_class(size=(20, 20))
+    board.add(lf.Box(), (0, 0))
+    board.add_many(lf.Glider(), locs, mode=mode)
+
+    expected = np.zeros((20, 20), dtype=bool)
+    expected[:2, :2] = True
+    combine = np.logical_or if mode == "or" else np.logical_xor
+    for row, col in locs:
+        window = expected[row : row + 3, col : col + 3]
+        window[...] = combine(window, lf.Glider().layout)
+    assert np.array_equal(board.state, expected)
+
+
+def test_board_add_mixed():
+    """Test if different lifeforms are placed in order"""
+    glider, box = lf.Glider(), lf.Box()
+    lifeforms = [glider, box, glider, box]
+    locs = [(0, 0), (1, 1), (5, 5), (6, 6)]
+    board, expected = Board(size=(10, 10)), Board(size=(10, 10))
+    board.add_mixed(lifeforms, locs)
+    for lifeform, loc in zip(lifeforms, locs):
+        expected.add(lifeform, loc)
+    assert np.array_equal(board.state, expected.state)
+
+
+def test_board_add_many_out_of_bounds():
+    """Test if any out-of-bounds lifeform will raise an error"""
+    board = Board(size=(10, 10))
+    with pytest.raises(ValueError):
+        board.add_many(lf.Glider(), [(0, 0), (8, 0)])
+    assert not board.state.any()
+
+
+@pytest.mark.parametrize(
+    "locs, mode", [([(0, 0)], "and"), ([0, 0], "or"), ([(0, 0, 0)], "or")]
+)
+def test_board_add_many_wrong_input(locs, mode):
+    """Test if an unknown mode or malformed locations will raise an error"""
+    with pytest.raises(ValueError):
+        Board(size=(10, 10)).add_many(lf.Glider(), locs, mode=mode)
+
+
+def test_board_add_mixed_wrong_length():
+    """Test if a lifeform is needed for every location"""
+    with pytest.raises(ValueError):
+        Board(size=(10, 10)).add_mixed([lf.Glider()], [(0, 0), (5, 5)])
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+# Import standard library
+import os
+
+# Import modules
+import numpy as np
+import pytest
+
+# Import from package
+from seagull.lifeforms import wiki
+from seagull.lifeforms.cache import (
+    NullCache,
+    PatternCache,
+    get_cache,
+    set_cache,
+)
+
+URL = "https://conwaylife.com/patterns/glider.cells"
+
+GLIDER = """!Name: Glider
+!Author: Richard K. Guy
+.O
+..O
+OOO
+"""
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    """Replace downloads with a glider and count them"""
+    urls = []
+
+    def _download(url):
+        urls.append(url)
+        return GLIDER
+
+    monkeypatch.setattr(wiki, "_download", _download)
+    return urls
+
+
+def entries(cache):
+    """List the cached entries of each folder"""
+    return {
+        folder: sorted(os.listdir(os.path.join(cache.path, folder)))
+        if os.path.isdir(os.path.join(cache.path, folder))
+        else []
+        for folder in ("files", "layouts", "urls")
+    }
+
+
+@pytest.fixture
+def cache(tmpdir):
+    """Use a pattern cache in a temporary directory"""
+    cache = PatternCache(str(tmpdir.join("cache")))
+    set_cache(cache)
+    yield cache
+    set_cache(None)
+
+
+def test_cache_downloads_once(cache, downloads):
+    """Test if a URL is downloaded and parsed only once"""
+    first = wiki.parse_cells(URL)
+    second = wiki.parse_cells(URL)
+    assert downloads == [URL]
+    assert np.array_equal(first.layout, second.layout)
+    assert second.meta["name"] == "Glider"
+    assert len(os.listdir(os.path.join(cache.path, "layouts"))) == 1
+
+
+def test_cache_skips_parsing(cache, downloads, monkeypatch):
+    """Test if the cached layout is used instead of parsing again"""
+    expected = wiki.parse_cells(URL).layout
+
+    def _fail(*args):
+        raise AssertionError("parsed again")
+
+    monkeypatch.setattr(wiki, "parse_plaintext_layout", _fail)
+    assert np.array_equal(wiki.parse_cells(URL).layout, expected)
+
+
+def test_cache_offline(cache, downloads):
+    """Test if offline mode only serves cached patterns"""
+    wiki.parse_cells(URL)
+    cache.offline = True
+    assert wiki.parse_cells(URL).size == (3, 3)
+    with pytest.raises(ValueError):
+        wiki.parse_cells("https://conwaylife.com/patterns/pulsar.cells")
+    assert downloads == [URL]
+
+
+@pytest.mark.parametrize("scheme", ["", "file://"])
+def test_cache_mirror(tmpdir, downloads, scheme):
+    """Test if patterns are loaded from a mirror directory offline"""
+    mirror = tmpdir.mkdir("mirror")
+    mirror.join("glider.cells").write(GLIDER)
+    set_cache(
+        PatternCache(
+            str(tmpdir.join("cache")),
+            offline=True,
+            mirror=scheme + str(mirror),
+        )
+    )
+    try:
+        assert wiki.parse_cells(URL).meta["author"] == "Richard K. Guy"
+    finally:
+        set_cache(None)
+    assert downloads == []
+
+
+def test_cache_file_url(tmpdir):
+    """Test if file:// URLs are read from disk"""
+    p = tmpdir.join("glider.cells")
+    p.write(GLIDER)
+    assert wiki.parse_cells("file://" + str(p)).size == (3, 3)
+
+
+def test_cache_evicts_least_recently_used(cache, downloads):
+    """Test if the oldest entries are removed above the size limit"""
+    cache.max_size = 0
+    wiki.parse_cells(URL)
+    assert entries(cache) == {"files": [], "layouts": [], "urls": []}
+
+    cache.max_size = 10**6
+    files = os.path.join(cache.path, "files")
+    for i in range(3):
+        cache.fetch(f"{URL}?{i}", lambda url: url * 100)
+        for folder in ("files", "urls"):
+            for name in os.listdir(os.path.join(cache.path, folder)):
+                path = os.path.join(cache.path, folder, name)
+                if os.path.getmtime(path) > 1000:
+                    os.utime(path, (i, i))
+    sizes = [
+        os.path.getsize(os.path.join(cache.path, folder, f))
+        for folder in ("files", "urls")
+        for f in os.listdir(os.path.join(cache.path, folder))
+    ]
+    cache.max_size = sum(sizes) - 1
+    cache.evict()
+    assert len(os.listdir(files)) == 2
+    assert len(entries(cache)["urls"]) == 2
+    with pytest.raises(ValueError):
+        cache.offline = True
+        cache.fetch(f"{URL}?0", lambda url: url)
+    assert cache.fetch(f"{URL}?2", None) == f"{URL}?2" * 100
+
+
+def test_default_cache(monkeypatch, tmpdir):
+    """Test if the default cache is configured from the environment"""
+    monkeypatch.setenv("SEAGULL_CACHE_DIR", str(tmpdir))
+    monkeypatch.setenv("SEAGULL_OFFLINE", "1")
+    set_cache(None)
+    try:
+        assert get_cache().path == str(tmpdir)
+        assert get_cache().offline
+    finally:
+        set_cache(None)
+
+
+def test_cache_evicts_urls_with_files(cache, downloads):
+    """Test if the URLs and layouts of a file are evicted along with it"""
+    wiki.parse_cells(URL)
+    wiki.parse_cells(f"{URL}?copy")
+    assert [len(names) for names in entries(cache).values()] == [1, 1, 2]
+    cache.max_size = 1
+    cache.evict()
+    assert entries(cache) == {"files": [], "layouts": [], "urls": []}
+
+
+def test_cache_skips_large_entries(cache, downloads):
+    """Test if entries larger than the size limit are not cached"""
+    cache.fetch(f"{URL}?small", lambda url: "x")
+    cache.max_size = len(GLIDER) + 1 + 2 * 64
+    wiki.parse_cells(URL)
+    assert len(entries(cache)["files"]) == 2
+    assert entries(cache)["layouts"] == []
+    wiki.parse_cells(URL)
+    assert downloads == [URL]
+    cache.fetch(f"{URL}?large", lambda url: "x" * cache.max_size)
+    assert len(entries(cache)["files"]) == 2
+
+
+def test_null_cache(tmpdir, downloads):
+    """Test if nothing is cached when the cache is turned off"""
+    mirror = tmpdir.mkdir("mirror")
+    mirror.join("pulsar.cells").write(GLIDER)
+    set_cache(NullCache(mirror=str(mirror)))
+    try:
+        wiki.parse_cells(URL)
+        wiki.parse_cells(URL)
+        wiki.parse_cells("https://conwaylife.com/patterns/pulsar.cells")
+    finally:
+        set_cache(None)
+    assert downloads == [URL, URL]
+
+
+def test_default_cache_turned_off(monkeypatch):
+    """Test if the default cache is turned off from the environment"""
+    monkeypatch.setenv("SEAGULL_NO_CACHE", "1")
+    set_cache(None)
+    try:
+        assert isinstance(get_cache(), NullCache)
+    finally:
+        set_cache(None)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+# Import modules
+import numpy as np
+import pytest
+
+# Import from package
+from seagull import lifeforms as lf
+from seagull.lifeforms.canonical import (
+    canonical_form,
+    canonical_hash,
+    canonical_hashes,
+    catalogue,
+    identify,
+)
+from seagull.rules import conway_classic
+
+
+def _symmetries(X):
+    """The 8 rotations and reflections of a layout"""
+    for Y in (X, np.fliplr(X)):
+        for k in range(4):
+            yield np.rot90(Y, k)
+
+
+@pytest.mark.parametrize(
+    "lifeform", [lf.Glider(), lf.Toad(), lf.Century(), lf.SwitchEngine()]
+)
+def test_canonical_hash_symmetries(lifeform):
+    """Test if the hash ignores margins, rotations and reflections"""
+    X = np.pad(lifeform.layout, ((1, 3), (4, 0)))
+    expected = canonical_hash(lifeform.layout)
+    forms = set()
+    for Y in _symmetries(X):
+        assert canonical_hash(Y) == expected
+        forms.add(canonical_form(Y).tobytes())
+    assert len(forms) == 1
+
+
+def test_canonical_hash_distinct():
+    """Test if different patterns get different hashes"""
+    layouts = [lf.Glider().layout, lf.Blinker().layout, lf.Box().layout]
+    layouts.append(np.zeros((3, 3)))
+    layouts.append(np.ones((1, 4)))
+    layouts.append(np.ones((2, 3)))
+    assert len(set(canonical_hashes(layouts).tolist())) == len(layouts)
+
+
+def test_canonical_hashes_batch():
+    """Test if hashing many layouts matches hashing them one by one"""
+    rng = np.random.default_rng(0)
+    layouts = [
+        rng.random(rng.integers(1, 7, size=2)) < 0.4 for _ in range(200)
+    ]
+    expected = [canonical_hash(X) for X in layouts]
+    assert canonical_hashes(layouts).tolist() == expected
+    crops = [canonical_form(X) for X in layouts]
+    assert canonical_hashes(crops, cropped=True).tolist() == expected
+
+
+@pytest.mark.parametrize(
+    "lifeform, period",
+    [(lf.Glider, 4), (lf.Pulsar, 3), (lf.Beacon, 2), (lf.Pentadecathlon, 15)],
+)
+def test_identify_phases(lifeform, period):
+    """Test if every phase of an oscillator or spaceship is identified"""
+    X = np.pad(lifeform().layout, 10)
+    for _ in range(period):
+        for Y in _symmetries(X):
+            assert identify(Y) is lifeform
+        X = conway_classic(X, boundary="fill")
+
+
+def test_identify_unknown():
+    """Test if unknown patterns are not identified"""
+    assert identify(np.ones((3, 4))) is None
+    assert identify(np.zeros((5, 5))) is None
+    assert catalogue()[canonical_hash(lf.Century().layout)] == (lf.Century, 0)
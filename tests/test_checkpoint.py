@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+# Import modules
+import pytest
+import numpy as np
+
+# Import from package
+from seagull import lifeforms as lf
+from seagull.engines import TiledEngine
+from seagull.history import HistoryReader, MemorySink, PackedSink
+import seagull as sg
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt_after(calls):
+    """Conway's rule that raises after a number of calls"""
+    count = {"calls": 0}
+
+    def rule(X, boundary="wrap"):
+        count["calls"] += 1
+        if count["calls"] > calls:
+            raise Interrupted
+        return sg.rules.conway_classic(X, boundary=boundary)
+
+    return rule
+
+
+@pytest.fixture
+def board():
+    board = sg.Board(size=(12, 12))
+    board.add(lf.RandomBox(shape=(8, 8), seed=1), loc=(2, 2))
+    return board
+
+
+def test_resume_matches_full_run(tmp_path, board):
+    """Test if resuming a B/S rule gives the same result as a full run"""
+    path = str(tmp_path / "run.ckpt")
+    full = sg.Simulator(board)
+    expected = full.run(
+        sg.rules.life_rule,
+        iters=25,
+        checkpoint=path,
+        checkpoint_every=10,
+        rulestring="B36/S23",
+    )
+
+    sim = sg.Simulator(board)
+    stats = sim.resume(path)
+    assert stats == expected
+    assert np.array_equal(sim.get_history()[-1], full.get_history()[-1])
+    assert len(sim.get_history()) == 5
+    assert not (tmp_path / "run.ckpt.tmp").exists()
+
+
+def test_resume_interrupted_packed_history(tmp_path, board):
+    """Test if an interrupted run continues its history file in place"""
+    full = sg.Simulator(board)
+    expected = full.run(sg.rules.conway_classic, iters=30)
+
+    sim = sg.Simulator(board)
+    path = str(tmp_path / "run.sgh")
+    ckpt = str(tmp_path / "run.ckpt")
+    with pytest.raises(Interrupted):
+        sim.run(
+            interrupt_after(17),
+            iters=30,
+            history=PackedSink(path, every=2),
+            checkpoint=ckpt,
+            checkpoint_every=5,
+        )
+
+    sim = sg.Simulator(board)
+    stats = sim.resume(ckpt, rule=sg.rules.conway_classic)
+    assert stats == expected
+    reader = HistoryReader(path)
+    assert np.array_equal(reader[:], full.get_history()[::2])
+
+
+def test_resume_cycle_detection(tmp_path):
+    """Test if cycle detection continues across a checkpoint"""
+    board = sg.Board(size=(10, 10))
+    board.add(lf.Glider(), loc=(1, 1))
+    expected = sg.Simulator(board).run(
+        sg.rules.conway_classic, iters=100, max_period=45
+    )
+
+    ckpt = str(tmp_path / "run.ckpt")
+    with pytest.raises(Interrupted):
+        sg.Simulator(board).run(
+            interrupt_after(27),
+            iters=100,
+            max_period=45,
+            checkpoint=ckpt,
+            checkpoint_every=10,
+        )
+    stats = sg.Simulator(board).resume(ckpt, rule=sg.rules.conway_classic)
+    assert stats == expected
+    assert stats["period"] == 40
+
+
+def test_resume_tiled_statistics(tmp_path, monkeypatch):
+    """Test if the skipped tile fraction covers the generations before the
+    checkpoint"""
+    board = sg.Board(size=(64, 64), boundary="fill")
+    board.add(lf.Blinker(), loc=(1, 1))
+    expected = sg.Simulator(board).run(
+        sg.rules.conway_classic, iters=100, engine="tiled", tile_size=8
+    )
+
+    step = TiledEngine.step
+    calls = iter(range(95))
+
+    def interrupted_step(self):
+        if next(calls, None) is None:
+            raise Interrupted
+        return step(self)
+
+    ckpt = str(tmp_path / "run.ckpt")
+    with monkeypatch.context() as m:
+        m.setattr(TiledEngine, "step", interrupted_step)
+        with pytest.raises(Interrupted):
+            sg.Simulator(board).run(
+                sg.rules.conway_classic,
+                iters=100,
+                engine="tiled",
+                tile_size=8,
+                checkpoint=ckpt,
+                checkpoint_every=90,
+            )
+    stats = sg.Simulator(board).resume(ckpt)
+    # Only the first generation after resuming evaluates every tile again
+    assert stats["skipped_tile_fraction"] == pytest.approx(
+        expected["skipped_tile_fraction"], abs=0.02
+    )
+    assert (tmp_path / "run.ckpt").exists()
+
+
+def test_resume_sparse_board(tmp_path):
+    """Test if cells outside the viewport are kept in checkpoints"""
+    board = sg.SparseBoard(size=(10, 10))
+    board.add(lf.Glider(), loc=(4, 4))
+    full = sg.Simulator(board)
+    full.run(sg.rules.conway_classic, iters=40)
+
+    ckpt = str(tmp_path / "run.ckpt")
+    sg.Simulator(board).run(
+        sg.rules.conway_classic,
+        iters=40,
+        checkpoint=ckpt,
+        checkpoint_every=30,
+    )
+    sim = sg.Simulator(board)
+    sim.resume(ckpt, history=MemorySink())
+    assert np.array_equal(sim.get_history()[-1], full.get_history()[-1])
+
+
+def test_resume_requires_custom_rule(tmp_path, board):
+    """Test if resuming a custom rule without passing it raises an error"""
+    ckpt = str(tmp_path / "run.ckpt")
+    sg.Simulator(board).run(
+        interrupt_after(100), 5, checkpoint=ckpt, checkpoint_every=2
+    )
+    with pytest.raises(ValueError):
+        sg.Simulator(board).resume(ckpt)
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+# Import modules
+import numpy as np
+import pytest
+from loguru import logger
+
+# Import from package
+import seagull as sg
+from seagull import lifeforms as lf
+from seagull.engines import (
+    BitPackedEngine,
+    DenseEngine,
+    HashLifeEngine,
+    SparseEngine,
+    TiledEngine,
+    get_engine,
+)
+
+
+def run_engine(engine, board, iters):
+    """Evolve a board with an engine and return all states"""
+    engine.load(board)
+    states = [engine.state]
+    for i in range(iters):
+        engine.step()
+        states.append(engine.state)
+    return np.asarray(states)
+
+
+@pytest.mark.parametrize(
+    "size", [(1, 1), (5, 7), (16, 63), (9, 64), (12, 130)]
+)
+@pytest.mark.parametrize(
+    "rulestring", ["B3/S23", "B36/S23", "B2/S", "B0/S8", "B12345678/S0"]
+)
+@pytest.mark.parametrize("boundary", ["wrap", "fill", "symm"])
+def test_bitpacked_matches_life_rule(size, rulestring, boundary):
+    """Test if the bit-packed engine gives the same result as life_rule"""
+    board = sg.Board(size=size, boundary=boundary)
+    board.add(lf.RandomBox(shape=size, seed=0), loc=(0, 0))
+    rule = sg.rules.compile(rulestring)
+    expected = run_engine(DenseEngine(rule), board, iters=8)
+    result = run_engine(BitPackedEngine(rule), board, iters=8)
+    assert np.array_equal(result, expected)
+
+
+def test_bitpacked_accepts_life_rule():
+    """Test if the bit-packed engine gets the rulestring of life_rule"""
+    engine = BitPackedEngine(sg.rules.life_rule, rulestring="B36/S23")
+    assert engine.rule is sg.rules.compile("B36/S23")
+
+
+def test_bitpacked_rejects_unknown_rule():
+    """Test if the bit-packed engine rejects non-B/S rule callables"""
+    with pytest.raises(ValueError):
+        BitPackedEngine(lambda X: X)
+
+
+def test_get_engine_unknown_name():
+    """Test if asking for an unknown engine raises an error"""
+    with pytest.raises(ValueError):
+        get_engine("warp-drive")
+
+
+def test_simulator_run_bitpacked():
+    """Test if the simulator gives the same history with bitpacked engine"""
+    board = sg.Board(size=(20, 20))
+    board.add(lf.Glider(), loc=(0, 0))
+    sim = sg.Simulator(board)
+    sim.run(sg.rules.conway_classic, iters=30, engine="bitpacked")
+    expected = sg.Simulator(board)
+    expected.run(sg.rules.conway_classic, iters=30)
+    assert np.array_equal(sim.get_history(), expected.get_history())
+
+
+def test_dense_engine_passes_boundary():
+    """Test if the dense engine passes the board's boundary to the rule"""
+    board = sg.Board(size=(5, 5), boundary="fill")
+    board.add(lf.Blinker(), loc=(0, 2))
+    result = run_engine(DenseEngine(sg.rules.conway_classic), board, iters=1)
+    expected = sg.rules.conway_classic(board.state, boundary="fill")
+    assert np.array_equal(result[-1], expected)
+
+
+@pytest.mark.parametrize("rulestring", ["B3/S23", "B36/S23", "B3/S012345678"])
+def test_sparse_matches_life_rule(rulestring):
+    """Test if the sparse engine matches life_rule away from the edges"""
+    board = sg.Board(size=(60, 60), boundary="fill")
+    board.add(lf.RandomBox(shape=(10, 10), seed=0), loc=(25, 25))
+    rule = sg.rules.compile(rulestring)
+    expected = run_engine(DenseEngine(rule), board, iters=10)
+    result = run_engine(SparseEngine(rule), board, iters=10)
+    assert np.array_equal(result, expected)
+
+
+def test_sparse_rejects_b0_rules():
+    """Test if the sparse engine rejects rules that give birth from nothing"""
+    with pytest.raises(ValueError):
+        SparseEngine("B03/S23")
+
+
+@pytest.fixture
+def warnings():
+    """Collect the warnings logged during a test"""
+    messages = []
+    handler = logger.add(messages.append, level="WARNING", format="{message}")
+    yield messages
+    logger.remove(handler)
+
+
+@pytest.mark.parametrize("engine", [SparseEngine, HashLifeEngine])
+def test_unbounded_engine_warns_about_boundary(engine, warnings):
+    """Test if unbounded engines warn that a dense board's edges are ignored"""
+    board = sg.Board(size=(10, 10))
+    board.add(lf.Glider(), loc=(1, 1))
+    engine(sg.rules.conway_classic).load(board)
+    assert len(warnings) == 1
+    assert "wrap boundary is ignored" in warnings[0]
+
+    sparse = sg.SparseBoard(size=(10, 10))
+    sparse.add(lf.Glider(), loc=(1, 1))
+    engine(sg.rules.conway_classic).load(sparse)
+    assert len(warnings) == 1
+
+
+def test_sparse_board_glider_leaves_viewport():
+    """Test if a glider keeps evolving after it leaves the viewport"""
+    board = sg.SparseBoard(size=(10, 10))
+    board.add(lf.Glider(), loc=(-2, -2))
+    sim = sg.Simulator(board)
+    stats = sim.run(sg.rules.conway_classic, iters=100)
+    assert isinstance(stats, dict)
+    assert sim.get_history().shape == (101, 10, 10)
+    assert sim.get_history()[-1].sum() == 0
+
+    engine = SparseEngine(sg.rules.conway_classic)
+    engine.load(board)
+    for i in range(100):
+        engine.step()
+    assert len(engine.cells) == 5
+    assert engine.cells.min(axis=0).tolist() == [-2 + 25, -2 + 25]
+
+
+@pytest.mark.parametrize("generations", [1, 2, 7, 64, 100])
+def test_hashlife_matches_sparse(generations):
+    """Test if jumping with the HashLife engine matches stepping one by one"""
+    board = sg.SparseBoard(size=(40, 40))
+    board.add(lf.RandomBox(shape=(16, 16), seed=3), loc=(12, 12))
+    expected = SparseEngine(sg.rules.conway_classic)
+    expected.load(board)
+    for i in range(generations):
+        expected.step()
+    engine = HashLifeEngine(sg.rules.conway_classic)
+    engine.load(board)
+    engine.advance(generations)
+    assert engine.population == len(expected.cells)
+    assert np.array_equal(engine.state, expected.state)
+
+
+def test_hashlife_collects_nodes():
+    """Test if the node cache is bounded without changing the result"""
+    board = sg.Board(size=(64, 64))
+    board.add(lf.RandomBox(shape=(30, 30), seed=1), loc=(10, 10))
+    unbounded = HashLifeEngine(sg.rules.conway_classic)
+    unbounded.load(board)
+    unbounded.advance(500)
+    bounded = HashLifeEngine(sg.rules.conway_classic, max_nodes=2000)
+    bounded.load(board)
+    bounded.advance(500)
+    assert len(bounded.tree) < len(unbounded.tree)
+    window = (-200, -200, 464, 464)
+    assert np.array_equal(bounded.render(window), unbounded.render(window))
+
+
+def test_hashlife_loads_quadtree():
+    """Test if a pattern stored as a quadtree is loaded without rebuilding"""
+    from seagull.lifeforms.wiki import Macrocell
+
+    layout = lf.RandomBox(shape=(20, 20), seed=2).layout
+    board = sg.Board(size=(20, 20))
+    board.add(lf.Custom(layout), loc=(0, 0))
+    expected = HashLifeEngine(sg.rules.conway_classic)
+    expected.load(board)
+    expected.advance(50)
+
+    pattern = Macrocell.from_layout(layout)
+    engine = HashLifeEngine(sg.rules.conway_classic)
+    engine.load(pattern)
+    engine.advance(50)
+    offset = np.argwhere(layout).min(axis=0)
+    window = (-100, -100, 240, 240)
+    shifted = (-100 - offset[0], -100 - offset[1], 240, 240)
+    assert np.array_equal(engine.render(shifted), expected.render(window))
+
+    shared = HashLifeEngine(sg.rules.conway_classic)
+    pattern = Macrocell.from_layout(layout, tree=shared.tree)
+    shared.load(pattern)
+    assert shared.root is pattern.root
+
+
+def test_hashlife_rejects_b0_rules():
+    """Test if the HashLife engine rejects rules with birth from nothing"""
+    with pytest.raises(ValueError):
+        HashLifeEngine("B03/S23")
+
+
+def test_simulator_advance_window():
+    """Test if advance() returns the requested window after the jump"""
+    board = sg.Board(size=(10, 10))
+    board.add(lf.Glider(), loc=(0, 0))
+    sim = sg.Simulator(board)
+    state = sim.advance(sg.rules.conway_classic, generations=400)
+    assert state.shape == (10, 10)
+    assert state.sum() == 0
+    window = sim.advance(sg.rules.conway_classic, 400, window=(100, 100, 3, 3))
+    assert np.array_equal(window, lf.Glider().layout)
+
+
+@pytest.mark.parametrize("size", [(16, 16), (23, 41), (5, 3)])
+@pytest.mark.parametrize("boundary", ["wrap", "fill", "symm"])
+@pytest.mark.parametrize("rulestring", ["B3/S23", "B0/S8", "B2/S"])
+def test_tiled_matches_life_rule(size, boundary, rulestring):
+    """Test if the tiled engine gives the same result as life_rule"""
+    board = sg.Board(size=size, boundary=boundary)
+    board.add(lf.RandomBox(shape=size, seed=5), loc=(0, 0))
+    rule = sg.rules.compile(rulestring)
+    expected = run_engine(DenseEngine(rule), board, iters=20)
+    result = run_engine(TiledEngine(rule, tile_size=4), board, iters=20)
+    assert np.array_equal(result, expected)
+
+
+def test_tiled_skips_still_tiles():
+    """Test if the tiled engine skips tiles far from an oscillator"""
+    board = sg.Board(size=(64, 64))
+    board.add(lf.Blinker(), loc=(1, 1))
+    board.add(lf.Box(), loc=(40, 40))
+    sim = sg.Simulator(board)
+    stats = sim.run(
+        sg.rules.conway_classic, iters=20, engine="tiled", tile_size=8
+    )
+    expected = sg.Simulator(board)
+    expected.run(sg.rules.conway_classic, iters=20)
+    assert np.array_equal(sim.get_history(), expected.get_history())
+    assert stats["skipped_tile_fraction"] > 0
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+# Import modules
+import pytest
+import numpy as np
+from matplotlib import animation
+
+# Import from package
+from seagull import lifeforms as lf
+from seagull.history import HistoryReader, PackedSink
+from seagull.utils.packing import packbits, unpackbits
+import seagull as sg
+
+
+@pytest.fixture
+def packed_run(tmp_path):
+    """Run a glider with a PackedSink and return the simulator and path"""
+    board = sg.Board(size=(10, 13))
+    board.add(lf.Glider(), loc=(0, 0))
+    sim = sg.Simulator(board)
+    path = str(tmp_path / "run.sgh")
+    sim.run(sg.rules.conway_classic, iters=12, history=PackedSink(path))
+    return sim, path
+
+
+@pytest.mark.parametrize("width", [1, 8, 13, 64])
+def test_packbits_roundtrip(width):
+    """Test if unpackbits() inverts packbits()"""
+    X = np.random.RandomState(0).rand(4, 5, width) > 0.5
+    P = packbits(X)
+    assert P.dtype == np.uint8
+    assert P.shape == (4, 5, -(-width // 8))
+    assert np.array_equal(unpackbits(P, width), X)
+
+
+def test_history_reader_frames(packed_run):
+    """Test if the reader returns the same frames as a MemorySink"""
+    sim, path = packed_run
+    expected = sg.Simulator(sim.board)
+    expected.run(sg.rules.conway_classic, iters=12)
+    expected = expected.get_history()
+
+    reader = HistoryReader(path)
+    assert reader.shape == expected.shape
+    assert len(reader) == 13
+    assert np.array_equal(reader[5], expected[5])
+    assert np.array_equal(reader[-1], expected[-1])
+    assert np.array_equal(reader[2:7], expected[2:7])
+    assert np.array_equal(reader[[0, 4]], expected[[0, 4]])
+    assert np.array_equal(np.asarray(reader), expected)
+
+
+def test_history_reader_header(packed_run):
+    """Test if the reader exposes the run metadata"""
+    _, path = packed_run
+    reader = HistoryReader(path)
+    assert reader.rule == "conway_classic"
+    assert reader.iters == 12
+    assert reader.every == 1
+    assert np.array_equal(reader.generations, np.arange(13))
+
+
+def test_history_reader_every(tmp_path):
+    """Test if the reader only holds every k-th generation"""
+    board = sg.Board(size=(10, 10))
+    board.add(lf.Glider(), loc=(0, 0))
+    sim = sg.Simulator(board)
+    path = str(tmp_path / "run.sgh")
+    sink = PackedSink(path, every=4)
+    sim.run(sg.rules.life_rule, iters=10, history=sink, rulestring="B3/S23")
+    reader = HistoryReader(path)
+    assert reader.rule == "B3/S23"
+    assert np.array_equal(reader.generations, [0, 4, 8])
+
+
+def test_history_reader_wrong_file(tmp_path):
+    """Test if the reader raises an error on other files"""
+    path = tmp_path / "other.npy"
+    np.save(str(path), np.zeros(3))
+    with pytest.raises(ValueError):
+        HistoryReader(str(path))
+
+
+@pytest.mark.parametrize("exclude_init", [True, False])
+def test_simulator_packed_get_history(packed_run, exclude_init):
+    """Test if get_history() returns a reader for a PackedSink"""
+    sim, _ = packed_run
+    hist = sim.get_history(exclude_init)
+    assert isinstance(hist, HistoryReader)
+    expected_depth = 12 if exclude_init else 13
+    assert hist.shape == (expected_depth, 10, 13)
+
+
+def test_simulator_packed_animate(packed_run):
+    """Test if animate() works on top of a reader"""
+    sim, _ = packed_run
+    anim = sim.animate()
+    assert isinstance(anim, animation.FuncAnimation)
+
+
+def test_simulator_packed_statistics(packed_run):
+    """Test if compute_statistics() accepts a reader"""
+    sim, _ = packed_run
+    stats = sim.compute_statistics(sim.get_history())
+    for key, value in stats.items():
+        assert sim.stats[key] == pytest.approx(value)
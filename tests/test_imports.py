@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+# Import standard library
+import subprocess
+import sys
+
+# Import modules
+import pytest
+
+HEAVY_MODULES = ["matplotlib", "scipy", "urllib.request"]
+
+
+def imported_modules(code):
+    """Run code in a fresh interpreter and list the modules it imported"""
+    script = f"{code}\nimport sys\nprint('\\n'.join(sys.modules))"
+    output = subprocess.check_output([sys.executable, "-c", script])
+    return set(output.decode().split())
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import seagull",
+        "import seagull as sg; sg.Simulator(sg.Board((5, 5))).run("
+        "sg.rules.conway_classic, 3)",
+        "import seagull.lifeforms as lf; lf.Glider().layout",
+    ],
+)
+def test_headless_imports(code):
+    """Test if simulating without plotting doesn't import heavy modules"""
+    modules = imported_modules(code)
+    for name in HEAVY_MODULES:
+        assert name not in modules
+
+
+def test_view_imports_matplotlib():
+    """Test if matplotlib is imported when it's needed"""
+    modules = imported_modules(
+        "import matplotlib; matplotlib.use('Agg')\n"
+        "import seagull as sg; sg.Board((5, 5)).view()"
+    )
+    assert "matplotlib.pyplot" in modules
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# Import modules
+import numpy as np
+import pytest
+
+# Import from package
+import seagull as sg
+from seagull import lifeforms as lf
+from seagull.lifeforms.library import Library, build_library
+from seagull.lifeforms.wiki import layout2rle
+
+
+@pytest.fixture
+def patterns(tmpdir):
+    """A directory of pattern files, with one that cannot be parsed"""
+    directory = tmpdir.mkdir("patterns")
+    directory.join("glider.cells").write(
+        "!Name: Glider\n!Author: Richard K. Guy\n.O\n..O\nOOO\n"
+    )
+    directory.join("blinker.cells").write(".O\n.O\n.O\n")
+    sub = directory.mkdir("oscillators")
+    sub.join("pulsar.rle").write(
+        layout2rle(
+            lf.Pulsar().layout,
+            rule="B3/S23",
+            meta={"name": "Pulsar", "author": "John Conway"},
+        )
+    )
+    sub.join("random.rle").write(
+        layout2rle(lf.RandomBox(shape=(20, 30), seed=1).layout, rule="B36/S23")
+    )
+    directory.join("broken.rle").write("x = 3, y = 3\nbo$2bx$3o!\n")
+    directory.join("notes.txt").write("not a pattern")
+    return directory
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_build_library(tmpdir, patterns, processes):
+    """Test if every parsable pattern is stored in the library"""
+    path = str(tmpdir.join("patterns.sglib"))
+    library = build_library(str(patterns), path, processes=processes)
+    assert len(library) == 4
+    assert library.names == ["blinker", "Glider", "Pulsar", "random"]
+    assert library.files[2] == "oscillators/pulsar.rle"
+    assert library.rules[3] == "B36/S23"
+
+
+def test_library_lifeforms(tmpdir, patterns):
+    """Test if patterns are read back lazily as lifeforms"""
+    path = str(tmpdir.join("patterns.sglib"))
+    build_library(str(patterns), path, processes=1)
+    library = Library(path)
+    pulsar = library["pulsar"]
+    assert "_layout" not in pulsar.__dict__
+    assert pulsar.size == lf.Pulsar().size
+    assert np.array_equal(pulsar.layout, lf.Pulsar().layout)
+    assert pulsar.meta["author"] == "John Conway"
+    assert np.array_equal(
+        library[-1].layout, lf.RandomBox(shape=(20, 30), seed=1).layout
+    )
+
+    board = sg.Board(size=(10, 10))
+    board.add(library["glider"], loc=(0, 0))
+    assert board.state.sum() == 5
+
+
+def test_library_find(tmpdir, patterns):
+    """Test if patterns are found by name, author and size"""
+    path = str(tmpdir.join("patterns.sglib"))
+    library = build_library(str(patterns), path, processes=1)
+    assert [p.name for p in library.find(author="richard k. guy")] == [
+        "Glider"
+    ]
+    assert [p.name for p in library.find(max_size=(3, 3))] == [
+        "blinker",
+        "Glider",
+    ]
+    assert [p.name for p in library.find(min_size=(15, 15))] == [
+        "Pulsar",
+        "random",
+    ]
+    assert library.find(name="Glider", min_size=(4, 4)) == []
+    with pytest.raises(KeyError):
+        library["Gosper glider gun"]
+
+
+def test_library_wrong_file(tmpdir):
+    """Test if opening a file that is not a library raises an error"""
+    p = tmpdir.join("glider.cells")
+    p.write(".O\n..O\nOOO\n" * 10)
+    with pytest.raises(ValueError):
+        Library(str(p))
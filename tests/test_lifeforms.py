@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 # Import standard library
+import io
 from inspect import getmembers, isclass
 
 # Import modules
@@ -17,6 +18,12 @@ from seagull.lifeforms.wiki import (
     parse_rle,
     rle2cells,
     cells2rle,
+    rle2layout,
+    layout2rle,
+    read_rle,
+    parse_macrocell,
+    write_macrocell,
+    Macrocell,
 )
 
 all_lifeforms = [
@@ -39,6 +46,55 @@ def test_lifeform_layout(lifeform, cls):
     assert len(cls().layout.shape) == 2
 
 
+@pytest.mark.parametrize("lifeform, cls", all_lifeforms)
+def test_lifeform_layout_cached(lifeform, cls):
+    """Test if the layout is built once as a read-only boolean array"""
+    lifeform = cls()
+    layout = lifeform.layout
+    assert lifeform.layout is layout
+    assert layout.dtype == bool
+    assert not layout.flags.writeable
+    assert lifeform.size == layout.shape
+
+
+def test_lifeform_layout_built_once():
+    """Test if size and layout share a single call to the layout getter"""
+    calls = []
+
+    class Counted(sg.lifeforms.Custom):
+        @property
+        def layout(self):
+            calls.append(1)
+            return super().layout
+
+    lifeform = Counted([[0, 1], [1, 1]])
+    board = sg.Board(size=(5, 5))
+    board.add(lifeform, loc=(0, 0))
+    board.add(lifeform, loc=(2, 2))
+    assert len(calls) == 1
+    assert board.state[:2, :2].tolist() == [[False, True], [True, True]]
+
+
+def test_random_box_regenerate():
+    """Test if a RandomBox keeps its layout until it's regenerated"""
+    box = sg.lifeforms.RandomBox(shape=(20, 20))
+    layout = box.layout
+    assert np.array_equal(box.layout, layout)
+    new = box.regenerate()
+    assert box.layout is new
+    assert not np.array_equal(new, layout)
+    assert np.array_equal(box.regenerate(seed=3), box.regenerate(seed=3))
+
+
+def test_random_box_global_state():
+    """Test if a seeded RandomBox doesn't reseed the global generator"""
+    np.random.seed(0)
+    expected = np.random.rand()
+    np.random.seed(0)
+    sg.lifeforms.RandomBox(seed=42).layout
+    assert np.random.rand() == expected
+
+
 @pytest.mark.parametrize("lifeform, cls", all_lifeforms)
 def test_lifeform_view(lifeform, cls):
     """Test if getting the lifeform view returns the expected tuple"""
@@ -175,3 +231,199 @@ OO....OOOO..........OO..OO.OOO
 OO..OO.OOO..........OO....OOOO
 ....O...................OO"""
     assert rle2cells(cells2rle(cells_str) + "!") == cells_str
+
+
+def test_lifeform_rle2layout():
+    """Test if an RLE body is decoded into its bounding box"""
+    layout = rle2layout("bo$2bo$\n3o!")
+    assert layout.dtype == bool
+    assert np.array_equal(layout, [[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+    assert rle2layout("2$1234o!", shape=(4, 1300)).sum() == 1234
+
+
+@pytest.mark.parametrize(
+    "rle_str, shape",
+    [("bo$2bo$3o", None), ("bo$2bx$3o!", None), ("3o!", (1, 2))],
+)
+def test_lifeform_rle2layout_invalid(rle_str, shape):
+    """Test if invalid RLE or a pattern larger than the shape raise errors"""
+    with pytest.raises(ValueError):
+        rle2layout(rle_str, shape=shape)
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (7, 300), (64, 64)])
+def test_lifeform_layout2rle_roundtrip(shape):
+    """Test if encoded layouts are decoded back with their header"""
+    layout = np.random.RandomState(0).random_sample(shape) < 0.4
+    lifeform = parse_rle(layout2rle(layout, rule="B36/S23"))
+    assert np.array_equal(lifeform.layout, layout)
+    assert lifeform.meta["rule"] == "B36/S23"
+
+
+def test_lifeform_layout2rle():
+    """Test if the RLE has comments, a header, and wrapped lines"""
+    layout = np.zeros((5, 200), dtype=bool)
+    layout[0, 1::2] = True
+    layout[3, :2] = True
+    rle = layout2rle(layout, meta={"name": "Dots", "comments": "a\nb"})
+    lines = rle.splitlines()
+    assert lines[:4] == [
+        "#N Dots",
+        "#C a",
+        "#C b",
+        "x = 200, y = 5, rule = B3/S23",
+    ]
+    assert all(len(line) <= 70 for line in lines[4:])
+    assert "".join(lines[4:]).endswith("bo3$2o!")
+    assert layout2rle(np.zeros((2, 2))).splitlines()[1] == "!"
+    assert layout2rle(layout[2:]).splitlines()[1] == "$2o!"
+
+
+@pytest.fixture
+def random_rle():
+    """A random layout and its RLE encoding"""
+    layout = np.random.RandomState(0).random_sample((40, 90)) < 0.4
+    return layout, layout2rle(layout, meta={"name": "Random"})
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 2 ** 20])
+def test_lifeform_read_rle(random_rle, chunk_size):
+    """Test if an RLE is streamed the same for any chunk size"""
+    layout, rle = random_rle
+    out, meta = read_rle(io.BytesIO(rle.encode()), chunk_size=chunk_size)
+    assert np.array_equal(out, layout)
+    assert meta["name"] == "Random"
+    assert meta["rule"] == "B3/S23"
+
+
+def test_lifeform_read_rle_board(random_rle):
+    """Test if an RLE overwrites its bounding box in a board"""
+    layout, rle = random_rle
+    board = sg.Board(size=(50, 100))
+    board.state[...] = True
+    read_rle(io.StringIO(rle), board, offset=(5, 10), chunk_size=64)
+    assert np.array_equal(board.state[5:45, 10:100], layout)
+    assert board.state[:5].all() and board.state[45:].all()
+
+
+def test_lifeform_read_rle_sparse_board(random_rle):
+    """Test if an RLE is added anywhere on a sparse board"""
+    layout, rle = random_rle
+    board = sg.SparseBoard(size=(10, 10))
+    board.cells = np.array([[-100, 0], [-10, -10]])
+    read_rle(io.BytesIO(rle.encode()), board, offset=(-10, -10))
+    assert len(board.cells) == layout.sum() + 1
+    assert np.array_equal(board.cells[0], [-100, 0])
+
+
+def test_lifeform_read_rle_memmap(tmpdir, random_rle):
+    """Test if an RLE is written into a memory-mapped array"""
+    layout, rle = random_rle
+    path = str(tmpdir.join("board.npy"))
+    out = np.lib.format.open_memmap(path, "w+", dtype=bool, shape=(64, 128))
+    read_rle(io.BytesIO(rle.encode()), out, offset=(3, 4), chunk_size=64)
+    out.flush()
+    assert np.array_equal(np.load(path)[3:43, 4:94], layout)
+
+
+@pytest.mark.parametrize(
+    "rle, offset",
+    [
+        ("x = 3, y = 3\nbo$2bo$3o!", (8, 8)),
+        ("x = 3, y = 3\nbo$2bo$3o!", (-1, 0)),
+        ("x = 3, y = 3\nbo$2bo$3o", (0, 0)),
+        ("x = 3, y = 2\nbo$2bo$3o!", (0, 0)),
+        ("#N Glider\n", (0, 0)),
+    ],
+)
+def test_lifeform_read_rle_invalid(rle, offset):
+    """Test if invalid RLE or a pattern that does not fit raise errors"""
+    with pytest.raises(ValueError):
+        read_rle(io.StringIO(rle), np.zeros((10, 10), bool), offset=offset)
+
+
+def test_lifeform_parse_rle_file(tmpdir, random_rle):
+    """Test if lifeform is properly parsed from an RLE file"""
+    layout, rle = random_rle
+    p = tmpdir.join("random.rle")
+    p.write(rle)
+    lifeform = parse_rle(str(p))
+    assert np.array_equal(lifeform.layout, layout)
+    assert lifeform.meta["name"] == "Random"
+
+
+GLIDER_MC = """[M2] (golly 2.0)
+#R B3/S23
+#G 7
+#N Glider
+#O Richard K. Guy
+$$..*$...*$.***$$$$
+4 0 0 0 1
+"""
+
+
+def test_lifeform_parse_macrocell():
+    """Test if lifeform is properly parsed from a Macrocell string"""
+    lifeform = parse_macrocell(GLIDER_MC)
+    test_glider_lifeform(lifeform)
+    assert lifeform.meta["rule"] == "B3/S23"
+    assert lifeform.meta["generation"] == 7
+
+
+def test_lifeform_macrocell_roundtrip(tmpdir):
+    """Test if a written Macrocell file is parsed back to its bounding box"""
+    layout = np.zeros((70, 90), dtype=bool)
+    layout[5:60, 3:80] = np.random.RandomState(0).random_sample((55, 77)) < 0.3
+    layout[5, 3] = layout[59, 79] = True
+    p = tmpdir.join("random.mc")
+    with open(str(p), "w") as f:
+        write_macrocell(f, layout, rule="B36/S23", meta={"name": "Random"})
+    lifeform = parse_macrocell(str(p))
+    assert lifeform.size == (55, 77)
+    assert np.array_equal(lifeform.layout, layout[5:60, 3:80])
+    assert lifeform.meta["name"] == "Random"
+    assert lifeform.meta["rule"] == "B36/S23"
+
+
+def test_lifeform_macrocell_shares_subtrees():
+    """Test if a huge repetitive pattern is read and written without
+    making it dense"""
+    lines = ["[M2]", "$$..*$...*$.***$", "4 1 1 1 1"]
+    lines += [f"{k} {k - 3} {k - 3} {k - 3} {k - 3}" for k in range(5, 41)]
+    lifeform = parse_macrocell("\n".join(lines))
+    assert lifeform.population == 5 * 4 ** 37
+    assert lifeform.size == (2 ** 40 - 5, 2 ** 40 - 5)
+    assert lifeform.render((0, 0, 16, 16)).sum() == 4 * 5
+    assert lifeform.render((2 ** 40 - 8, 2 ** 40 - 8, 8, 8)).sum() == 5
+
+    f = io.StringIO()
+    write_macrocell(f, lifeform)
+    assert len(f.getvalue().splitlines()) == 2 + 1 + 37
+    assert parse_macrocell(f.getvalue()).root is not lifeform.root
+    assert parse_macrocell(f.getvalue(), lifeform.tree).root is lifeform.root
+
+
+@pytest.mark.parametrize(
+    "mc_str",
+    [
+        "[M2]\n",
+        "[M2]\n$$..*$...*$.***$\n4 0 0 0 2\n",
+        "[M2]\n$$..*$...*$.***$\n5 0 0 0 1\n",
+        "[M2]\n$$..*$...*$.***$\n1 0 0 0 1\n",
+        "[M2]\n$$..*$...*$.***$*........$\n",
+        "[M2]\n$$..*$...*$.***$\n4 0 0 1\n",
+    ],
+)
+def test_lifeform_parse_macrocell_invalid(mc_str):
+    """Test if invalid Macrocell input raises errors"""
+    with pytest.raises(ValueError):
+        parse_macrocell(mc_str)
+
+
+def test_lifeform_macrocell_from_layout():
+    """Test if a Macrocell lifeform can be added to a board"""
+    lifeform = Macrocell.from_layout([[0, 0, 0], [0, 1, 1], [0, 1, 1]])
+    board = sg.Board(size=(4, 4))
+    board.add(lifeform, loc=(1, 1))
+    assert board.state[1:3, 1:3].all()
+    assert board.state.sum() == 4
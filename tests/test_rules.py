@@ -115,3 +115,94 @@ def put_cells_to_board(coords: List[Tuple[int, int]]) -> np.ndarray:
     for coord in coords:
         board[coord] = 1
     return board
+
+
+@pytest.mark.parametrize(
+    "rulestring", ["B3/S23", "B36/S23", "B2/S", "B/S012345678"]
+)
+def test_compiled_rule_matches_isin_reference(rulestring):
+    """Test if a compiled rule gives the same result as the np.isin path"""
+    np.random.seed(42)
+    X = np.random.choice([False, True], size=(20, 30))
+    birth, survival = sg.rules._parse_rulestring(rulestring)
+    n = sg.rules._count_neighbors(X)
+    expected = (~X & np.isin(n, birth)) | (X & np.isin(n, survival))
+    assert np.array_equal(sg.rules.compile(rulestring)(X), expected)
+
+
+def test_compile_caches_rules():
+    """Test if compiling the same rulestring twice returns the same rule"""
+    assert sg.rules.compile("B3/S23") is sg.rules.compile("B3/S23")
+
+
+@pytest.mark.parametrize("rulestring", ["23/S23", "B3/S239", "B9/S23"])
+def test_compile_wrong_rulestring(rulestring):
+    """Test if compiling an invalid rulestring raises an error"""
+    with pytest.raises(ValueError):
+        sg.rules.compile(rulestring)
+
+
+def test_simulator_accepts_compiled_rule():
+    """Test if a compiled rule can be passed to the Simulator"""
+    board = sg.Board(size=(10, 10))
+    board.add(lf.Glider(), loc=(0, 0))
+    sim = sg.Simulator(board)
+    sim.run(sg.rules.compile("B3/S23"), iters=5)
+    expected = sg.Simulator(board)
+    expected.run(sg.rules.life_rule, iters=5, rulestring="B3/S23")
+    assert np.array_equal(sim.get_history(), expected.get_history())
+
+
+@pytest.mark.parametrize("size", [(1, 1), (2, 3), (10, 10), (17, 64)])
+@pytest.mark.parametrize("boundary", ["wrap", "fill", "symm"])
+def test_count_neighbors_matches_convolve(size, boundary):
+    """Test if the slice-sum neighbor count matches the convolve2d path"""
+    np.random.seed(42)
+    X = np.random.choice([False, True], size=size)
+    expected = sg.rules._count_neighbors_convolve(X, boundary=boundary)
+    n = sg.rules._count_neighbors(X, boundary=boundary)
+    assert np.array_equal(n, expected)
+
+
+def test_count_neighbors_wrong_boundary():
+    """Test if an unknown boundary raises an error"""
+    with pytest.raises(ValueError):
+        sg.rules._count_neighbors(np.zeros((3, 3)), boundary="klein")
+
+
+def test_conway_fill_boundary_blinker_at_edge():
+    """Test if a blinker at the edge of a dead-edged board loses a cell"""
+    state = np.zeros((5, 5))
+    state[0, 1:4] = 1
+    wrapped = conway_classic(state)
+    filled = conway_classic(state, boundary="fill")
+    assert wrapped.sum() == 3
+    assert filled.sum() == 2
+
+
+def test_count_neighbors_out_buffer():
+    """Test if the neighbor count is written to the preallocated buffer"""
+    X = put_cells_to_board([(0, 0), (1, 1), (2, 2)])
+    out = np.full((3, 3), 42, dtype=np.uint8)
+    n = sg.rules._count_neighbors(X, out=out)
+    assert n is out
+    assert np.array_equal(out, sg.rules._count_neighbors_convolve(X))
+
+
+def test_count_neighbors_batch():
+    """Test if leading axes are treated as a batch of boards"""
+    np.random.seed(42)
+    X = np.random.choice([False, True], size=(4, 8, 9))
+    n = sg.rules._count_neighbors(X)
+    for board, counts in zip(X, n):
+        assert np.array_equal(
+            counts, sg.rules._count_neighbors_convolve(board)
+        )
+
+
+def test_rules_public_names():
+    """Test if only the rules, not their helpers, are exported"""
+    assert "compile" in sg.rules.__all__
+    assert not hasattr(sg, "compile")
+    assert not hasattr(sg, "lru_cache")
+    assert sg.conway_classic is sg.rules.conway_classic
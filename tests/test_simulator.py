@@ -9,6 +9,13 @@ from matplotlib import animation
 # Import from package
 from seagull import lifeforms as lf
 import seagull as sg
+from seagull.history import (
+    DiskSink,
+    MemorySink,
+    NullSink,
+    PackedSink,
+    RingSink,
+)
 
 
 def test_simulator_run():
@@ -51,6 +58,26 @@ def test_simulator_animate_without_run():
         sim.animate()
 
 
+def test_simulator_animate_null_sink():
+    """Test if animate() explains that the history sink kept no frames"""
+    board = sg.Board(size=(10, 10))
+    board.add(lf.Blinker(length=3), loc=(0, 1))
+    sim = sg.Simulator(board)
+    sim.run(sg.rules.conway_classic, iters=3, history=NullSink())
+    assert sim.get_history().shape == (0, 10, 10)
+    with pytest.raises(ValueError, match="NullSink .* kept no frames"):
+        sim.animate()
+
+
+@pytest.mark.parametrize(
+    "sink", [lambda: RingSink(0), lambda: MemorySink(every=0)]
+)
+def test_history_sink_wrong_arguments(sink):
+    """Test if sinks reject sizes and intervals below 1"""
+    with pytest.raises(ValueError):
+        sink()
+
+
 def test_compute_statistics():
     """Test if compute_statistics() returns a dictionary"""
     board = sg.Board(size=(10, 10))
@@ -73,3 +100,152 @@ def test_simulator_inplace():
     sim = sg.Simulator(board)
     sim.run(sg.rules.conway_classic, iters=10)
     assert np.array_equal(board.state, init_board)
+
+
+@pytest.mark.parametrize(
+    "sink, expected",
+    [
+        (lambda tmp: MemorySink(), list(range(11))),
+        (lambda tmp: MemorySink(every=3), [0, 3, 6, 9]),
+        (lambda tmp: NullSink(), []),
+        (lambda tmp: RingSink(4), [7, 8, 9, 10]),
+        (lambda tmp: RingSink(2, every=4), [4, 8]),
+        (lambda tmp: DiskSink(str(tmp / "h.npy"), 2), [0, 2, 4, 6, 8, 10]),
+        (lambda tmp: PackedSink(str(tmp / "h.sgh"), 5), [0, 5, 10]),
+    ],
+)
+def test_simulator_history_sinks(tmp_path, sink, expected):
+    """Test if history sinks keep the expected generations"""
+    board = sg.Board(size=(10, 10))
+    board.add(lf.Glider(), loc=(0, 0))
+    sim = sg.Simulator(board)
+    full = sim.run(sg.rules.conway_classic, iters=10)
+    hist = sim.get_history()
+
+    sink = sink(tmp_path)
+    stats = sim.run(sg.rules.conway_classic, iters=10, history=sink)
+    assert stats == full
+    assert sink.generations == expected
+    assert np.array_equal(sim.get_history(), hist[expected])
+    assert len(sim.history) == len(expected)
+
+
+def test_simulator_disk_sink_file(tmp_path):
+    """Test if the DiskSink history can be loaded back"""
+    board = sg.Board(size=(10, 10))
+    board.add(lf.Glider(), loc=(0, 0))
+    sim = sg.Simulator(board)
+    path = str(tmp_path / "history.npy")
+    sim.run(sg.rules.conway_classic, iters=5, history=DiskSink(path))
+    assert np.array_equal(np.load(path), sim.get_history())
+
+
+def test_simulator_stats_match_history():
+    """Test if the streamed statistics match compute_statistics()"""
+    board = sg.Board(size=(10, 10))
+    board.add(lf.Glider(), loc=(0, 0))
+    sim = sg.Simulator(board)
+    stats = sim.run(sg.rules.conway_classic, iters=10)
+    expected = sim.compute_statistics(sim.get_history())
+    for key, value in expected.items():
+        assert stats[key] == pytest.approx(value)
+
+
+@pytest.mark.parametrize(
+    "lifeform, period, stabilized_at",
+    [(lf.Blinker(length=3), 2, 0), (lf.Box(), 1, 0), (lf.Glider(), 40, 0)],
+)
+def test_simulator_max_period(lifeform, period, stabilized_at):
+    """Test if a run stops once the board repeats"""
+    board = sg.Board(size=(10, 10))
+    board.add(lifeform, loc=(1, 1))
+    sim = sg.Simulator(board)
+    stats = sim.run(sg.rules.conway_classic, iters=100, max_period=50)
+    assert stats["period"] == period
+    assert stats["stabilized_at"] == stabilized_at
+    assert stats["generations"] == stabilized_at + period
+    assert len(sim.get_history()) == stabilized_at + period + 1
+
+
+def test_simulator_max_period_dies():
+    """Test if a run stops once the board is empty"""
+    board = sg.Board(size=(10, 10))
+    board.add(lf.Blinker(length=2), loc=(1, 1))
+    sim = sg.Simulator(board)
+    stats = sim.run(sg.rules.conway_classic, iters=100, max_period=1)
+    assert (stats["period"], stats["stabilized_at"]) == (1, 1)
+
+
+def test_simulator_max_period_memory():
+    """Test if the default sink only allocates the generations that run"""
+    board = sg.Board(size=(100, 100))
+    board.add(lf.Blinker(length=3), loc=(1, 1))
+    sim = sg.Simulator(board)
+    stats = sim.run(sg.rules.conway_classic, iters=10 ** 6, max_period=8)
+    assert stats["generations"] == 2
+    assert sim.history.buffer.shape == (3, 100, 100)
+
+    sim = sg.Simulator(sg.Board(size=(2000, 2000)))
+    stats = sim.run(sg.rules.conway_classic, iters=20000, max_period=4)
+    assert (stats["period"], stats["stabilized_at"]) == (1, 0)
+    assert len(sim.get_history()) == 2
+
+
+def test_memory_sink_grows():
+    """Test if the memory sink keeps every generation as it grows"""
+    sink = MemorySink(every=2)
+    sink.PREALLOCATE = 1
+    sink.open((3, 4), iters=20)
+    for i in range(21):
+        sink.append(i, np.full((3, 4), i % 3 == 0))
+    sink.close()
+    assert sink.generations == list(range(0, 21, 2))
+    assert len(sink.buffer) == 11
+    assert np.array_equal(
+        sink.frames()[:, 0, 0], [i % 3 == 0 for i in range(0, 21, 2)]
+    )
+
+
+@pytest.mark.parametrize("engine", ["dense", "sparse", "hashlife"])
+def test_simulator_max_period_not_found(engine):
+    """Test if a run continues when no short cycle exists"""
+    board = sg.Board(size=(10, 10))
+    board.add(lf.Glider(), loc=(1, 1))
+    sim = sg.Simulator(board)
+    stats = sim.run(
+        sg.rules.conway_classic, iters=45, engine=engine, max_period=4
+    )
+    assert stats["period"] is None
+    assert stats["generations"] == 45
+
+
+@pytest.mark.parametrize("engine", ["sparse", "hashlife"])
+def test_simulator_max_period_unbounded(engine):
+    """Test if unbounded engines detect cycles on the whole plane"""
+    board = sg.Board(size=(10, 10))
+    board.add(lf.Blinker(length=3), loc=(4, 4))
+    sim = sg.Simulator(board)
+    stats = sim.run(
+        sg.rules.conway_classic, iters=20, engine=engine, max_period=4
+    )
+    assert (stats["period"], stats["stabilized_at"]) == (2, 0)
+
+
+@pytest.mark.parametrize("sink", [DiskSink, PackedSink])
+def test_simulator_max_period_trims_file(tmp_path, sink):
+    """Test if files written by sinks are trimmed when a run stops early"""
+    board = sg.Board(size=(10, 10))
+    board.add(lf.Blinker(length=3), loc=(1, 1))
+    sim = sg.Simulator(board)
+    path = str(tmp_path / "history")
+    sim.run(
+        sg.rules.conway_classic, 1000, history=sink(path), max_period=2
+    )
+    full = sg.Simulator(board)
+    full.run(sg.rules.conway_classic, 2, history=sink(path + "-full"))
+    assert len(sim.get_history()) == 3
+    assert (tmp_path / "history").stat().st_size == (
+        tmp_path / "history-full"
+    ).stat().st_size
+    if sink is DiskSink:
+        assert np.load(path).shape == (3, 10, 10)
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+# Import modules
+import pytest
+import numpy as np
+
+# Import from package
+from seagull import lifeforms as lf
+from seagull.history import PackedSink
+from seagull.utils import statistics as stats
+import seagull as sg
+
+
+def test_accumulator_matches_numpy():
+    """Test if the running statistics match numpy over the whole history"""
+    history = np.random.RandomState(0).rand(20, 8, 9) < np.linspace(
+        0.1, 0.9, 20
+    ).reshape(-1, 1, 1)
+    coverage = [stats.cell_coverage(h) for h in history]
+    entropy = [stats.shannon_entropy(h) for h in history]
+
+    result = stats.StatisticsAccumulator.from_history(history).result()
+    assert result["peak_cell_coverage"] == pytest.approx(np.max(coverage))
+    assert result["avg_cell_coverage"] == pytest.approx(np.mean(coverage))
+    assert result["var_cell_coverage"] == pytest.approx(np.var(coverage))
+    assert result["peak_shannon_entropy"] == pytest.approx(np.max(entropy))
+    assert result["avg_shannon_entropy"] == pytest.approx(np.mean(entropy))
+    assert result["var_shannon_entropy"] == pytest.approx(np.var(entropy))
+
+
+def test_accumulator_from_generator():
+    """Test if frames from a generator give the same statistics"""
+    history = np.random.RandomState(1).rand(6, 8, 9) < 0.3
+    expected = stats.StatisticsAccumulator.from_history(history).result()
+    result = stats.StatisticsAccumulator.from_history(
+        frame for frame in history
+    ).result()
+    for key, value in expected.items():
+        assert result[key] == pytest.approx(value)
+
+
+def test_accumulator_empty_board():
+    """Test if an empty board has an infinite entropy, as before"""
+    acc = stats.StatisticsAccumulator()
+    acc.update(np.zeros((5, 5), dtype=bool))
+    result = acc.result()
+    assert result["avg_cell_coverage"] == 0
+    assert result["avg_shannon_entropy"] == np.inf
+
+
+def test_accumulator_from_reader(tmp_path):
+    """Test if a history file gives the same statistics as the run"""
+    board = sg.Board(size=(10, 13))
+    board.add(lf.Glider(), loc=(0, 0))
+    sim = sg.Simulator(board)
+    path = str(tmp_path / "run.sgh")
+    run_stats = sim.run(sg.rules.conway_classic, 8, history=PackedSink(path))
+    reader = sim.get_history()
+    assert np.array_equal(
+        reader.populations(chunk=3), np.count_nonzero(reader[:], axis=(1, 2))
+    )
+    result = stats.StatisticsAccumulator.from_history(reader).result()
+    for key, value in run_stats.items():
+        assert result[key] == pytest.approx(value)
+
+
+def test_statistics_vectorized():
+    """Test if the statistics of a history match those of each state"""
+    history = np.random.RandomState(1).rand(6, 7, 9) > 0.7
+    counts = stats.population(history)
+    assert counts.shape == (6,)
+    coverage = stats.cell_coverage(history, counts)
+    entropy = stats.shannon_entropy(history)
+    for i, state in enumerate(history):
+        assert counts[i] == stats.population(state)
+        assert coverage[i] == stats.cell_coverage(state)
+        assert entropy[i] == stats.shannon_entropy(state)
+
+
+def test_population_chunks_and_batches():
+    """Test if the population is the same for any chunk and leading axes"""
+    history = np.random.RandomState(2).rand(2, 5, 4, 4) > 0.5
+    expected = history.sum(axis=(2, 3))
+    assert np.array_equal(stats.population(history, chunk=3), expected)
+
+
+def test_frame_statistics_reader(tmp_path):
+    """Test if frame_statistics() gives the same arrays for a reader"""
+    board = sg.Board(size=(10, 13))
+    board.add(lf.Glider(), loc=(0, 0))
+    sim = sg.Simulator(board)
+    path = str(tmp_path / "run.sgh")
+    sim.run(sg.rules.conway_classic, 8, history=PackedSink(path))
+    result = stats.frame_statistics(sim.get_history())
+    expected = stats.frame_statistics(sim.get_history()[:])
+    for key, value in expected.items():
+        assert np.array_equal(result[key], value)
+
+
+def test_census():
+    """Test if the objects of a board are counted by kind and located"""
+    board = sg.Board(size=(60, 60))
+    board.add(lf.Box(), loc=(1, 1))
+    board.add(lf.Box(), loc=(1, 50))
+    board.add(lf.Pulsar(), loc=(20, 20))
+    board.add(lf.Toad(), loc=(50, 5))
+    board.add(lf.Glider(), loc=(50, 50))
+    board.state[5, 30] = True
+    state = board.state
+    for _ in range(3):
+        state = sg.rules.conway_classic(state, boundary="fill")
+
+    counts, locations = stats.census(np.rot90(state))
+    assert counts["Box"] == 2
+    assert counts["Pulsar"] == counts["Toad"] == counts["Glider"] == 1
+    assert len(counts) == 4
+    assert sorted(locations["Box"].tolist()) == [[8, 1], [57, 1]]
+
+
+def test_census_distance():
+    """Test if the distance decides which cells form one object"""
+    X = np.zeros((10, 10), dtype=bool)
+    X[2:5, 2] = True
+    X[2:5, 4] = True
+    counts, locations = stats.census(X, distance=1)
+    assert counts == {"Blinker": 2}
+    assert locations["Blinker"].tolist() == [[2, 2], [2, 4]]
+    counts, _ = stats.census(X, distance=2)
+    assert list(counts.values()) == [1]
+    assert stats.census(np.zeros((5, 5)), distance=3) == ({}, {})
+    with pytest.raises(ValueError):
+        stats.census(X, distance=0)
+
+
+def test_census_locations_random():
+    """Test if every object of a random board is found and located"""
+    from scipy import ndimage
+
+    X = np.random.RandomState(0).random_sample((80, 120)) < 0.1
+    counts, locations = stats.census(X, distance=1)
+    labels, count = ndimage.label(X, structure=np.ones((3, 3)))
+    expected = sorted(
+        (r.start, c.start) for r, c in ndimage.find_objects(labels)
+    )
+    found = sorted(map(tuple, np.concatenate(list(locations.values()))))
+    assert sum(counts.values()) == count
+    assert found == expected
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+# Import modules
+import pytest
+import numpy as np
+
+# Import from package
+from seagull.lifeforms import RandomBox
+import seagull as sg
+
+
+def test_sweep_columns():
+    """Test if a sweep returns one row per rule, size, and seed"""
+    results = sg.sweep(
+        rules=["B3/S23", sg.rules.compile("B36/S23")],
+        seeds=range(5),
+        size=[(8, 8), (10, 12)],
+        iters=4,
+        processes=1,
+        chunksize=2,
+    )
+    assert len(results["seed"]) == 2 * 2 * 5
+    assert list(results["rule"][:10]) == ["B3/S23"] * 10
+    assert list(results["seed"][:5]) == list(range(5))
+    assert list(results["width"][5:10]) == [12] * 5
+    assert results["peak_cell_coverage"].shape == (20,)
+
+
+def test_sweep_matches_simulator():
+    """Test if the statistics of a sweep match those of single runs"""
+    results = sg.sweep(["B3/S23"], seeds=[3, 7], size=(9, 9), processes=1)
+    for i, seed in enumerate([3, 7]):
+        board = sg.Board(size=(9, 9))
+        board.add(RandomBox(shape=(9, 9), seed=seed), loc=(0, 0))
+        expected = sg.Simulator(board).run(sg.rules.conway_classic, 100)
+        for key, value in expected.items():
+            assert results[key][i] == pytest.approx(value, nan_ok=True)
+
+
+def test_sweep_process_pool(tmp_path):
+    """Test if a sweep over processes streams chunks and writes a file"""
+    chunks = []
+    path = str(tmp_path / "sweep.npz")
+    results = sg.sweep(
+        ["B3/S23", "B2/S"],
+        seeds=range(6),
+        size=(8, 8),
+        iters=3,
+        path=path,
+        processes=2,
+        chunksize=4,
+        callback=chunks.append,
+    )
+    assert sorted(len(chunk["seed"]) for chunk in chunks) == [2, 2, 4, 4]
+    serial = sg.sweep(
+        ["B3/S23", "B2/S"], range(6), (8, 8), iters=3, processes=1
+    )
+    saved = np.load(path)
+    for key, value in serial.items():
+        np.testing.assert_array_equal(results[key], value)
+        np.testing.assert_array_equal(saved[key], value)